@@ -0,0 +1,120 @@
+"""
+Kapatılan ticket'ların arşivlenmesi.
+
+"Closed" durumunda `ARCHIVE_AFTER_DAYS` günden uzun kalmış ticket'lar yorumlarıyla
+birlikte `tickets_archive` / `comments_archive` tablolarına taşınır. Her grup
+(`ARCHIVE_BATCH_SIZE` ticket) kendi kısa transaction'ında taşınır; böylece canlı
+tablodaki yazmalar uzun süre bekletilmez. Periyodik (ör. gece cron'u) çalıştırılır:
+
+    python -m app.core.archive run [--days 90] [--batch-size 500]
+"""
+import argparse
+import logging
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import DateTime, exists, func, literal, select
+
+from app.core.config import settings
+from app.database import begin_immediate
+from app.models.ticket import Comment, CommentArchive, Ticket, TicketArchive, apply_ticket_stat_deltas, ticket_stat_key
+
+logger = logging.getLogger("app.core.archive")
+
+_tickets = Ticket.__table__
+_comments = Comment.__table__
+_TICKET_COLUMNS = [c.name for c in TicketArchive.__table__.columns if c.name != "archived_at"]
+_COMMENT_COLUMNS = [c.name for c in CommentArchive.__table__.columns]
+
+
+def _archivable_ticket_ids(connection, cutoff: datetime, batch_size: int) -> List[int]:
+    # SQLite AUTOINCREMENT olmadan silinen en büyük id'yi yeniden verebilir; arşivdeki
+    # id ile çakışmaması için en büyük id'li ticket/yorum canlı tabloda bırakılır.
+    max_ticket_id = select(func.max(_tickets.c.id)).scalar_subquery()
+    max_comment_id = select(func.max(_comments.c.id)).scalar_subquery()
+    query = (
+        select(_tickets.c.id)
+        .where(
+            _tickets.c.status == "Closed",
+            _tickets.c.closed_at < cutoff,
+            _tickets.c.id < max_ticket_id,
+            ~exists().where(_comments.c.ticket_id == _tickets.c.id, _comments.c.id == max_comment_id),
+        )
+        .order_by(_tickets.c.closed_at)
+        .limit(batch_size)
+    )
+    return list(connection.execute(query).scalars())
+
+
+def archive_tickets(connection, ticket_ids: List[int], archived_at: Optional[datetime] = None) -> int:
+    """Verilen ticket'ları yorumlarıyla birlikte arşive taşır (çağıranın transaction'ında)."""
+    if not ticket_ids:
+        return 0
+    archived_at = archived_at or datetime.utcnow()
+
+    # Sayaçlar canlı tabloyu yansıtır; taşınan ticket'lar sayımdan düşer
+    grouped = connection.execute(
+        select(_tickets.c.assigned_department_id, _tickets.c.status, _tickets.c.priority, func.count())
+        .where(_tickets.c.id.in_(ticket_ids))
+        .group_by(_tickets.c.assigned_department_id, _tickets.c.status, _tickets.c.priority)
+    )
+    deltas = Counter({ticket_stat_key(dept, status, priority): -count for dept, status, priority, count in grouped})
+
+    connection.execute(TicketArchive.__table__.insert().from_select(
+        _TICKET_COLUMNS + ["archived_at"],
+        select(*[_tickets.c[name] for name in _TICKET_COLUMNS], literal(archived_at, DateTime))
+        .where(_tickets.c.id.in_(ticket_ids)),
+    ))
+    connection.execute(CommentArchive.__table__.insert().from_select(
+        _COMMENT_COLUMNS,
+        select(*[_comments.c[name] for name in _COMMENT_COLUMNS]).where(_comments.c.ticket_id.in_(ticket_ids)),
+    ))
+    connection.execute(_comments.delete().where(_comments.c.ticket_id.in_(ticket_ids)))
+    moved = connection.execute(_tickets.delete().where(_tickets.c.id.in_(ticket_ids))).rowcount
+    apply_ticket_stat_deltas(connection, deltas)
+    return moved
+
+
+def archive_closed_tickets(engine, older_than_days: Optional[int] = None, batch_size: Optional[int] = None,
+                           now: Optional[datetime] = None) -> int:
+    """Süresi dolmuş kapalı ticket'ları gruplar hâlinde arşivler; taşınan ticket sayısını döndürür."""
+    older_than_days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(days=older_than_days)
+
+    total = 0
+    while True:
+        with engine.connect() as connection:
+            begin_immediate(connection)
+            ticket_ids = _archivable_ticket_ids(connection, cutoff, batch_size)
+            moved = archive_tickets(connection, ticket_ids, archived_at=now)
+            connection.commit()
+        total += moved
+        if moved:
+            logger.info("Archived %s tickets (total %s)", moved, total)
+        if len(ticket_ids) < batch_size:
+            return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.archive", description="Kapatılan ticket'ları arşivle")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Süresi dolmuş kapalı ticket'ları arşive taşı")
+    run.add_argument("--days", type=int, default=None, help=f"Kapanıştan sonra bekleme (varsayılan: {settings.ARCHIVE_AFTER_DAYS})")
+    run.add_argument("--batch-size", type=int, default=None, help=f"Transaction başına ticket (varsayılan: {settings.ARCHIVE_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    from app.database import engine
+
+    total = archive_closed_tickets(engine, older_than_days=args.days, batch_size=args.batch_size)
+    print(f"Arşivlenen ticket sayısı: {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
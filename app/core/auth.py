@@ -1,40 +1,86 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.database import get_db
+from jose import JWTError
+from sqlalchemy.orm import Session, joinedload
+from app.database import get_db, read_router
 from app.models.user import User
-from app.core.config import settings
+from app.core.principals import Principal, principal_cache
+from app.core.revocation import revocation_list
+from app.core.security import decode_access_token
 
 # JWT Kimlik Doğrulama Şeması
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+# Token'ın isteğe bağlı olduğu endpoint'ler için (ör. çıkış); token yoksa None verir
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
-def verify_token(token: str, credentials_exception):
-    """Token'ı doğrular ve payload'dan e-posta adresini döndürür."""
+def _token_subject(token: str):
+    """Geçerli token'ın `sub` değeri; geçersizse None (hata vermez)."""
     try:
-        # JWT'yi çözmek için SECRET_KEY ve ALGORITHM ayarlarını settings'ten çeker.
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
+        return decode_access_token(token).get("sub")
     except JWTError:
-        raise credentials_exception
-    return email
+        return None
+
+
+def get_read_db(token: str = Depends(oauth2_scheme)):
+    """
+    Salt okunur endpoint'ler için oturum: replika varsa oradan okur. Kullanıcı kısa süre
+    önce yazdıysa kendi yazdığını görsün diye birincil veritabanı kullanılır.
+    """
+    db = read_router.session(_token_subject(token))
+    try:
+        yield db
+    finally:
+        db.close()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    """Mevcut kullanıcıyı token'dan alır."""
+
+def _load_principal(token: str, db: Session, cache: bool = True) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Kimlik doğrulama başarısız.",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    email = verify_token(token, credentials_exception)
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
         raise credentials_exception
-    return user
+    email = payload.get("sub")
+    user_id = payload.get("uid")
+    if email is None:
+        raise credentials_exception
+    # İptal kontrolü: çoğu istek bellekteki Bloom filtresinde biter, veritabanına gitmez
+    jti = payload.get("jti")
+    if jti is not None and revocation_list.is_revoked(jti, db):
+        raise credentials_exception
+
+    # Token'da kullanıcı id'si varsa önce önbelleğe bak (uid'siz eski token'lar her seferinde okunur)
+    if user_id is not None:
+        principal = principal_cache.get(user_id)
+        if principal is not None and principal.email == email:
+            return principal
+
+    generation = principal_cache.generation()
+    # Rol yetki kontrollerinde hep okunur; ayrı bir lazy-load sorgusu yerine birlikte yükle
+    query = db.query(User).options(joinedload(User.role))
+    user = query.filter(User.id == user_id).first() if user_id is not None else query.filter(User.email == email).first()
+    if user is None or user.email != email:
+        raise credentials_exception
+    principal = Principal.from_user(user)
+    if cache and user_id is not None:
+        principal_cache.put(principal, generation)
+    return principal
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    """Mevcut kullanıcıyı token'dan alır (önbellekten; yoksa veritabanından)."""
+    return _load_principal(token, db)
+
+def get_current_reader(token: str = Depends(oauth2_scheme), db: Session = Depends(get_read_db)) -> Principal:
+    """
+    Mevcut kullanıcıyı önbellekten veya okuma oturumundan (replika) alır; yalnızca okuyan
+    endpoint'ler için. Replika geride olabileceğinden buradan okunan değer önbelleğe yazılmaz.
+    """
+    return _load_principal(token, db, cache=False)
 
-def get_department(current_user: User = Depends(get_current_user)):
+def get_department(current_user: Principal = Depends(get_current_user)):
     """Departman yöneticisi veya admin yetkisi kontrolü."""
     if current_user.role.name not in ["department", "admin"]:
         raise HTTPException(
@@ -43,11 +89,52 @@ def get_department(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
-def get_support(current_user: User = Depends(get_current_user)):
+def get_admin(current_user: Principal = Depends(get_current_user)):
+    """Admin yetkisi kontrolü."""
+    if current_user.role.name != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bu işleme yalnızca Admin yetkilidir."
+        )
+    return current_user
+
+def get_support(current_user: Principal = Depends(get_current_user)):
     """Destek personeli, departman yöneticisi veya admin yetkisi kontrolü."""
     if current_user.role.name not in ["support", "department", "admin"]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bu işleme yetkiniz yok (Yalnızca Destek/Departman Yöneticisi/Admin)."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+class ReadYourWritesMiddleware:
+    """
+    Başarılı yazma isteklerinden (GET/HEAD/OPTIONS dışı, durum < 400) sonra isteği yapan
+    kullanıcıyı `read_router`'a bildirir. Yanıt başlığı gönderilmeden işaretlenir; istemci
+    sonraki okumasında kendi yazdığını görür. Replika tanımlı değilse hiçbir şey yapmaz.
+    """
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS or not read_router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        subject = _token_subject(token) if scheme.lower() == "bearer" and token else None
+        if subject is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def _send(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                read_router.mark_write(subject)
+            await send(message)
+
+        await self.app(scope, receive, _send)
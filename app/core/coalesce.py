@@ -0,0 +1,137 @@
+"""
+`/suggest` için istek birleştirme ve sunucu tarafı debounce.
+
+Form doldurulurken `/suggest` art arda ve çoğu zaman aynı metinle çağrılır.
+
+- `SingleFlight`: aynı anahtarla (normalize edilmiş başlık/açıklama + departmanlar) eşzamanlı
+  gelen istekler tek bir hesaplamayı paylaşır. Bekleyen istemcilerin hepsi vazgeçerse
+  (bağlantı kapandı, debounce ile geçersiz kaldı) paylaşılan hesaplama da iptal edilir.
+- `Debouncer`: istemcinin önceki isteği sürmüyorsa yeni istek beklemeden çalışır. Sürüyorsa
+  önceki kesilir (modele gitmişse çağrısı da iptal edilir) ve yeni istek
+  `SUGGEST_DEBOUNCE_SECONDS` bekler; bu sırada yenisi gelirse o da modele gitmeden reddedilir.
+  Böylece tek istekler gecikmez, yazarken gelen art arda isteklerden yalnızca sonuncusu çalışır.
+  İstemci, frontend'in sekme başına ürettiği `X-Client-Id` başlığıyla, yoksa `Authorization`
+  başlığıyla ayırt edilir. İkisi de yoksa debounce uygulanmaz: NAT veya proxy arkasındaki
+  farklı öğrenciler aynı IP ve tarayıcıyı paylaşabilir, birbirlerinin isteklerini düşürmemeli.
+
+Görevler event loop'a bağlı olduğundan uçuştaki hesaplamalar loop başına tutulur.
+"""
+import asyncio
+import weakref
+from typing import Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request
+
+from app.core import metrics
+from app.core.config import settings
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = weakref.WeakKeyDictionary()  # loop -> {anahtar: [görev, bekleyen sayısı]}
+        self.leaders = 0
+        self.shared = 0
+        self.cancelled = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """Aynı anahtar için uçuşta bir çağrı varsa onun sonucunu bekler, yoksa `fn()`'i başlatır."""
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        call = calls.get(key)
+        if call is None:
+            call = [asyncio.ensure_future(fn()), 0]
+            calls[key] = call
+            call[0].add_done_callback(lambda task: calls.pop(key, None) if calls.get(key) is call else None)
+            self.leaders += 1
+        else:
+            self.shared += 1
+        task = call[0]
+        call[1] += 1
+        try:
+            # shield: bir bekleyenin iptali diğerlerinin sonucunu bozmasın
+            return await asyncio.shield(task)
+        finally:
+            call[1] -= 1
+            if call[1] == 0 and not task.done():
+                task.cancel()
+                self.cancelled += 1
+
+    def stats(self) -> dict:
+        return {
+            "leaders": self.leaders,
+            "shared": self.shared,
+            "cancelled": self.cancelled,
+            "in_flight": sum(len(calls) for calls in list(self._calls.values())),
+        }
+
+
+class Superseded(Exception):
+    """Aynı istemciden daha yeni bir istek geldi; bu isteğin sonucu artık istenmiyor."""
+
+
+class Debouncer:
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._pending = weakref.WeakKeyDictionary()  # loop -> {anahtar: en yeni isteğin olayı}
+        self.immediate = 0
+        self.passed = 0
+        self.superseded = 0
+
+    async def run(self, key: Optional[Hashable], fn: Callable[[], Awaitable]):
+        """
+        `fn()`'i çalıştırır. Aynı istemcinin önceki isteği sürmüyorsa hemen başlar; sürüyorsa
+        önceki `Superseded` ile kesilir ve bu istek pencere kadar bekler. Bekleme veya çalışma
+        sırasında daha yeni bir istek gelirse bu da `Superseded` ile kesilir.
+        """
+        if key is None or self.window_seconds <= 0:
+            return await fn()
+        pending = self._pending.setdefault(asyncio.get_running_loop(), {})
+        previous = pending.get(key)
+        superseded = asyncio.Event()
+        pending[key] = superseded
+        try:
+            if previous is None:
+                self.immediate += 1
+            else:
+                # kullanıcı hâlâ yazıyor: önceki isteği bırak, yazmayı bırakmasını bekle
+                previous.set()
+                await self._until(superseded, asyncio.sleep(self.window_seconds))
+                self.passed += 1
+            return await self._until(superseded, fn())
+        finally:
+            if pending.get(key) is superseded:
+                del pending[key]
+
+    async def _until(self, superseded: asyncio.Event, coro: Awaitable):
+        """`coro`'yu bekler; önce `superseded` gelirse iptal eder ve `Superseded` fırlatır."""
+        work = asyncio.ensure_future(coro)
+        stop = asyncio.ensure_future(superseded.wait())
+        try:
+            await asyncio.wait({work, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            interrupted = not work.done()
+            if interrupted:
+                work.cancel()
+        if interrupted:
+            self.superseded += 1
+            raise Superseded()
+        return work.result()
+
+    def stats(self) -> dict:
+        return {
+            "window_seconds": self.window_seconds,
+            "pending_clients": sum(len(pending) for pending in list(self._pending.values())),
+            "immediate": self.immediate,
+            "passed": self.passed,
+            "superseded": self.superseded,
+        }
+
+
+def client_key(request: Request) -> Optional[str]:
+    """Debounce anahtarı: sekme kimliği veya bearer token; istemci tanınmıyorsa None."""
+    return request.headers.get("x-client-id") or request.headers.get("authorization") or None
+
+
+suggest_flight = SingleFlight()
+suggest_debouncer = Debouncer(settings.SUGGEST_DEBOUNCE_SECONDS)
+metrics.register("suggest_coalescing", lambda: {**suggest_flight.stats(), **suggest_debouncer.stats()})
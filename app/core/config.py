@@ -3,17 +3,94 @@ import os
 
 class Settings(BaseSettings):
     # Veritabanı Ayarları
-    DATABASE_URL: str = "sqlite:///./campusupport.db"
+    DATABASE_URL: str = "sqlite:///./app/campusupport.db"
+    # Async endpoint'ler için URL; boşsa DATABASE_URL'in async sürücülü karşılığı kullanılır
+    ASYNC_DATABASE_URL: str = ""
+    # SQLite bağlantı ayarları (her yeni bağlantıda PRAGMA olarak uygulanır)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # kilitli veritabanında hata vermeden önce bekleme süresi
+    SQLITE_CACHE_SIZE_KB: int = 20000  # bağlantı başına sayfa önbelleği
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB memory-mapped I/O
+    # Sunucu veritabanları (PostgreSQL/MySQL) için bağlantı havuzu ayarları
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # saniye
+    # Okuma replikaları (virgülle ayrılmış URL'ler). Boşsa tüm okumalar DATABASE_URL'e gider.
+    DATABASE_READ_URLS: str = ""
+    # Kullanıcı yazdıktan sonra bu kadar saniye okumaları birincil veritabanından yapılır
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Bağlanılamayan replika bu kadar saniye devre dışı kalır (okumalar birincile düşer)
+    READ_REPLICA_RETRY_SECONDS: float = 30.0
+    # Açılışta şema güncel değilse migration'ları uygula (geliştirme için). Üretimde False
+    # yapıp migration'ları deploy öncesinde `python -m app.migrations upgrade` ile çalıştırın.
+    AUTO_MIGRATE: bool = True
+    # Arşivleme: "Closed" durumunda bu kadar gün kalan ticket'lar arşiv tablolarına taşınır
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 500  # transaction başına taşınan ticket sayısı
 
     # JWT Ayarları
     # ----------------------------------------------
     SECRET_KEY: str = "YOUR_SUPER_SECRET_KEY_PLACEHOLDER"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Refresh token (sunucu tarafı oturum) ömrü; bkz. app.core.sessions
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    # İptal edilen access token'lar (bkz. app.core.revocation): Bloom filtresi boyutu,
+    # tablodan yeni iptallerin okunma aralığı ve filtrenin baştan kurulma aralığı
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_REFRESH_SECONDS: float = 5.0
+    REVOCATION_REBUILD_SECONDS: float = 600.0
+    # Bcrypt maliyet faktörü; değiştirilirse eski hash'ler kullanıcı giriş yaptıkça yenilenir
+    BCRYPT_ROUNDS: int = 12
+    # Şifre hash/doğrulama işlemleri için ayrı süreç havuzu (bkz. app.core.hashing)
+    PASSWORD_POOL_WORKERS: int = 2
+    PASSWORD_POOL_MAX_QUEUE: int = 32  # çalışan işler dışında bekleyebilecek en fazla iş; dolunca 503
+    # Giriş denemesi sınırları (bkz. app.core.throttle): burst kadar deneme, sonra dakikada N
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: float = 10
+    LOGIN_ACCOUNT_BURST: int = 5
+    LOGIN_ACCOUNT_PER_MINUTE: float = 2
+    LOGIN_MAX_CONCURRENT_VERIFY: int = 8  # aynı anda çalışan şifre doğrulaması
+    # "memory" (süreç başına) veya "sqlite" (worker'lar arasında paylaşılan dosya)
+    LOGIN_THROTTLE_STORE: str = "memory"
+    LOGIN_THROTTLE_SQLITE_PATH: str = "./app/login_throttle.db"
+    # Uygulama güvenilen bir proxy arkasındaysa istemci IP'si X-Forwarded-For'dan alınır.
+    # Soldaki değerleri istemci uydurabilir: sağdan LOGIN_THROTTLE_TRUSTED_HOPS'uncu adres
+    # (önümüzdeki güvenilen proxy sayısı; tek proxy için en sağdaki) kullanılır.
+    LOGIN_THROTTLE_TRUST_FORWARDED: bool = False
+    LOGIN_THROTTLE_TRUSTED_HOPS: int = 1
+    # Doğrulanmış token önbelleği: imza kontrolü token başına bir kez yapılır
+    TOKEN_CACHE_SIZE: int = 10000
+    # Kimliği doğrulanmış kullanıcı önbelleği (bkz. app.core.principals)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
     # ----------------------------------------------
 
     # Yapay Zeka Ayarları (Bölüm 2)
     OPENAI_API_KEY: str = "placeholder"
+    OPENAI_MODEL: str = "gpt-3.5-turbo"
+    # OpenAI uyumlu başka bir sunucu için (ör. proxy veya testlerdeki yerel stub); boşsa api.openai.com
+    OPENAI_BASE_URL: str = ""
+    OPENAI_TIMEOUT_SECONDS: float = 15.0
+    OPENAI_MAX_RETRIES: int = 2
+    # /suggest için departman, öncelik ve başlık tek bir JSON-modu çağrısıyla istenir
+    OPENAI_STRUCTURED_SUGGEST: bool = True
+    # Model cevapları önbelleği (bkz. app.core.llm_cache): süreç içi LRU + kalıcı SQLite dosyası.
+    # LLM_CACHE_SQLITE_PATH boşsa yalnızca bellekte tutulur; TTL 0 ise önbellek kapalıdır.
+    LLM_CACHE_SIZE: int = 2000
+    LLM_CACHE_TTL_SECONDS: float = 86400.0
+    LLM_CACHE_MAX_ROWS: int = 100000
+    LLM_CACHE_SQLITE_PATH: str = "./app/llm_cache.db"
+    # /suggest: istemcinin önceki isteği sürerken gelen istek bu kadar bekler, arada yenisi gelirse düşer; 0 ise kapalı
+    SUGGEST_DEBOUNCE_SECONDS: float = 0.25
+    # Yerel sınıflandırıcı (bkz. app.core.triage): güven bu eşiğin altındaysa LLM'e sorulur
+    TRIAGE_ENABLED: bool = True
+    TRIAGE_CONFIDENCE_THRESHOLD: float = 0.8
+    TRIAGE_RETRAIN_SECONDS: float = 300.0  # yeni ticket'larla artımlı eğitim aralığı
+    TRIAGE_FULL_RETRAIN_SECONDS: float = 86400.0  # değişen etiketler için baştan eğitim
+    # Anahtar kelime kuralları (bkz. app.core.rules): diğer worker'lardaki değişiklikler en geç bu sürede görülür
+    RULES_REFRESH_SECONDS: float = 5.0
 
     # Bildirim Servisi Ayarları (Bölüm 2)
     NOTIFICATION_API_URL: str = "http://notifications.example.com/api/v1/send"
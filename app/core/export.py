@@ -0,0 +1,132 @@
+"""
+Ticket dışa aktarımı (CSV / NDJSON).
+
+Satırlar veritabanından `yield_per` gruplarıyla okunur ve okundukça gönderilir; ORM
+nesnesi veya Pydantic modeli oluşturulmaz, bellek kullanımı satır sayısından bağımsızdır.
+NDJSON'da her satır yorumlarıyla birlikte bir ticket'tır; yorumlar ticket id sırasıyla
+ayrı bir akıştan okunup ticket akışıyla birleştirilir. CSV'de ticket başına bir satır
+ve yorum sayısı bulunur.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+
+from app.models.ticket import Comment, Ticket
+from app.models.user import Department, User
+
+EXPORT_BATCH_SIZE = 1000
+# Bu boyuta ulaşan çıktı parçası istemciye gönderilir
+CHUNK_SIZE = 64 * 1024
+
+CSV_FIELDS = [
+    "id", "title", "description", "status", "priority", "category", "department", "created_by",
+    "assigned_support", "created_at", "updated_at", "closed_at", "comment_count",
+]
+
+_Creator = aliased(User)
+_Support = aliased(User)
+_Commentator = aliased(User)
+
+
+def _ticket_query(conditions: Sequence, with_comment_count: bool):
+    columns = [
+        Ticket.id, Ticket.title, Ticket.description, Ticket.status, Ticket.priority, Ticket.category,
+        Department.name.label("department"), _Creator.email.label("created_by"),
+        _Support.email.label("assigned_support"), Ticket.created_at, Ticket.updated_at, Ticket.closed_at,
+    ]
+    if with_comment_count:
+        columns.append(
+            select(func.count(Comment.id)).where(Comment.ticket_id == Ticket.id).scalar_subquery().label("comment_count")
+        )
+    return (
+        select(*columns)
+        .outerjoin(Department, Department.id == Ticket.assigned_department_id)
+        .outerjoin(_Creator, _Creator.id == Ticket.created_by_user_id)
+        .outerjoin(_Support, _Support.id == Ticket.assigned_support_id)
+        .where(*conditions)
+        .order_by(Ticket.id)
+    )
+
+
+def _comment_query(conditions: Sequence):
+    return (
+        select(Comment.ticket_id, Comment.id, _Commentator.email.label("user"), Comment.content, Comment.created_at)
+        .join(Ticket, Ticket.id == Comment.ticket_id)
+        .outerjoin(_Commentator, _Commentator.id == Comment.user_id)
+        .where(*conditions)
+        .order_by(Comment.ticket_id, Comment.id)
+    )
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _chunked(lines: Iterator[str]) -> Iterator[str]:
+    # İlk satır hemen gönderilir (istemci akışın başladığını görür), sonrası gruplanır
+    first = next(lines, None)
+    if first is None:
+        return
+    yield first
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _ndjson_lines(connection, conditions: Sequence) -> Iterator[str]:
+    streaming = connection.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    tickets = streaming.execute(_ticket_query(conditions, with_comment_count=False))
+    comments = iter(streaming.execute(_comment_query(conditions)))
+    pending = next(comments, None)
+
+    for ticket in tickets:
+        record = {key: _value(value) for key, value in ticket._mapping.items()}
+        record["comments"] = []
+        # İki akış da ticket id'ye göre sıralı: bu ticket'ın yorumlarını sıradan al
+        while pending is not None and pending.ticket_id <= ticket.id:
+            if pending.ticket_id == ticket.id:
+                record["comments"].append({
+                    "id": pending.id, "user": pending.user, "content": pending.content,
+                    "created_at": _value(pending.created_at),
+                })
+            pending = next(comments, None)
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(connection, conditions: Sequence) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def _take() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(CSV_FIELDS)
+    yield _take()
+    rows = connection.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(_ticket_query(conditions, with_comment_count=True))
+    for row in rows:
+        writer.writerow([_value(row._mapping[field]) for field in CSV_FIELDS])
+        yield _take()
+
+
+def export_tickets(bind, conditions: Sequence, fmt: str) -> Iterator[str]:
+    """
+    Koşullara uyan ticket'ları `fmt` ("csv" / "ndjson") biçiminde parça parça üretir.
+    Kendi bağlantısını açar; akış bitene (veya istemci bağlantıyı kesene) kadar tutar.
+    """
+    lines = _csv_lines if fmt == "csv" else _ndjson_lines
+    with bind.connect() as connection:
+        yield from _chunked(lines(connection, conditions))
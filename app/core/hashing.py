@@ -0,0 +1,120 @@
+"""
+Şifre hash/doğrulama için ayrı, boyutu sınırlı süreç havuzu.
+
+Bcrypt bir çağrıda ~250 ms CPU harcar. Senkron endpoint'lerde çalıştığında Starlette'in
+thread havuzunu doldurur ve GIL'i tuttuğu için diğer isteklerin Python kodunu da yavaşlatır.
+İşler `PASSWORD_POOL_WORKERS` süreçlik bir havuzda çalışır ve async API ile beklenir.
+Çalışan işlerin dışında en fazla `PASSWORD_POOL_MAX_QUEUE` iş bekleyebilir. Kuyruk doluysa
+istek beklemeden 503 ile reddedilir; giriş dalgası kuyruğu sonsuza kadar uzatmaz.
+İstemci vazgeçse de başlamış bir iş durdurulamaz; slot ancak iş bittiğinde boşalır.
+Gecikme yüzdelikleri yalnızca başarıyla biten işlerden hesaplanır.
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+# Gecikme yüzdelikleri bu kadar son işten hesaplanır
+LATENCY_SAMPLES = 1000
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self._latencies_ms = deque(maxlen=LATENCY_SAMPLES)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: çok thread'li sunucu sürecini fork etmek kilitleri kopyalayabilir
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Sunucu şu anda yoğun, lütfen birazdan tekrar deneyin.",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._release(None, start)
+            raise
+        # Slot, bekleyen coroutine'e değil havuzdaki işe bağlı: istemci bağlantıyı kesse de
+        # başlamış iş bitene kadar sınır içinde sayılır (kuyrukta bekleyen iş ise iptal edilir)
+        future.add_done_callback(lambda f: self._release(f, start))
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future, start: float):
+        with self._lock:
+            self._in_flight -= 1
+            if future is not None and future.cancelled():
+                self.cancelled += 1
+            elif future is None or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self._latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password, settings.BCRYPT_ROUNDS)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies_ms)
+            in_flight = self._in_flight
+
+        def _percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2) if latencies else None
+
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "latency_ms_p50": _percentile(0.50),
+            "latency_ms_p95": _percentile(0.95),
+            "latency_ms_max": round(latencies[-1], 2) if latencies else None,
+        }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_POOL_WORKERS, settings.PASSWORD_POOL_MAX_QUEUE)
+metrics.register("password_hasher", password_hasher.stats)
@@ -0,0 +1,323 @@
+"""
+Geçmiş ticket'ların toplu içe aktarımı (NDJSON / CSV).
+
+Kayıt biçimi dışa aktarımla (`app.core.export`) aynıdır: title, description, status,
+priority, category, department (ad), created_by (e-posta), assigned_support (e-posta),
+created_at, updated_at, closed_at ve NDJSON'da `comments` listesi (user, content,
+created_at). Departman ve kullanıcı referansları grup başına tek sorguyla çözülür,
+satırlar Core `executemany` ile `IMPORT_CHUNK_SIZE`'lık transaction'larda eklenir.
+AI zenginleştirme (eksik departman/öncelik/başlık için `suggest_ticket`) yalnızca
+istenirse çalışır. Hatalı satırlar atlanır ve satır numarasıyla raporlanır.
+
+    python -m app.core.importer tickets.ndjson [--format csv] [--enrich]
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.database import begin_immediate
+from app.models.ticket import Comment, PRIORITY_RANKS, Ticket, apply_ticket_stat_deltas, priority_rank, ticket_stat_key
+from app.models.user import Department, User
+
+logger = logging.getLogger("app.core.importer")
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+ENRICH_CONCURRENCY = 8
+VALID_STATUSES = ("Open", "In Progress", "Resolved", "Closed")
+
+_tickets = Ticket.__table__
+_comments = Comment.__table__
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.comments = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, row: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self) -> dict:
+        return {"imported": self.imported, "comments": self.comments,
+                "error_count": self.error_count, "errors": self.errors}
+
+
+def read_records(stream, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Metin akışından (satır no, kayıt, hata) üçlüleri üretir; dosyayı belleğe almaz."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, None
+        return
+
+    for row, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, None, f"Geçersiz JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Her satır bir JSON nesnesi olmalıdır."
+            continue
+        yield row, record, None
+
+
+def _text(record: dict, key: str) -> Optional[str]:
+    value = record.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    # Veritabanındaki zamanlar naive UTC'dir
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class _References:
+    """Departman ve kullanıcı referanslarını toplu çözer ve önbellekte tutar."""
+
+    def __init__(self, connection):
+        self.departments = dict(connection.execute(select(Department.name, Department.id)).all())
+        self.users = {}
+
+    def resolve_users(self, connection, emails: Iterable[str]):
+        missing = {e for e in emails if e and e not in self.users}
+        if missing:
+            found = dict(connection.execute(select(User.email, User.id).where(User.email.in_(missing))).all())
+            for email in missing:
+                self.users[email] = found.get(email)
+
+
+def _emails(record: dict) -> List[str]:
+    emails = [_text(record, "created_by"), _text(record, "assigned_support")]
+    for comment in record.get("comments") or []:
+        if isinstance(comment, dict):
+            emails.append(_text(comment, "user"))
+    return [e for e in emails if e]
+
+
+async def _suggest_all(records: List[dict], department_names: List[str]) -> List[Optional[dict]]:
+    from app.core.services import suggest_ticket
+
+    semaphore = asyncio.Semaphore(ENRICH_CONCURRENCY)
+
+    async def _one(record):
+        async with semaphore:
+            try:
+                return await suggest_ticket(_text(record, "title") or "", _text(record, "description") or "", department_names)
+            except Exception:
+                logger.exception("Import enrichment failed")
+                return None
+
+    return await asyncio.gather(*(_one(r) for r in records))
+
+
+def _enrich(records: List[dict], department_names: List[str]):
+    """Eksik departman/öncelik/başlık alanlarını AI önerisiyle doldurur (yalnızca istenirse)."""
+    needs = [r for r in records if not (_text(r, "department") and _text(r, "priority") and _text(r, "title"))]
+    if not needs:
+        return
+    for record, suggestion in zip(needs, asyncio.run(_suggest_all(needs, department_names))):
+        if not suggestion:
+            continue
+        if not _text(record, "department") and suggestion.get("department_options"):
+            record["department"] = suggestion["department_options"][0]
+        if not _text(record, "priority") and suggestion.get("priority_options"):
+            record["priority"] = suggestion["priority_options"][0]
+        if not _text(record, "title") and suggestion.get("suggested_title"):
+            record["title"] = suggestion["suggested_title"]
+
+
+def _build(record: dict, refs: _References, now: datetime) -> Tuple[dict, List[dict]]:
+    """Kaydı tickets satırına ve yorum satırlarına çevirir; geçersizse ValueError."""
+    description = _text(record, "description")
+    if not description:
+        raise ValueError("description zorunludur.")
+
+    department_name = _text(record, "department")
+    if not department_name:
+        raise ValueError("department belirtilmemiş.")
+    department_id = refs.departments.get(department_name)
+    if department_id is None:
+        raise ValueError(f"Bilinmeyen departman: {department_name}")
+
+    creator_email = _text(record, "created_by")
+    creator_id = refs.users.get(creator_email) if creator_email else None
+    if creator_id is None:
+        raise ValueError(f"Bilinmeyen kullanıcı (created_by): {creator_email}")
+
+    support_email = _text(record, "assigned_support")
+    support_id = None
+    if support_email:
+        support_id = refs.users.get(support_email)
+        if support_id is None:
+            raise ValueError(f"Bilinmeyen kullanıcı (assigned_support): {support_email}")
+
+    status = _text(record, "status") or "Open"
+    if status not in VALID_STATUSES:
+        raise ValueError(f"Geçersiz durum: {status}")
+    priority = _text(record, "priority") or "Low"
+    if priority not in PRIORITY_RANKS:
+        raise ValueError(f"Geçersiz öncelik: {priority}")
+
+    try:
+        created_at = _parse_datetime(record.get("created_at")) or now
+        updated_at = _parse_datetime(record.get("updated_at")) or created_at
+        closed_at = _parse_datetime(record.get("closed_at"))
+    except ValueError as e:
+        raise ValueError(f"Geçersiz tarih: {e}")
+    if status == "Closed" and closed_at is None:
+        closed_at = updated_at
+    elif status != "Closed":
+        closed_at = None
+
+    ticket = {
+        "title": _text(record, "title") or description[:80],
+        "description": description,
+        "status": status,
+        "priority": priority,
+        "priority_rank": priority_rank(priority),
+        "category": _text(record, "category"),
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "closed_at": closed_at,
+        "created_by_user_id": creator_id,
+        "assigned_department_id": department_id,
+        "assigned_support_id": support_id,
+    }
+
+    comments = []
+    for comment in record.get("comments") or []:
+        if not isinstance(comment, dict) or not _text(comment, "content"):
+            raise ValueError("Geçersiz yorum kaydı.")
+        user_email = _text(comment, "user")
+        user_id = refs.users.get(user_email) if user_email else creator_id
+        if user_id is None:
+            raise ValueError(f"Bilinmeyen kullanıcı (yorum): {user_email}")
+        try:
+            comment_created = _parse_datetime(comment.get("created_at")) or created_at
+        except ValueError as e:
+            raise ValueError(f"Geçersiz tarih: {e}")
+        comments.append({"user_id": user_id, "content": _text(comment, "content"), "created_at": comment_created})
+    return ticket, comments
+
+
+def _insert_chunk(engine, tickets: List[dict], comments: List[List[dict]]) -> int:
+    deltas = Counter(ticket_stat_key(t["assigned_department_id"], t["status"], t["priority"]) for t in tickets)
+    with engine.connect() as connection:
+        begin_immediate(connection)
+        # insertmanyvalues: çok satırlı INSERT'ler; id'ler parametre sırasıyla döner
+        ids = connection.execute(
+            _tickets.insert().returning(_tickets.c.id, sort_by_parameter_order=True), tickets
+        ).scalars().all()
+        comment_rows = [dict(c, ticket_id=ticket_id) for ticket_id, rows in zip(ids, comments) for c in rows]
+        if comment_rows:
+            connection.execute(_comments.insert(), comment_rows)
+        apply_ticket_stat_deltas(connection, deltas)
+        connection.commit()
+    return len(comment_rows)
+
+
+def import_tickets(engine, records: Iterable[Tuple[int, Optional[dict], Optional[str]]], enrich: bool = False,
+                   chunk_size: int = IMPORT_CHUNK_SIZE) -> ImportReport:
+    """`read_records` çıktısını grup grup içe aktarır ve satır bazında rapor döndürür."""
+    report = ImportReport()
+    now = datetime.utcnow()
+    with engine.connect() as connection:
+        refs = _References(connection)
+
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        valid, errors = [], []
+        for row, record, error in chunk:
+            if error:
+                errors.append((row, error))
+            else:
+                valid.append((row, record))
+
+        with engine.connect() as connection:
+            refs.resolve_users(connection, (e for _, record in valid for e in _emails(record)))
+        if enrich:
+            _enrich([record for _, record in valid], list(refs.departments))
+
+        rows, tickets, comments = [], [], []
+        for row, record in valid:
+            try:
+                ticket, ticket_comments = _build(record, refs, now)
+            except ValueError as e:
+                errors.append((row, str(e)))
+                continue
+            rows.append(row)
+            tickets.append(ticket)
+            comments.append(ticket_comments)
+        for row, error in sorted(errors):
+            report.error(row, error)
+
+        if not tickets:
+            continue
+        try:
+            report.comments += _insert_chunk(engine, tickets, comments)
+            report.imported += len(tickets)
+        except Exception as e:
+            logger.exception("Import chunk failed (rows %s-%s)", rows[0], rows[-1])
+            for row in rows:
+                report.error(row, f"Grup eklenemedi: {e.__class__.__name__}")
+        logger.info("Imported %s tickets so far (%s errors)", report.imported, report.error_count)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.importer", description="Ticket'ları toplu içe aktar")
+    parser.add_argument("path", help="NDJSON veya CSV dosyası ('-' ise stdin)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None, help="Varsayılan: dosya uzantısı")
+    parser.add_argument("--enrich", action="store_true", help="Eksik departman/öncelik/başlık için AI önerisi kullan")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    from app.database import engine
+
+    if args.path == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        report = import_tickets(engine, read_records(stream, fmt), enrich=args.enrich, chunk_size=args.chunk_size)
+    else:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = import_tickets(engine, read_records(stream, fmt), enrich=args.enrich, chunk_size=args.chunk_size)
+
+    print(json.dumps(report.as_dict(), ensure_ascii=False, indent=2))
+    return 0 if report.error_count == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+LLM cevap önbelleği.
+
+Aynı ticket metni modele defalarca gider: kullanıcı formu doldururken `/suggest`, ticket
+oluşturulurken yine `suggest_ticket`, ticket her açıldığında özet ve cevap taslağı. Cevaplar
+içerik adresli olarak saklanır. Anahtar, normalize edilmiş prompt ile model parametrelerinin
+(model, max_tokens, temperature, response_format) SHA-256 özetidir. Prompt veya ayar
+değişince anahtar da değişir; eski kayıtlar TTL ile düşer.
+
+İki katman vardır:
+- Süreç içi LRU (`LLM_CACHE_SIZE` kayıt).
+- Ayrı bir SQLite dosyası (`LLM_CACHE_SQLITE_PATH`). Yeniden başlatmadan sonra da kalır ve
+  worker'lar arasında paylaşılır; en fazla `LLM_CACHE_MAX_ROWS` satır tutulur.
+
+Hata veren çağrılar (istisna) önbelleğe yazılmaz. Async kod `get_async`/`put_async` kullanır:
+SQLite katmanı senkron olduğundan okuma/yazma thread'de yapılır, event loop bloklanmaz.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+# Bu kadar yazmada bir süresi dolmuş ve fazla satırlar silinir
+PRUNE_EVERY = 500
+
+
+def cache_key(prompt: str, params: dict) -> str:
+    """Boşluk farkları yok sayılarak prompt + parametrelerin özeti."""
+    normalized = " ".join(prompt.split())
+    payload = json.dumps({"prompt": normalized, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SqliteLLMStore:
+    """Kalıcı katman: anahtar -> (cevap, son geçerlilik anı)."""
+
+    def __init__(self, path: str, max_rows: int):
+        self.max_rows = max_rows
+        self._connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_expires_at ON llm_cache (expires_at)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        return row
+
+    def put(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)", (key, value, expires_at)
+            )
+
+    def prune(self, now: float) -> int:
+        """Süresi dolanları ve sınırı aşan (en erken dolacak) satırları siler."""
+        with self._lock:
+            removed = self._connection.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount
+            removed += self._connection.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            ).rowcount
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_cache")
+
+
+class LLMCache:
+    def __init__(self, maxsize: int, ttl: float, store: Optional[SqliteLLMStore] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pruned = 0
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._items[key] = (expires_at, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0] > now:
+                self._items.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._items[key]
+        return None
+
+    def _store_result(self, key: str, row) -> Optional[str]:
+        if row is None:
+            self.misses += 1
+            return None
+        self.store_hits += 1
+        self._remember(key, row[0], row[1])
+        return row[0]
+
+    def _store_put(self, key: str, value: str, expires_at: float, now: float):
+        """Kalıcı katmana yazar; her PRUNE_EVERY yazmada bir temizler."""
+        self.store.put(key, value, expires_at)
+        with self._lock:
+            self._puts += 1
+            prune = self._puts % PRUNE_EVERY == 0
+        if prune:
+            self.pruned += self.store.prune(now)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is not None:
+            return value
+        return self._store_result(key, self.store.get(key, now) if self.store else None)
+
+    def put(self, key: str, value: str):
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(key, value, expires_at)
+        if self.store:
+            self._store_put(key, value, expires_at, now)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """`get` gibi; bellekte yoksa SQLite okuması event loop'u bloklamasın diye thread'de yapılır."""
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is not None:
+            return value
+        row = await asyncio.to_thread(self.store.get, key, now) if self.store else None
+        return self._store_result(key, row)
+
+    async def put_async(self, key: str, value: str):
+        """`put` gibi; SQLite yazması ve arada bir yapılan temizlik thread'de çalışır."""
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(key, value, expires_at)
+        if self.store:
+            await asyncio.to_thread(self._store_put, key, value, expires_at, now)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+        if self.store:
+            self.store.clear()
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.store_hits
+        lookups = hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "persistent": self.store is not None,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "pruned": self.pruned,
+        }
+
+
+def create_llm_cache() -> LLMCache:
+    store = None
+    if settings.LLM_CACHE_SQLITE_PATH:
+        store = SqliteLLMStore(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_MAX_ROWS)
+    return LLMCache(settings.LLM_CACHE_SIZE, settings.LLM_CACHE_TTL_SECONDS, store)
+
+
+llm_cache = create_llm_cache()
+metrics.register("llm_cache", llm_cache.stats)
@@ -0,0 +1,26 @@
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from app.models.ticket import Ticket
+from app.models.user import User
+from app.schemas.ticket import TicketResponse, TicketSummary
+
+# Yanıt şeması -> ilişkilerin nasıl yükleneceği.
+# Tekil (many-to-one) ilişkiler aynı SELECT'e JOIN ile eklenir; koleksiyonlar ise
+# sayfadaki tüm ticket id'leri için tek bir `IN (...)` sorgusuyla (selectin) gelir.
+# Böylece N ticket'lık bir liste 1 + 3N yerine sabit sayıda sorguyla serileştirilir.
+_LOADER_OPTIONS = {
+    TicketResponse: (
+        selectinload(Ticket.comments),
+        joinedload(Ticket.creator).joinedload(User.role),
+    ),
+    # Yorumların kendisi yüklenmez; sayı ve son yorum zamanı aynı SELECT'te alt sorgudur
+    TicketSummary: (
+        undefer(Ticket.comment_count),
+        undefer(Ticket.last_comment_at),
+        joinedload(Ticket.creator).joinedload(User.role),
+    ),
+}
+
+
+def loader_options(schema) -> tuple:
+    """Verilen yanıt şemasını serileştirmek için gereken eager-load seçeneklerini döndürür."""
+    return _LOADER_OPTIONS.get(schema, ())
@@ -0,0 +1,15 @@
+"""
+Süreç içi çalışma metrikleri. Önbellek, havuz gibi bileşenler anlık durumlarını döndüren
+bir fonksiyonu `register` ile kaydeder; `GET /api/v1/metrics` (admin) hepsini birlikte döndürür.
+"""
+from typing import Callable, Dict
+
+_sources: Dict[str, Callable[[], dict]] = {}
+
+
+def register(name: str, collect: Callable[[], dict]):
+    _sources[name] = collect
+
+
+def collect_all() -> dict:
+    return {name: collect() for name, collect in _sources.items()}
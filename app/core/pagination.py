@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+# Liste endpoint'lerinde varsayılan / en büyük sayfa boyutu
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class SortKey:
+    """
+    Keyset sıralamasının tek bir bileşeni.
+
+    `expression` ORDER BY'a giren SQL ifadesi, `value_of` ise sayfanın son satırından
+    cursor'a yazılacak değeri okuyan fonksiyondur.
+    """
+
+    def __init__(self, expression, value_of: Callable[[Any], Any], descending: bool = False):
+        self.expression = expression
+        self.value_of = value_of
+        self.descending = descending
+
+    def order_by(self):
+        return self.expression.desc() if self.descending else self.expression.asc()
+
+    def after(self, value):
+        return self.expression < value if self.descending else self.expression > value
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Sıralama anahtarı değerlerini opak, URL-güvenli bir cursor'a çevirir."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_len: int) -> List[Any]:
+    """`encode_cursor` çıktısını geri çözer; bozuk cursor için 400 döner."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != expected_len:
+            raise ValueError("cursor length mismatch")
+        return [_decode_value(v) for v in values]
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Geçersiz sayfalama cursor'ı.")
+
+
+def _keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    # (k1, k2, ..., kn) > (v1, v2, ..., vn) karşılaştırmasını yön bilgisiyle açar:
+    # k1 > v1 OR (k1 = v1 AND (k2 > v2 OR (k2 = v2 AND ...)))
+    condition = keys[-1].after(values[-1])
+    for key, value in zip(reversed(keys[:-1]), reversed(values[:-1])):
+        condition = or_(key.after(value), and_(key.expression == value, condition))
+    return condition
+
+
+def paginate(query, keys: Sequence[SortKey], limit: int, after: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """
+    Sorguyu `keys` sırasına göre keyset (cursor) yöntemiyle sayfalar.
+
+    Son anahtar benzersiz olmalıdır (genellikle birincil anahtar); böylece eşit sıralama
+    değerlerinde bile sayfalar arasında satır atlanmaz veya tekrarlanmaz.
+    Dönen değer: (satırlar, sonraki sayfanın cursor'ı veya None)
+    """
+    if after:
+        query = query.filter(_keyset_condition(keys, decode_cursor(after, len(keys))))
+
+    rows = query.order_by(*[k.order_by() for k in keys]).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([k.value_of(last) for k in keys])
+    return rows, next_cursor
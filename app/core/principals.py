@@ -0,0 +1,151 @@
+"""
+Kimliği doğrulanmış kullanıcıların (principal) süreç içi önbelleği.
+
+`get_current_user` her istekte kullanıcıyı ve rolünü veritabanından okumak yerine token'daki
+kullanıcı id'siyle buradan alır. Kayıtlar değişmez anlık görüntülerdir (`Principal`);
+boyut sınırlıdır (LRU) ve `PRINCIPAL_CACHE_TTL_SECONDS` sonra düşer. Kullanıcının e-posta,
+şifre, rol veya departmanı ORM üzerinden değiştiğinde kayıt commit sonrası silinir. ORM
+dışından yapılan değişikliklerde `principal_cache.invalidate(user_id)` çağrılmalıdır.
+Önbellek süreç başınadır; diğer worker'larda kayıt en geç TTL sonunda yenilenir.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class PrincipalRole:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class Principal:
+    """İstek boyunca kullanılan kullanıcı bilgisi; ORM nesnesi değildir, lazy load yapmaz."""
+    id: int
+    email: str
+    role: PrincipalRole
+    department_id: Optional[int]
+
+    @property
+    def role_id(self) -> int:
+        return self.role.id
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=PrincipalRole(id=user.role_id, name=user.role.name if user.role else None),
+            department_id=user.department_id,
+        )
+
+
+class PrincipalCache:
+    """Kullanıcı id -> Principal; TTL'li, boyutu sınırlı (LRU), thread-safe."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        # Her silmede artar: silmeden önce okunmuş eski bir kayıt sonradan yazılamaz
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._items[user_id]
+                self.misses += 1
+                return None
+            self._items.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal, generation: int):
+        """`generation()` ile alınan değerden bu yana silme olduysa kaydetmez."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._items[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._items.move_to_end(principal.id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            self._items.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+metrics.register("principal_cache", principal_cache.stats)
+
+
+# Principal'ı etkileyen (veya oturumları geçersiz kılması gereken) User alanları
+_PRINCIPAL_FIELDS = ("email", "password_hash", "role_id", "department_id")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault("changed_user_ids", set())
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changed.add(obj.id)
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in _PRINCIPAL_FIELDS):
+                changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    # Commit'ten sonra: silme ile commit arasında okunan eski değer önbelleğe yazılmasın
+    for user_id in session.info.pop("changed_user_ids", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
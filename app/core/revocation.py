@@ -0,0 +1,183 @@
+"""
+Access token iptali (`jti` claim'i).
+
+İptal edilen token'ların `jti` değerleri `revoked_tokens` tablosunda tutulur ve her
+worker'da bir Bloom filtresine yansıtılır. Her istekte veritabanına gitmek yerine önce
+filtreye bakılır: filtre "yok" derse token kesinlikle iptal edilmemiştir. Yalnızca
+"olabilir" cevabında (gerçek iptal veya düşük olasılıklı yanlış pozitif) tabloya sorulur.
+
+- Filtre `REVOCATION_REFRESH_SECONDS` aralıkla tablodaki yeni kayıtlarla (`id > son görülen`)
+  güncellenir; böylece başka worker'ların iptalleri de en geç bu sürede görülür.
+- Bloom filtresinden eleman silinemez. Filtre `REVOCATION_REBUILD_SECONDS` aralıkla ve
+  süresi dolan kayıtların temizlendiği görüldüğünde (en küçük `id` ilerlediğinde) yalnızca
+  süresi dolmamış kayıtlardan yeniden kurulur.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.user import RevokedToken
+
+_revoked = RevokedToken.__table__
+
+
+class BloomFilter:
+    """Sabit boyutlu Bloom filtresi; `capacity` elemanda yanlış pozitif oranı ~`error_rate`."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Çift hash: tek bir SHA-256 özetinden k konum (Kirsch-Mitzenmacher)
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    def __init__(self, capacity: int, error_rate: float, refresh_seconds: float, rebuild_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Filtreyi boşaltır; bir sonraki kontrolde tablodan yeniden kurulur."""
+        with self._lock:
+            self._filter = BloomFilter(self.capacity, self.error_rate)
+            self._last_id = 0
+            self._first_id = None
+            self._refreshed_at = 0.0
+            self._built_at = 0.0
+        self.filter_negatives = 0
+        self.db_checks = 0
+        self.false_positives = 0
+        self.refreshes = 0
+        self.rebuilds = 0
+
+    def add(self, jti: str):
+        """Bu süreçte iptal edilen token'ı hemen filtreye ekler (commit sonrası)."""
+        self._filter.add(jti)
+
+    def _due(self, now: float) -> Optional[str]:
+        if now - self._built_at >= self.rebuild_seconds or self._filter.count > self._filter.capacity:
+            return "rebuild"
+        if now - self._refreshed_at >= self.refresh_seconds:
+            return "refresh"
+        return None
+
+    def sync(self, db: Session, rebuild: bool = False):
+        """Vadesi geldiyse filtreyi tablodan günceller veya yeniden kurar."""
+        now = time.monotonic()
+        action = "rebuild" if rebuild else self._due(now)
+        # Aynı anda yalnızca bir thread günceller; diğerleri mevcut filtreyle devam eder
+        if action is None or not self._lock.acquire(blocking=False):
+            return
+        try:
+            if action == "refresh":
+                # Temizlik en eski kayıtları siler; en küçük id ilerlediyse filtre baştan kurulur
+                first_id = db.execute(select(func.min(_revoked.c.id))).scalar()
+                if first_id != self._first_id:
+                    action = "rebuild"
+            if action == "rebuild":
+                # Önce sınır: kurulum sırasında eklenen kayıtlar bir sonraki güncellemede okunur
+                first_id, last_id = db.execute(select(func.min(_revoked.c.id), func.max(_revoked.c.id))).one()
+                last_id = last_id or 0
+                jtis = db.execute(
+                    select(_revoked.c.jti).where(_revoked.c.id <= last_id, _revoked.c.expires_at > datetime.utcnow())
+                ).scalars().all()
+                bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+                for jti in jtis:
+                    bloom.add(jti)
+                self._filter, self._first_id, self._last_id, self._built_at = bloom, first_id, last_id, now
+                self.rebuilds += 1
+            else:
+                rows = db.execute(
+                    select(_revoked.c.id, _revoked.c.jti).where(_revoked.c.id > self._last_id).order_by(_revoked.c.id)
+                ).all()
+                for row_id, jti in rows:
+                    self._filter.add(jti)
+                    self._last_id = row_id
+                self.refreshes += 1
+            self._refreshed_at = now
+        finally:
+            self._lock.release()
+
+    def is_revoked(self, jti: str, db: Session) -> bool:
+        self.sync(db)
+        if jti not in self._filter:
+            self.filter_negatives += 1
+            return False
+        self.db_checks += 1
+        revoked = db.execute(select(_revoked.c.id).where(_revoked.c.jti == jti)).first() is not None
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def stats(self) -> dict:
+        bloom = self._filter
+        return {
+            "entries": bloom.count,
+            "bits": bloom.size,
+            "hashes": bloom.hashes,
+            "filter_negatives": self.filter_negatives,
+            "db_checks": self.db_checks,
+            "false_positives": self.false_positives,
+            "refreshes": self.refreshes,
+            "rebuilds": self.rebuilds,
+        }
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    refresh_seconds=settings.REVOCATION_REFRESH_SECONDS,
+    rebuild_seconds=settings.REVOCATION_REBUILD_SECONDS,
+)
+metrics.register("token_revocation", revocation_list.stats)
+
+
+async def revoke_access_token(db: AsyncSession, claims) -> Optional[str]:
+    """
+    Token'ı `revoked_tokens` tablosuna yazar ve `jti` değerini döndürür (`jti`'siz eski
+    token'lar için None). Commit çağırana aittir; ardından `revocation_list.add(jti)` çağrılır.
+    """
+    jti = claims.get("jti")
+    exp = claims.get("exp")
+    if jti is None or exp is None:
+        return None
+    if (await db.execute(select(_revoked.c.id).where(_revoked.c.jti == jti))).first() is None:
+        db.add(RevokedToken(jti=jti, user_id=claims.get("uid"), revoked_at=datetime.utcnow(),
+                            expires_at=datetime.utcfromtimestamp(exp)))
+    return jti
+
+
+def prune_revoked_tokens(connection, now: Optional[datetime] = None) -> int:
+    """Süresi dolmuş token kayıtlarını siler (süresi dolan token zaten reddedilir)."""
+    now = now or datetime.utcnow()
+    return connection.execute(_revoked.delete().where(_revoked.c.expires_at <= now)).rowcount
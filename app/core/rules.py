@@ -0,0 +1,259 @@
+"""
+Anahtar kelime kuralları: öncelik ve departman için kural tabanlı yedek öneri.
+
+Kurallar `keyword_rules` tablosunda tutulur (kelime veya ifade, ağırlık, hedef öncelik veya
+departman) ve admin tarafından `/api/v1/rules` altından düzenlenir. Tüm kalıplar Türkçe'ye
+uygun katlanarak (`fold_text`: "ACİL", "acıl" ve "acil" aynıdır) tek bir Aho-Corasick
+otomatına derlenir. Metin tek geçişte taranır; maliyet metin uzunluğu ve eşleşme sayısıyla
+orantılıdır, kural sayısından bağımsızdır.
+
+Kalıplar kelime başında eşleşir, sonu serbesttir: "çöktü" kuralı "çöktüğü" metnini de bulur
+(Türkçe ekler). Her kural metin başına bir kez sayılır ve hedef başına ağırlıklar toplanır.
+Departmanda en yüksek toplam kazanır. Öncelikte eski davranış korunur: toplamı pozitif olan
+en acil öncelik seçilir (tek bir "acil" kelimesi, ne kadar Medium kelimesi olursa olsun High
+yapar). Sonuç hangi kuralların katkı verdiğini de döndürür.
+
+Kurallar her worker'da bellekte tutulur. `sync` en fazla `RULES_REFRESH_SECONDS` aralıkla
+tablonun sürümüne (satır sayısı, en son `updated_at`) bakar ve değiştiyse yeniden derler;
+bu worker'daki admin değişiklikleri bir sonraki istekte, diğer worker'larınki en geç bu
+sürede görülür. Tablo henüz okunmadıysa `DEFAULT_RULES` kullanılır.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.search import fold_text
+from app.models.ticket import PRIORITY_RANKS, KeywordRule
+
+PRIORITY = "priority"
+DEPARTMENT = "department"
+TARGET_TYPES = (PRIORITY, DEPARTMENT)
+PRIORITIES = list(PRIORITY_RANKS)  # acilden aza
+
+_rules = KeywordRule.__table__
+
+# Tablo henüz okunmadıysa kullanılır (migration 0009 aynı listeyi kendi kopyasıyla ekler):
+# (kalıp, ağırlık, hedef türü, hedef)
+DEFAULT_RULES = [
+    *[(k, 3.0, PRIORITY, "High") for k in ("acil", "hızlı", "urgent", "çok önemli", "kapalı", "sistem", "çöktü")],
+    *[(k, 1.0, PRIORITY, "Medium") for k in ("yavaş", "sürekli", "kopuyor", "erişim", "bağlantı", "ağ", "internet")],
+    *[(k, 1.0, DEPARTMENT, "Bilgi Islem") for k in
+      ("internet", "wifi", "eduroam", "ağ", "bağlantı", "şifre", "e-posta", "sistem", "bilgisayar", "sunucu")],
+    *[(k, 1.0, DEPARTMENT, "Yapi Isleri") for k in
+      ("kalorifer", "elektrik", "su kaçağı", "musluk", "lamba", "klima", "asansör", "pencere", "tadilat")],
+    *[(k, 1.0, DEPARTMENT, "Ogrenci Isleri") for k in
+      ("transkript", "öğrenci belgesi", "harç", "kayıt", "diploma", "yatay geçiş")],
+    *[(k, 1.0, DEPARTMENT, "Akademik Danismanlik") for k in ("danışman", "ders seçimi", "staj", "tez", "akademik")],
+]
+
+
+def normalize(text: str) -> str:
+    """Katlanmış, boşlukları tekleştirilmiş metin (kalıplar ve taranan metin için)."""
+    return " ".join(fold_text(text or "").split())
+
+
+@dataclass(frozen=True)
+class Rule:
+    id: Optional[int]
+    pattern: str
+    weight: float
+    target_type: str
+    target: str
+
+
+@dataclass(frozen=True)
+class RuleScore:
+    label: Optional[str]
+    score: float
+    scores: Dict[str, float]
+    matches: Tuple[Rule, ...]
+
+    def as_dict(self) -> dict:
+        return {
+            "label": self.label,
+            "score": self.score,
+            "scores": self.scores,
+            "matches": [
+                {"rule_id": r.id, "pattern": r.pattern, "target": r.target, "weight": r.weight} for r in self.matches
+            ],
+        }
+
+
+class AhoCorasick:
+    """Çok kalıplı eşleştirici; `finditer` (bitiş ofseti, kalıp sırası) çiftleri üretir."""
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[list] = [[]]
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[node][char] = child
+                node = child
+            self._out[node].append(index)
+
+        # Genişlik öncelikli: her düğümün hata bağlantısı, en uzun uygun son ekin düğümü
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text: str):
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                yield end, index
+
+
+class _CompiledRules:
+    """Kalıp başına kurallar ve tüm kalıplardan kurulmuş tek otomat."""
+
+    def __init__(self, rules: Iterable[Rule]):
+        index = {}
+        self.rules: List[List[Rule]] = []
+        self.rule_count = 0
+        for rule in rules:
+            key = normalize(rule.pattern)
+            if not key or rule.target_type not in TARGET_TYPES:
+                continue
+            if key not in index:
+                index[key] = len(index)
+                self.rules.append([])
+            self.rules[index[key]].append(rule)
+            self.rule_count += 1
+        self.patterns = list(index)
+        self.matcher = AhoCorasick(self.patterns)
+
+    def matched(self, text: str) -> List[Rule]:
+        """Kelime başında eşleşen kalıpların kuralları; her kalıp bir kez."""
+        seen = set()
+        rules = []
+        for end, index in self.matcher.finditer(text):
+            start = end - len(self.patterns[index]) + 1
+            if index in seen or (start > 0 and text[start - 1].isalnum()):
+                continue
+            seen.add(index)
+            rules.extend(self.rules[index])
+        return rules
+
+
+def _best(rules: List[Rule], order: Sequence[str], tiered: bool = False) -> RuleScore:
+    """
+    En yüksek toplamlı hedef; eşitlikte `order`'da önce gelen. `tiered` ise toplamı pozitif
+    olanlardan `order`'da ilk gelen (öncelik katmanları: ağırlık katmanı değiştirmez).
+    """
+    scores = {}
+    for rule in rules:
+        scores[rule.target] = scores.get(rule.target, 0.0) + rule.weight
+    rank = {label: i for i, label in enumerate(order)}
+    positive = [label for label, score in scores.items() if score > 0]
+    if tiered:
+        key = lambda t: rank.get(t, len(rank))
+    else:
+        key = lambda t: (-scores[t], rank.get(t, len(rank)))
+    label = min(positive, key=key) if positive else None
+    return RuleScore(label, scores.get(label, 0.0), scores, tuple(rules))
+
+
+class RuleEngine:
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Varsayılan kurallara döner; bir sonraki `sync` tabloyu yeniden okur."""
+        with self._lock:
+            self._compiled = _CompiledRules(Rule(None, *rule) for rule in DEFAULT_RULES)
+            self._version = None
+            self._checked_at = 0.0
+        self.reloads = 0
+        self.evaluations = 0
+        self.evaluate_seconds = 0.0
+
+    def invalidate(self):
+        """Bu worker'daki bir değişiklikten sonra: bir sonraki `sync` sürüme bakmadan yeniden okur."""
+        self._version = None
+
+    def sync(self, db: Session):
+        """Vadesi geldiyse tablonun sürümüne bakar, değiştiyse kuralları yeniden derler."""
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        # Aynı anda yalnızca bir thread okur; diğerleri mevcut kurallarla devam eder
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            version = tuple(db.execute(select(func.count(), func.max(_rules.c.updated_at))).one())
+            if version != self._version:
+                rows = db.execute(
+                    select(_rules.c.id, _rules.c.pattern, _rules.c.weight, _rules.c.target_type, _rules.c.target)
+                    .order_by(_rules.c.id)
+                ).all()
+                self._compiled = _CompiledRules(Rule(*row) for row in rows)
+                self._version = version
+                self.reloads += 1
+            self._checked_at = now
+        finally:
+            self._lock.release()
+
+    async def sync_async(self, db: AsyncSession):
+        await db.run_sync(self.sync)
+
+    def score(self, title: str, description: str, departments: Optional[Sequence[str]] = None) -> Dict[str, RuleScore]:
+        """{"priority": RuleScore, "department": RuleScore}; departmanlar verilirse yalnızca onlar."""
+        start = time.perf_counter()
+        compiled = self._compiled
+        matched = compiled.matched(normalize(f"{title or ''} {description or ''}"))
+        priority_rules = [r for r in matched if r.target_type == PRIORITY and r.target in PRIORITIES]
+        department_rules = [
+            r for r in matched if r.target_type == DEPARTMENT and (departments is None or r.target in departments)
+        ]
+        result = {
+            PRIORITY: _best(priority_rules, PRIORITIES, tiered=True),
+            DEPARTMENT: _best(department_rules, departments or ()),
+        }
+        self.evaluate_seconds += time.perf_counter() - start
+        self.evaluations += 1
+        return result
+
+    def stats(self) -> dict:
+        compiled = self._compiled
+        return {
+            "rules": compiled.rule_count,
+            "patterns": len(compiled.patterns),
+            "loaded_from_db": self._version is not None,
+            "reloads": self.reloads,
+            "evaluations": self.evaluations,
+            "mean_score_us": round(self.evaluate_seconds / self.evaluations * 1e6, 1) if self.evaluations else 0.0,
+        }
+
+
+rule_engine = RuleEngine(refresh_seconds=settings.RULES_REFRESH_SECONDS)
+metrics.register("keyword_rules", rule_engine.stats)
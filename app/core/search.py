@@ -0,0 +1,163 @@
+import re
+import unicodedata
+from typing import List, Optional
+
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.orm import Session
+
+from app.models.ticket import Comment, CommentArchive, Ticket, TicketArchive
+
+# FTS5 tabloları migration 0004 (canlı) ve 0006'da (arşiv) oluşturulur; ticket
+# satırları rowid = id * 2, yorum satırları rowid = id * 2 + 1 ile tutulur.
+SEARCH_TABLE = "ticket_search"
+ARCHIVE_SEARCH_TABLE = "ticket_archive_search"
+
+# Ticket başına gruplamadan önce BM25'e göre en iyi kaç eşleşmeye bakılacağı
+CANDIDATE_FACTOR = 20
+SNIPPET_WIDTH = 80
+
+_TR_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold_text(text: str) -> str:
+    """
+    Türkçe'ye uygun harf katlama: küçük harf, aksansız, 'ı' -> 'i'.
+    Karakter karakter çalışır; çıktı girdiyle aynı uzunluktadır (snippet ofsetleri için).
+    """
+    folded = []
+    for char in (text or "").translate(_TR_FOLD):
+        lowered = char.lower()
+        char = lowered if len(lowered) == 1 else char
+        folded.append(unicodedata.normalize("NFD", char)[0])
+    return "".join(folded)
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """
+    Kullanıcı girdisini güvenli bir FTS5 MATCH ifadesine çevirir: her kelime tırnaklı
+    bir terimdir (FTS sözdizimi enjekte edilemez), son kelime önek olarak aranır.
+    """
+    tokens = _TOKEN_RE.findall(fold_text(q))
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def highlight(text: str, q: str, width: int = SNIPPET_WIDTH) -> str:
+    """Metnin ilk eşleşme etrafındaki kısmını döndürür; eşleşen kelimeler <mark> içindedir."""
+    text = text or ""
+    tokens = _TOKEN_RE.findall(fold_text(q))
+    if not tokens:
+        return text[:width]
+    folded = fold_text(text)
+    # Son kelime önek olarak arandığı için kelimenin devamını da işaretle
+    pattern = re.compile(
+        r"\b(?:" + "|".join(re.escape(t) + (r"\w*" if i == len(tokens) - 1 else r"\b") for i, t in enumerate(tokens)) + r")"
+    )
+    matches = list(pattern.finditer(folded))
+    if not matches:
+        return text[:width]
+
+    start = max(0, matches[0].start() - width // 4)
+    end = min(len(text), start + width)
+    parts = ["…" if start > 0 else ""]
+    cursor = start
+    for match in matches:
+        if match.start() < start or match.end() > end:
+            continue
+        parts.append(text[cursor:match.start()])
+        parts.append(f"<mark>{text[match.start():match.end()]}</mark>")
+        cursor = match.end()
+    parts.append(text[cursor:end])
+    parts.append("…" if end < len(text) else "")
+    return "".join(parts)
+
+
+class _SearchSource:
+    def __init__(self, table_name: str, ticket_model, comment_model, archived: bool):
+        self.fts = table(table_name, column("rowid"), column("ticket_id"), column("rank"))
+        self.ref = literal_column(table_name)
+        self.ticket_model = ticket_model
+        self.comment_model = comment_model
+        self.archived = archived
+
+
+_LIVE = _SearchSource(SEARCH_TABLE, Ticket, Comment, archived=False)
+_ARCHIVE = _SearchSource(ARCHIVE_SEARCH_TABLE, TicketArchive, CommentArchive, archived=True)
+
+
+def search_tickets(db: Session, q: str, scope=None, limit: int = 20, archived: bool = False) -> List[dict]:
+    """
+    Ticket başlık/açıklama ve yorumlarında tam metin arama yapar.
+
+    `scope` kullanıcının görebileceği ticket'ları sınırlayan SQL koşuludur (None: hepsi);
+    `archived=True` ise canlı tablolar yerine arşiv aranır ve koşul `TicketArchive`
+    sütunlarıyla yazılmalıdır. Sonuçlar BM25 skoruna göre (düşük = daha alakalı)
+    ticket başına tekilleştirilir.
+    """
+    match = build_match_query(q)
+    if not match:
+        return []
+    source = _ARCHIVE if archived else _LIVE
+    model, fts = source.ticket_model, source.fts
+
+    # FTS5 yardımcı fonksiyonları (rank/bm25) aggregate sorguda kullanılamaz; önce en iyi
+    # adaylar sıralı ve LIMIT'li bir alt sorguda seçilir (LIMIT alt sorgunun düzleştirilmesini
+    # de engeller), ardından ticket başına en iyi eşleşme alınır.
+    candidates = (
+        select(fts.c.ticket_id, fts.c.rowid.label("doc_id"), fts.c.rank.label("score"))
+        .join(model, model.id == fts.c.ticket_id)
+        .where(source.ref.op("MATCH")(match))
+        .order_by(fts.c.rank)
+        .limit(limit * CANDIDATE_FACTOR)
+    )
+    if scope is not None:
+        candidates = candidates.where(scope)
+    candidates = candidates.subquery()
+
+    # SQLite'ta min() ile seçilen bare kolon (doc_id) min satırından gelir
+    best = (
+        select(candidates.c.ticket_id, candidates.c.doc_id, func.min(candidates.c.score).label("score"))
+        .group_by(candidates.c.ticket_id)
+        .order_by(literal_column("score"))
+        .limit(limit)
+    )
+    hits = db.execute(best).all()
+    if not hits:
+        return []
+
+    tickets = {t.id: t for t in db.query(model).filter(model.id.in_([h.ticket_id for h in hits]))}
+    comment_ids = [h.doc_id // 2 for h in hits if h.doc_id % 2]
+    comments = {}
+    if comment_ids:
+        comment_model = source.comment_model
+        comments = dict(db.query(comment_model.id, comment_model.content).filter(comment_model.id.in_(comment_ids)).all())
+
+    results = []
+    for hit in hits:
+        ticket = tickets.get(hit.ticket_id)
+        if ticket is None:
+            continue
+        if hit.doc_id % 2:
+            matched_in = "comment"
+            text = comments.get(hit.doc_id // 2, "")
+        else:
+            # Başlıkta eşleşme varsa onu, yoksa açıklamayı göster
+            title_hit = highlight(ticket.title, q)
+            matched_in = "title" if "<mark>" in title_hit else "description"
+            text = ticket.title if matched_in == "title" else ticket.description
+        results.append({
+            "ticket_id": ticket.id,
+            "title": ticket.title,
+            "status": ticket.status,
+            "priority": ticket.priority,
+            "assigned_department_id": ticket.assigned_department_id,
+            "matched_in": matched_in,
+            "snippet": highlight(text, q),
+            "score": hit.score,
+            "archived": source.archived,
+        })
+    return results
@@ -1,8 +1,15 @@
 from passlib.context import CryptContext
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from jose import jwt
+from app.core import metrics
 from app.core.config import settings
 import bcrypt
+import hashlib
+import secrets
+import threading
+import time
 
 # passlib'i bcrypt ile kullanmak için yapılandırma
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -19,14 +26,23 @@ def verify_password(plain_password, hashed_password):
         print(f"Verify password error: {e}")
         return False
 
-def get_password_hash(password: str):
+def get_password_hash(password: str, rounds: int = None):
     # KRİTİK DÜZELTME: Bcrypt'in 72 byte limitini aşan şifreler için zorunlu kısaltma.
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=12))
+    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS))
     return hashed.decode('utf-8')
 
+def password_hash_rounds(hashed_password: str):
+    """Bcrypt hash'inin maliyet faktörü ("$2b$12$..." -> 12); tanınmazsa None."""
+    parts = (hashed_password or "").split("$")
+    return int(parts[2]) if len(parts) > 3 and parts[2].isdigit() else None
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Hash ayarlardaki maliyet faktörüyle üretilmemişse True (girişte yeniden hashlenir)."""
+    return password_hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     if expires_delta:
@@ -36,7 +52,83 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire})
+    # Token'ı tek tek iptal edebilmek için benzersiz kimlik (bkz. app.core.revocation)
+    to_encode.setdefault("jti", secrets.token_hex(16))
 
     # Ayarları buradan settings objesinden çekiyoruz.
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+class VerifiedTokenCache:
+    """
+    Doğrulanmış token -> claim'ler. SPA aynı token'ı oturum boyunca yüzlerce kez gönderir;
+    imza ve claim'ler yalnızca ilk seferde doğrulanır. Anahtar token'ın SHA-256 özetidir
+    (token'ın kendisi bellekte tutulmaz). Kayıt token'ın `exp` anında düşer; boyut sınırlıdır (LRU).
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: bytes):
+        now = time.time()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: bytes, expires_at: float, claims):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[key] = (expires_at, claims)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_SIZE)
+metrics.register("token_cache", token_cache.stats)
+
+
+def decode_access_token(token: str):
+    """
+    Token'ı doğrular ve claim'lerini (salt okunur) döndürür; geçersizse JWTError fırlatır.
+    Daha önce doğrulanmış ve süresi dolmamış token'lar önbellekten gelir.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    claims = MappingProxyType(payload)
+    if isinstance(payload.get("exp"), (int, float)):
+        token_cache.put(key, payload["exp"], claims)
+    return claims
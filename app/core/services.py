@@ -1,3 +1,5 @@
+import asyncio
+import weakref
 import openai
 from datetime import datetime
 import requests
@@ -5,36 +7,112 @@ import json
 import smtplib
 from email.message import EmailMessage
 from app.core.config import settings
+from app.core.llm_cache import cache_key, llm_cache
+from app.core.rules import DEPARTMENT, PRIORITY, rule_engine
+from app.core.triage import triage_classifier
 import logging
+from typing import Optional
 
 logger = logging.getLogger("app.core.services")
 
+PRIORITIES = ["High", "Medium", "Low"]
 
-# OpenAI client (will be used only if valid key is set)
+
+def create_openai_client(api_key: str = None, base_url: str = None):
+    """
+    Async OpenAI istemcisi; anahtar yoksa None (kural tabanlı yedekler kullanılır).
+    `base_url` ile OpenAI uyumlu başka bir sunucu (ör. testlerdeki yerel stub) kullanılabilir.
+    """
+    api_key = api_key or settings.OPENAI_API_KEY
+    if not api_key or api_key == "placeholder":
+        return None
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url or settings.OPENAI_BASE_URL or None,
+        timeout=settings.OPENAI_TIMEOUT_SECONDS,
+        max_retries=settings.OPENAI_MAX_RETRIES,
+    )
+
+
+# OpenAI client (will be used only if valid key is set). Async istemci: LLM çağrıları
+# beklenirken event loop diğer istekleri işlemeye devam eder.
 try:
-    openai_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY != "placeholder" else None
+    openai_client = create_openai_client()
 except Exception:
     openai_client = None
 
 
+# Async istemcinin bağlantı havuzu oluşturulduğu event loop'a bağlıdır. Uygulama tek bir
+# loop'ta çalışır, fakat içe aktarım gibi işler kendi loop'larını (asyncio.run) açar;
+# bu yüzden her loop `openai_client` ayarlarıyla kurulmuş kendi istemcisini kullanır.
+_loop_clients = weakref.WeakKeyDictionary()
+
+
+def _client_for_loop():
+    loop = asyncio.get_running_loop()
+    entry = _loop_clients.get(loop)
+    if entry is None or entry[0] is not openai_client:
+        client = create_openai_client(openai_client.api_key, str(openai_client.base_url))
+        entry = _loop_clients[loop] = (openai_client, client)
+    return entry[1]
+
+
+async def _chat(prompt: str, max_tokens: int, temperature: float, **kwargs) -> str:
+    """
+    Tek bir chat completion çağrısı; modelin cevabını (boşlukları kırpılmış) döndürür.
+    Aynı prompt ve parametrelerle daha önce alınmış cevap önbellekten gelir (bkz. app.core.llm_cache).
+    """
+    params = {"model": settings.OPENAI_MODEL, "max_tokens": max_tokens, "temperature": temperature, **kwargs}
+    key = cache_key(prompt, params)
+    cached = await llm_cache.get_async(key)
+    if cached is not None:
+        return cached
+    response = await _client_for_loop().chat.completions.create(
+        messages=[{"role": "user", "content": prompt}],
+        **params
+    )
+    content = (response.choices[0].message.content or "").strip()
+    if content:
+        await llm_cache.put_async(key, content)
+    return content
+
+
 def suggest_priority_fallback(title: str, description: str) -> str:
     """
-    Basit kural tabanlı öncelik önerisi (OpenAI yokken kullan).
+    Anahtar kelime kurallarıyla öncelik önerisi (OpenAI yokken kullan); kural eşleşmezse Low.
     """
-    txt = f"{title} {description}".lower()
-    if any(k in txt for k in ["acil", "hızlı", "urgent", "çok önemli", "acıl", "kapalı", "sistem", "çöktü"]):
-        return "High"
-    if any(k in txt for k in ["yavaş", "sürekli", "kopuyor", "erişim", "bağlantı", "ağ", "internet"]):
-        return "Medium"
-    return "Low"
+    return rule_engine.score(title, description)[PRIORITY].label or "Low"
+
+
+def suggest_department_fallback(title: str, description: str, departments: list) -> Optional[str]:
+    """Anahtar kelime kurallarıyla departman önerisi; kural eşleşmezse None."""
+    return rule_engine.score(title, description, departments)[DEPARTMENT].label
+
+
+def _classify(title: str, description: str, departments: list = None):
+    """Yerel sınıflandırıcının (departman, öncelik) tahmini; kapalıysa (None, None)."""
+    if not settings.TRIAGE_ENABLED:
+        return None, None
+    return triage_classifier.predict(title, description, departments)
+
+
+def _confident(prediction) -> bool:
+    return prediction is not None and prediction.confidence >= settings.TRIAGE_CONFIDENCE_THRESHOLD
 
 
 async def suggest_priority(title: str, description: str) -> str:
     """
-    OpenAI veya fallback ile ticket önceliği (High/Medium/Low) önerisi döndürür.
+    Ticket önceliği (High/Medium/Low) önerisi döndürür. Yerel sınıflandırıcı yeterince
+    eminse onun tahmini, değilse OpenAI, o da yoksa sınıflandırıcının tahmini veya kurallar.
     """
-    if not openai_client or settings.OPENAI_API_KEY == "placeholder":
-        return suggest_priority_fallback(title, description)
+    _, predicted = _classify(title, description)
+    if predicted is not None and predicted.label not in PRIORITIES:
+        predicted = None
+    if _confident(predicted):
+        return predicted.label
+    fallback = predicted.label if predicted else suggest_priority_fallback(title, description)
+    if not openai_client:
+        return fallback
 
     prompt = (
         f"Aşağıdaki ticket başlığını ve açıklamasını incele ve sadece bir kelime ile önceliği ver: High, Medium veya Low.\n\n"
@@ -43,22 +121,16 @@ async def suggest_priority(title: str, description: str) -> str:
 
     try:
         logger.info("AI request: suggest_priority")
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=5,
-            temperature=0.0
-        )
-        priority = response.choices[0].message.content.strip()
+        priority = await _chat(prompt, max_tokens=5, temperature=0.0)
         logger.info("AI suggest_priority success: %s", priority)
-        if priority in ["High", "Medium", "Low"]:
+        if priority in PRIORITIES:
             return priority
-        if priority.capitalize() in ["High", "Medium", "Low"]:
+        if priority.capitalize() in PRIORITIES:
             return priority.capitalize()
         return "Low"
     except Exception as e:
         logger.exception("OpenAI priority suggestion failed")
-        return suggest_priority_fallback(title, description)
+        return fallback
 
 
 async def categorize_ticket(title: str, description: str, departments: list) -> str:
@@ -68,8 +140,16 @@ async def categorize_ticket(title: str, description: str, departments: list) ->
     if not departments:
         return None
 
-    if not openai_client or settings.OPENAI_API_KEY == "placeholder":
-        return departments[0]
+    # Yerel sınıflandırıcı yeterince eminse LLM'e gidilmez
+    predicted, _ = _classify(title, description, departments)
+    if _confident(predicted):
+        return predicted.label
+    if predicted:
+        fallback = predicted.label
+    else:
+        fallback = suggest_department_fallback(title, description, departments) or departments[0]
+    if not openai_client:
+        return fallback
 
     prompt = (
         f"Asagidaki ticket basligini ve aciklamasini analiz et. "
@@ -80,105 +160,124 @@ async def categorize_ticket(title: str, description: str, departments: list) ->
 
     try:
         logger.info("AI request: categorize_ticket")
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=20,
-            temperature=0.0
-        )
-        category = response.choices[0].message.content.strip()
+        category = await _chat(prompt, max_tokens=20, temperature=0.0)
         logger.info("AI categorize_ticket success: %s", category)
         if category in departments:
             return category
-        return departments[0]
+        return fallback
     except Exception as e:
         logger.exception("OpenAI categorize_ticket failed")
-        return departments[0]
+        return fallback
+
+
+async def _suggest_structured(title: str, description: str, departments: list):
+    """
+    Departman, öncelik, başlık ve açıklamayı tek bir JSON-modu çağrısıyla ister.
+    Cevap alınamaz veya geçersizse None döner (çağıran tek amaçlı çağrılara düşer).
+    """
+    prompt = (
+        "Aşağıdaki ticket için JSON formatında öneriler oluştur.\n"
+        "JSON şu formatta olmalı: {\"department_options\": [\"Dep1\", \"Dep2\"], "
+        "\"priority_options\": [\"High\", \"Medium\"], \"suggested_title\": string, \"explanation\": string}\n"
+        "department_options yalnızca şu departmanlardan olsun, en uygunu ilk sırada: " + ", ".join(departments) + "\n"
+        "priority_options yalnızca High, Medium, Low olsun, en uygunu ilk sırada.\n\n"
+        f"Başlık: {title}\nAçıklama: {description}\n"
+    )
+    try:
+        logger.info("AI request: suggest_ticket (structured)")
+        content = await _chat(prompt, max_tokens=200, temperature=0.1, response_format={"type": "json_object"})
+        parsed = json.loads(content)
+    except Exception:
+        logger.exception("OpenAI structured suggest_ticket failed")
+        return None
+    if not isinstance(parsed, dict):
+        return None
+
+    dept_options = [d for d in parsed.get("department_options") or [] if d in departments]
+    priority_options = [p for p in parsed.get("priority_options") or [] if p in PRIORITIES]
+    if (departments and not dept_options) or not priority_options:
+        logger.warning("AI suggest_ticket returned unusable JSON, using fallback")
+        return None
+    logger.info("AI suggest_ticket success")
+    return {
+        "department": dept_options[0] if dept_options else None,
+        "priority": priority_options[0],
+        "department_options": dept_options,
+        "suggested_title": parsed.get("suggested_title") if isinstance(parsed.get("suggested_title"), str) else None,
+        "explanation": parsed.get("explanation") if isinstance(parsed.get("explanation"), str) else None,
+    }
+
+
+def _rule_explanation(title: str, description: str, departments: list) -> Optional[str]:
+    """Eşleşen anahtar kelime kuralları ve katkıları, ör. "acil → High (+3)"."""
+    scores = rule_engine.score(title, description, departments)
+    matches = [f"{r.pattern} → {r.target} (+{r.weight:g})" for key in (PRIORITY, DEPARTMENT) for r in scores[key].matches]
+    if not matches:
+        return None
+    return "Öneriler anahtar kelime kurallarıyla üretilmiştir: " + ", ".join(matches)
 
 
 async def suggest_ticket(title: str, description: str, departments: list) -> dict:
     """
     Bir ticket için kategori, öncelik ve başlık önerisi döndürür.
     Dönen yapı: {"suggested_title": str, "department_options": [...], "priority_options": [...], "explanation": str}
+
+    Yerel sınıflandırıcı departman ve öncelikten yeterince eminse LLM'e hiç gidilmez.
+    Değilse ve model varsa tek bir yapılandırılmış (JSON) çağrı yapılır. Bu kapalıysa veya
+    başarısız olursa departman ve öncelik çağrıları birbirini beklemeden eşzamanlı çalışır.
     """
-    # Prepare fallback values
-    top_department = await categorize_ticket(title, description, departments)
-    top_priority = await suggest_priority(title, description)
+    predicted_department, predicted_priority = _classify(title, description, departments)
+    classified = (not departments or _confident(predicted_department)) and _confident(predicted_priority) \
+        and predicted_priority.label in PRIORITIES
+
+    structured = None
+    if classified:
+        structured = {
+            "department": predicted_department.label if predicted_department else None,
+            "priority": predicted_priority.label,
+            "department_options": [predicted_department.label] if predicted_department else [],
+            "suggested_title": None,
+            "explanation": "Öneriler geçmiş ticket'larla eğitilmiş yerel sınıflandırıcı tarafından üretilmiştir.",
+        }
+    elif openai_client and settings.OPENAI_STRUCTURED_SUGGEST:
+        structured = await _suggest_structured(title, description, departments)
+
+    if structured:
+        top_department, top_priority = structured["department"], structured["priority"]
+    else:
+        top_department, top_priority = await asyncio.gather(
+            categorize_ticket(title, description, departments),
+            suggest_priority(title, description),
+        )
 
-    # Simple fallback options
     priority_order = [top_priority]
-    for p in ["High", "Medium", "Low"]:
+    for p in PRIORITIES:
         if p not in priority_order:
             priority_order.append(p)
 
-    dept_options = [top_department] if top_department else []
+    dept_options = list(structured["department_options"]) if structured else ([top_department] if top_department else [])
     # try to add more departments heuristically
     for d in departments:
-        if d not in dept_options:
-            dept_options.append(d)
         if len(dept_options) >= 3:
             break
+        if d not in dept_options:
+            dept_options.append(d)
 
     suggested_title = title or (description[:80] + '...' if description else None)
-    explanation = "Öneriler kural tabanlı veya LLM tarafından üretilmiştir." 
-
-    if not openai_client or settings.OPENAI_API_KEY == "placeholder":
-        return {
-            "suggested_title": suggested_title,
-                "department_options": dept_options,
-                "category_options": dept_options,
-            "priority_options": priority_order,
-            "explanation": explanation
-        }
-
-    # Ask the LLM to return a JSON object with fields
-    prompt = (
-        "Aşağıdaki ticket açıklamasını kullanarak JSON formatında öneriler oluştur.\n"
-        "JSON şu formatta olmalı: {\"suggested_title\": string, \"department_options\": [\"Dep1\",\"Dep2\"], \"priority_options\": [\"High\",\"Medium\"], \"explanation\": string}\n"
-        "Departman listesi: " + ", ".join(departments) + "\n\n"
-        f"Başlık: {title}\nAçıklama: {description}\n"
-        "Sadece geçerli JSON çıktısı ver, ekstra metin çıkışına izin verme.\n"
-    )
-
-    try:
-        logger.info("AI request: suggest_ticket")
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=200,
-            temperature=0.1
-        )
-        content = response.choices[0].message.content.strip()
-        # Try to parse JSON from the model output
-        try:
-            parsed = json.loads(content)
-            logger.info("AI suggest_ticket success")
-            return {
-                "suggested_title": parsed.get("suggested_title") or suggested_title,
-                "department_options": parsed.get("department_options") or dept_options,
-                    "category_options": parsed.get("category_options") or dept_options,
-                "priority_options": parsed.get("priority_options") or priority_order,
-                "explanation": parsed.get("explanation") or explanation
-            }
-        except Exception:
-            logger.warning("AI suggest_ticket returned non-JSON, using fallback")
-            # If parsing fails, return fallback
-            return {
-                "suggested_title": suggested_title,
-                "department_options": dept_options,
-                    "category_options": dept_options,
-                "priority_options": priority_order,
-                "explanation": explanation
-            }
-    except Exception as e:
-        logger.exception("OpenAI suggest_ticket failed")
-        return {
-            "suggested_title": suggested_title,
-            "department_options": dept_options,
-                "category_options": dept_options,
-            "priority_options": priority_order,
-            "explanation": explanation
-        }
+    explanation = "Öneriler kural tabanlı veya LLM tarafından üretilmiştir."
+    if not structured and not openai_client:
+        explanation = _rule_explanation(title, description, departments) or explanation
+    if structured:
+        suggested_title = structured["suggested_title"] or suggested_title
+        explanation = structured["explanation"] or explanation
+
+    return {
+        "suggested_title": suggested_title,
+        "department_options": dept_options,
+        "category_options": dept_options,
+        "priority_options": priority_order,
+        "explanation": explanation
+    }
 
 
 async def summarize_text(title: str, description: str) -> str:
@@ -195,7 +294,7 @@ async def summarize_text(title: str, description: str) -> str:
         else:
             snippet = snippet[:200] + '...'
 
-    if not openai_client or settings.OPENAI_API_KEY == "placeholder":
+    if not openai_client:
         return snippet
 
     prompt = (
@@ -205,18 +304,12 @@ async def summarize_text(title: str, description: str) -> str:
     )
 
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=80,
-            temperature=0.2
-        )
-        summary = response.choices[0].message.content.strip()
+        summary = await _chat(prompt, max_tokens=80, temperature=0.2)
         if summary:
             return summary
         return snippet
     except Exception as e:
-        print(f"OpenAI summary hatasi: {e}")
+        logger.exception("OpenAI summarize_text failed")
         return snippet
 
 
@@ -236,7 +329,7 @@ async def draft_response(title: str, description: str) -> str:
         "En kısa sürede ilgileneceğiz. Ek bilgi gerekiyorsa lütfen bize iletin.\n\nSaygılarımızla,\nDestek Ekibi"
     )
 
-    if not openai_client or settings.OPENAI_API_KEY == "placeholder":
+    if not openai_client:
         logger.info("AI draft_response skipped - no API key configured, using fallback template")
         return template
 
@@ -248,13 +341,7 @@ async def draft_response(title: str, description: str) -> str:
 
     try:
         logger.info("AI request: draft_response")
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=250,
-            temperature=0.3
-        )
-        draft = response.choices[0].message.content.strip()
+        draft = await _chat(prompt, max_tokens=250, temperature=0.3)
         logger.info("AI draft_response success")
         if draft:
             return draft
@@ -467,4 +554,15 @@ body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background
                     import time
                     time.sleep(1 * attempt)
                 else:
-                    logger.error("Notification failed after %s attempts: Ticket %s", attempts, ticket_id)
\ No newline at end of file
+                    logger.error("Notification failed after %s attempts: Ticket %s", attempts, ticket_id)
+
+def send_notifications(notifications: list):
+    """
+    Toplu işlemlerin bildirimlerini sırayla gönderir. Her eleman `send_notification`
+    argümanlarının tuple'ıdır; tek bir arka plan thread'inde çağrılmalıdır.
+    """
+    for args in notifications:
+        try:
+            send_notification(*args)
+        except Exception:
+            logger.exception("Notification failed in batch: Ticket %s", args[0] if args else None)
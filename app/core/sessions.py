@@ -0,0 +1,180 @@
+"""
+Refresh token'lar ve sunucu tarafı oturum kaydı.
+
+Access token (JWT) kısa ömürlüdür ve her istekte veritabanına gidilmeden doğrulanır.
+Uzun ömürlü oturum, `user_sessions` tablosunda tutulan opak bir refresh token'dır:
+
+- Token rastgele üretilir, tabloda yalnızca SHA-256 özeti saklanır.
+- `/auth/refresh` her kullanımda token'ı iptal edip yerine yenisini verir (rotation).
+  İptal koşullu bir UPDATE ile yapılır; aynı token'la gelen iki eşzamanlı istekten
+  yalnızca biri başarılı olur.
+- Daha önce değiştirilmiş bir token tekrar gelirse token çalınmış sayılır ve aynı
+  girişten türeyen tüm oturumlar (family) iptal edilir.
+- Şifre değişikliği/sıfırlama kullanıcının tüm oturumlarını iptal eder.
+
+Süresi dolmuş oturumlar ve iptal edilmiş access token kayıtları periyodik olarak
+silinir (ör. gece cron'u):
+
+    python -m app.core.sessions cleanup [--batch-size 5000]
+"""
+import argparse
+import hashlib
+import logging
+import secrets
+import sys
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.core.config import settings
+from app.core.revocation import prune_revoked_tokens
+from app.database import begin_immediate, commit_async
+from app.models.user import User, UserSession
+
+logger = logging.getLogger("app.core.sessions")
+
+_sessions = UserSession.__table__
+
+CLEANUP_BATCH_SIZE = 5000
+
+
+def _hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _invalid_session() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Oturum geçersiz veya süresi dolmuş. Lütfen tekrar giriş yapın.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _new_session(user_id: int, family_id: str, now: datetime) -> Tuple[UserSession, str]:
+    token = secrets.token_urlsafe(32)
+    session = UserSession(
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=_hash(token),
+        created_at=now,
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    return session, token
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: int) -> str:
+    """Yeni bir oturum (family) açar ve refresh token'ı döndürür; commit çağırana aittir."""
+    session, token = _new_session(user_id, secrets.token_hex(16), datetime.utcnow())
+    db.add(session)
+    return token
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[User, str]:
+    """Refresh token'ı iptal edip aynı family'de yenisini verir; (kullanıcı, yeni token) döndürür."""
+    now = datetime.utcnow()
+    current = (await db.execute(select(UserSession).where(UserSession.token_hash == _hash(token)))).scalars().first()
+    if current is None or current.expires_at <= now:
+        raise _invalid_session()
+
+    if current.revoked_at is not None:
+        if current.replaced_by_id is not None:
+            # Değiştirilmiş token yeniden kullanıldı: token sızmış olabilir, zinciri kapat
+            await db.execute(
+                update(UserSession)
+                .where(UserSession.family_id == current.family_id, UserSession.revoked_at.is_(None))
+                .values(revoked_at=now)
+            )
+            await commit_async(db)
+            logger.warning("Refresh token reuse detected for user %s; session family revoked", current.user_id)
+        raise _invalid_session()
+
+    user = (await db.execute(
+        select(User).options(joinedload(User.role)).where(User.id == current.user_id)
+    )).scalars().first()
+    if user is None:
+        raise _invalid_session()
+
+    replacement, new_token = _new_session(current.user_id, current.family_id, now)
+    db.add(replacement)
+    await db.flush()
+    # Yalnızca hâlâ geçerliyse iptal et; eşzamanlı ikinci istek 0 satır günceller
+    claimed = await db.execute(
+        update(UserSession)
+        .where(UserSession.id == current.id, UserSession.revoked_at.is_(None))
+        .values(revoked_at=now, replaced_by_id=replacement.id)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount != 1:
+        await db.rollback()
+        raise _invalid_session()
+    await commit_async(db)
+    return user, new_token
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> bool:
+    """Tek bir oturumu kapatır (çıkış); commit çağırana aittir."""
+    result = await db.execute(
+        update(UserSession)
+        .where(UserSession.token_hash == _hash(token), UserSession.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    return result.rowcount > 0
+
+
+async def revoke_user_sessions(db: AsyncSession, user_id: int) -> int:
+    """Kullanıcının açık tüm oturumlarını kapatır; commit çağırana aittir."""
+    result = await db.execute(
+        update(UserSession)
+        .where(UserSession.user_id == user_id, UserSession.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    return result.rowcount
+
+
+def cleanup_sessions(engine, batch_size: Optional[int] = None, now: Optional[datetime] = None) -> int:
+    """
+    Süresi dolmuş oturumları gruplar hâlinde siler; silinen satır sayısını döndürür.
+    İptal edilmiş ama süresi dolmamış kayıtlar yeniden kullanım tespiti için saklanır.
+    """
+    batch_size = batch_size or CLEANUP_BATCH_SIZE
+    now = now or datetime.utcnow()
+
+    total = 0
+    while True:
+        with engine.connect() as connection:
+            begin_immediate(connection)
+            expired = select(_sessions.c.id).where(_sessions.c.expires_at <= now).limit(batch_size)
+            deleted = connection.execute(_sessions.delete().where(_sessions.c.id.in_(expired))).rowcount
+            connection.commit()
+        total += deleted
+        if deleted:
+            logger.info("Deleted %s expired sessions (total %s)", deleted, total)
+        if deleted < batch_size:
+            return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.sessions", description="Oturum kayıtlarının bakımı")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cleanup = sub.add_parser("cleanup", help="Süresi dolmuş oturumları sil")
+    cleanup.add_argument("--batch-size", type=int, default=None, help=f"Transaction başına satır (varsayılan: {CLEANUP_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    from app.database import engine
+
+    total = cleanup_sessions(engine, batch_size=args.batch_size)
+    print(f"Silinen oturum sayısı: {total}")
+    with engine.begin() as connection:
+        pruned = prune_revoked_tokens(connection)
+    print(f"Silinen iptal kaydı sayısı: {pruned}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
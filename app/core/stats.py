@@ -0,0 +1,83 @@
+"""
+Ticket istatistikleri.
+
+Sayaçlar `ticket_stats` tablosunda tutulur ve ticket değişiklikleriyle aynı
+transaction'da güncellenir (bkz. `app.models.ticket._track_ticket_stats`). Sayaçlar
+ORM dışından yapılan değişikliklerle kayarsa baştan hesaplanabilir:
+
+    python -m app.core.stats rebuild
+"""
+import argparse
+import sys
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from app.models.ticket import Ticket, TicketStat
+from app.models.user import Department
+
+
+def rebuild_ticket_stats(connection) -> int:
+    """Sayaç tablosunu ticket'lardan yeniden hesaplar; oluşan satır sayısını döndürür."""
+    table = TicketStat.__table__
+    tickets = Ticket.__table__
+    connection.execute(table.delete())
+    grouped = (
+        select(
+            func.coalesce(tickets.c.assigned_department_id, 0),
+            func.coalesce(tickets.c.status, ""),
+            func.coalesce(tickets.c.priority, ""),
+            func.count(),
+        )
+        .group_by(tickets.c.assigned_department_id, tickets.c.status, tickets.c.priority)
+    )
+    connection.execute(table.insert().from_select(["department_id", "status", "priority", "count"], grouped))
+    return connection.execute(select(func.count()).select_from(table)).scalar()
+
+
+def load_ticket_stats(db, department_id: Optional[int] = None) -> dict:
+    """Durum, öncelik ve departman kırılımlarını sayaç tablosundan toplar."""
+    query = (
+        select(TicketStat.department_id, Department.name, TicketStat.status, TicketStat.priority, TicketStat.count)
+        .outerjoin(Department, Department.id == TicketStat.department_id)
+        .where(TicketStat.count > 0)
+    )
+    if department_id is not None:
+        query = query.where(TicketStat.department_id == department_id)
+
+    total = 0
+    by_status, by_priority, departments = {}, {}, {}
+    for dept_id, dept_name, status, priority, count in db.execute(query):
+        total += count
+        by_status[status] = by_status.get(status, 0) + count
+        by_priority[priority] = by_priority.get(priority, 0) + count
+        dept = departments.setdefault(dept_id, {
+            "department_id": dept_id, "department_name": dept_name, "total": 0, "by_status": {},
+        })
+        dept["total"] += count
+        dept["by_status"][status] = dept["by_status"].get(status, 0) + count
+
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "by_department": sorted(departments.values(), key=lambda d: d["department_id"]),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.stats", description="Ticket istatistik sayaçları")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Sayaçları ticket tablosundan baştan hesapla")
+    parser.parse_args(argv)
+
+    from app.database import engine
+
+    with engine.begin() as connection:
+        rows = rebuild_ticket_stats(connection)
+    print(f"İstatistik sayaçları yeniden hesaplandı ({rows} satır).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Giriş (login) denemeleri için kabul kontrolü.
+
+Her deneme bcrypt işinden önce iki token bucket'tan geçer: istemci IP'si ve hesap (e-posta).
+Bucket `burst` kadar denemeye izin verir ve dakikada `per_minute` token dolar. Boş bucket
+isteği 429 + Retry-After ile reddeder. Ayrıca aynı anda en fazla
+`LOGIN_MAX_CONCURRENT_VERIFY` doğrulama çalışır; fazlası beklemeden 503 alır.
+
+Bucket durumu değiştirilebilir bir store'da tutulur. Varsayılan bellek store'u süreç
+başınadır. Birden çok worker'da `LOGIN_THROTTLE_STORE=sqlite` ile tüm worker'lar aynı
+dosyadaki sayaçları paylaşır.
+"""
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core import metrics
+from app.core.config import settings
+
+# Bu kadar `take` çağrısında bir, uzun süredir dokunulmamış (dolu) bucket'lar silinir
+PRUNE_EVERY = 1000
+
+
+class MemoryBucketStore:
+    """Süreç içi bucket'lar: anahtar -> (token, son güncelleme)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> Tuple[bool, float]:
+        """Bucket'tan bir token almayı dener; (alındı mı, kalan token) döndürür."""
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            return allowed, tokens
+
+    def prune(self, older_than: float):
+        with self._lock:
+            self._buckets = {k: v for k, v in self._buckets.items() if v[1] >= older_than}
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SqliteBucketStore:
+    """
+    Worker'lar arasında paylaşılan bucket'lar (ayrı bir SQLite dosyası). Doldurma ve token
+    alma tek bir UPSERT ifadesiyle yapılır; eşzamanlı worker'lar aynı token'ı iki kez alamaz.
+    """
+
+    name = "sqlite"
+
+    _TAKE = """
+        INSERT INTO login_buckets (key, tokens, updated) VALUES (:key, :capacity - 1, :now)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = min(:capacity, tokens + (:now - updated) * :rate) - 1,
+            updated = :now
+        WHERE min(:capacity, tokens + (:now - updated) * :rate) >= 1
+        RETURNING tokens
+    """
+
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS login_buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float) -> Tuple[bool, float]:
+        params = {"key": key, "capacity": capacity, "rate": rate, "now": now}
+        with self._lock:
+            row = self._connection.execute(self._TAKE, params).fetchone()
+            if row is not None:
+                return True, row[0]
+            # Token yok: satır değişmedi, yalnızca kalan token'ı hesapla
+            row = self._connection.execute(
+                "SELECT min(:capacity, tokens + (:now - updated) * :rate) FROM login_buckets WHERE key = :key", params
+            ).fetchone()
+        return False, row[0] if row else 0.0
+
+    def prune(self, older_than: float):
+        with self._lock:
+            self._connection.execute("DELETE FROM login_buckets WHERE updated < ?", (older_than,))
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM login_buckets")
+
+
+def create_bucket_store():
+    if settings.LOGIN_THROTTLE_STORE == "sqlite":
+        return SqliteBucketStore(settings.LOGIN_THROTTLE_SQLITE_PATH)
+    return MemoryBucketStore()
+
+
+class LoginThrottle:
+    def __init__(self, store, ip_burst: int, ip_per_minute: float, account_burst: int,
+                 account_per_minute: float, max_concurrent_verify: int):
+        self.store = store
+        self.ip_limit = (ip_burst, ip_per_minute / 60)
+        self.account_limit = (account_burst, account_per_minute / 60)
+        self.max_concurrent_verify = max_concurrent_verify
+        self._lock = threading.Lock()
+        self._verifying = 0
+        self._takes = 0
+        self.allowed = 0
+        self.rejected_ip = 0
+        self.rejected_account = 0
+        self.rejected_busy = 0
+
+    def _take(self, key: str, limit: Tuple[int, float], now: float) -> Optional[float]:
+        """Token alınırsa None, alınamazsa bir sonraki token için beklenecek saniye."""
+        capacity, rate = limit
+        allowed, tokens = self.store.take(key, capacity, rate, now)
+        if allowed:
+            return None
+        return (1 - tokens) / rate if rate > 0 else 3600
+
+    def check(self, ip: str, account: str):
+        """IP ve hesap bucket'larından birer token alır; biri boşsa 429 fırlatır."""
+        now = time.time()
+        with self._lock:
+            self._takes += 1
+            prune = self._takes % PRUNE_EVERY == 0
+        if prune:
+            # Dolmak için gereken süreden uzun süredir dokunulmamış bucket zaten doludur
+            full_after = max(capacity / rate for capacity, rate in (self.ip_limit, self.account_limit) if rate > 0)
+            self.store.prune(now - full_after)
+
+        retry_after = self._take(f"ip:{ip}", self.ip_limit, now)
+        if retry_after is None:
+            retry_after = self._take(f"account:{account.strip().lower()}", self.account_limit, now)
+            if retry_after is not None:
+                self.rejected_account += 1
+        else:
+            self.rejected_ip += 1
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Çok fazla giriş denemesi. Lütfen daha sonra tekrar deneyin.",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+        self.allowed += 1
+
+    @asynccontextmanager
+    async def verify_slot(self):
+        """Aynı anda çalışan doğrulama sayısını sınırlar; sınır doluysa beklemeden 503."""
+        with self._lock:
+            if self._verifying >= self.max_concurrent_verify:
+                self.rejected_busy += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Sunucu şu anda yoğun, lütfen birazdan tekrar deneyin.",
+                    headers={"Retry-After": "1"},
+                )
+            self._verifying += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._verifying -= 1
+
+    def stats(self) -> dict:
+        return {
+            "store": self.store.name,
+            "allowed": self.allowed,
+            "rejected_ip": self.rejected_ip,
+            "rejected_account": self.rejected_account,
+            "rejected_busy": self.rejected_busy,
+            "verifying": self._verifying,
+            "max_concurrent_verify": self.max_concurrent_verify,
+        }
+
+
+def client_ip(request: Request) -> str:
+    """
+    İstemci IP'si. Güvenilen bir proxy arkasındaysa X-Forwarded-For'un sağdan
+    `LOGIN_THROTTLE_TRUSTED_HOPS`'uncu adresi: bunu bizim proxy'lerimiz ekler, soldakileri
+    istemci istediği gibi gönderebilir.
+    """
+    if settings.LOGIN_THROTTLE_TRUST_FORWARDED:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if hops:
+            # Başlık beklenenden kısaysa tüm adresleri güvenilen proxy'ler eklemiştir
+            return hops[-min(max(settings.LOGIN_THROTTLE_TRUSTED_HOPS, 1), len(hops))]
+    return request.client.host if request.client else "unknown"
+
+
+login_throttle = LoginThrottle(
+    create_bucket_store(),
+    ip_burst=settings.LOGIN_IP_BURST,
+    ip_per_minute=settings.LOGIN_IP_PER_MINUTE,
+    account_burst=settings.LOGIN_ACCOUNT_BURST,
+    account_per_minute=settings.LOGIN_ACCOUNT_PER_MINUTE,
+    max_concurrent_verify=settings.LOGIN_MAX_CONCURRENT_VERIFY,
+)
+metrics.register("login_throttle", login_throttle.stats)
@@ -0,0 +1,358 @@
+"""
+Yerel ticket sınıflandırıcısı (departman ve öncelik).
+
+Geçmiş ticket'ların başlık + açıklaması ve sonunda atandıkları departman/öncelik ile
+eğitilen TF-IDF ağırlıklı multinomial Naive Bayes. Tahmin süreç içinde, birkaç NumPy
+işlemiyle yapılır (milisaniyenin altında). LLM yalnızca güven `TRIAGE_CONFIDENCE_THRESHOLD`
+altında kaldığında sorulur (bkz. app.core.services).
+
+Naive Bayes'in istatistikleri toplanabilir: sınıf başına terim ağırlıkları ve terimlerin
+doküman sıklıkları. Bu yüzden yeni ticket'lar (`id > son eğitilen`) mevcut modele eklenir,
+baştan eğitmek gerekmez. Terim ağırlığı alt-doğrusal tf'dir (1 + log tf); IDF tahmin anında
+güncel doküman sıklıklarından hesaplanır, böylece artımlı eğitim tam eğitimle aynı modeli verir.
+Sonradan değişen etiketler (yeniden atanan departman vb.) için model
+`TRIAGE_FULL_RETRAIN_SECONDS` aralıkla baştan eğitilir.
+
+Değerlendirme (eski %80 ile eğit, en yeni %20 üzerinde doğruluk ve gecikme):
+
+    python -m app.core.triage evaluate [--test-fraction 0.2]
+"""
+import argparse
+import logging
+import math
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select, union_all
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.search import _TOKEN_RE, fold_text
+from app.models.ticket import Ticket, TicketArchive
+from app.models.user import Department
+
+logger = logging.getLogger("app.core.triage")
+
+# Naive Bayes düzeltmesi (Lidstone)
+ALPHA = 0.1
+
+
+def tokenize(title: str, description: str) -> Counter:
+    """Türkçe katlanmış kelimeler; başlık kelimeleri iki kez sayılır (daha ayırt edici)."""
+    title_tokens = [t for t in _TOKEN_RE.findall(fold_text(title or "")) if len(t) > 1]
+    body_tokens = [t for t in _TOKEN_RE.findall(fold_text(description or "")) if len(t) > 1]
+    return Counter(title_tokens * 2 + body_tokens)
+
+
+@dataclass(frozen=True)
+class Prediction:
+    label: str
+    confidence: float
+
+
+class _Vocabulary:
+    """Terim -> sütun; doküman sıklıkları ile birlikte büyür."""
+
+    def __init__(self):
+        self.index = {}
+        self.df = np.zeros(0)
+        self.documents = 0
+
+    def add_documents(self, documents: Sequence[Counter]):
+        for terms in documents:
+            for term in terms:
+                if term not in self.index:
+                    self.index[term] = len(self.index)
+        if len(self.index) > len(self.df):
+            self.df = np.concatenate([self.df, np.zeros(len(self.index) - len(self.df))])
+        for terms in documents:
+            self.df[[self.index[t] for t in terms]] += 1
+        self.documents += len(documents)
+
+    def idf(self) -> np.ndarray:
+        return np.log((1 + self.documents) / (1 + self.df)) + 1
+
+
+class _NaiveBayesHead:
+    """Tek bir etiket (departman veya öncelik) için sınıf başına terim ağırlığı toplamları."""
+
+    def __init__(self):
+        self.classes: List[str] = []
+        self.weights = np.zeros((0, 0))
+        self.doc_counts = np.zeros(0)
+
+    def add(self, rows: Sequence[Tuple[np.ndarray, np.ndarray, str]], vocabulary_size: int):
+        for _, _, label in rows:
+            if label not in self.classes:
+                self.classes.append(label)
+        n_classes = len(self.classes)
+        grown = np.zeros((n_classes, vocabulary_size))
+        grown[:self.weights.shape[0], :self.weights.shape[1]] = self.weights
+        doc_counts = np.zeros(n_classes)
+        doc_counts[:len(self.doc_counts)] = self.doc_counts
+        class_index = {c: i for i, c in enumerate(self.classes)}
+        for columns, tf, label in rows:
+            grown[class_index[label], columns] += tf
+            doc_counts[class_index[label]] += 1
+        self.weights, self.doc_counts = grown, doc_counts
+
+    def compile(self, idf: np.ndarray) -> Optional["_CompiledHead"]:
+        if not self.classes:
+            return None
+        weighted = self.weights * idf + ALPHA
+        log_theta = np.log(weighted) - np.log(weighted.sum(axis=1, keepdims=True))
+        log_prior = np.log(self.doc_counts / self.doc_counts.sum())
+        return _CompiledHead(list(self.classes), log_prior, log_theta)
+
+
+class _CompiledHead:
+    def __init__(self, classes: List[str], log_prior: np.ndarray, log_theta: np.ndarray):
+        self.classes = classes
+        self.log_prior = log_prior
+        self.log_theta = log_theta
+
+    def predict(self, columns: np.ndarray, x: np.ndarray, allowed: Optional[Iterable[str]] = None) -> Optional[Prediction]:
+        scores = self.log_prior + self.log_theta[:, columns] @ x
+        if allowed is not None:
+            allowed = set(allowed)
+            mask = np.array([c in allowed for c in self.classes])
+            if not mask.any():
+                return None
+            scores = np.where(mask, scores, -np.inf)
+        probabilities = np.exp(scores - scores.max())
+        probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return Prediction(self.classes[best], float(probabilities[best]))
+
+
+class _CompiledModel:
+    """Tahmin için salt okunur anlık görüntü; eğitim yenisini kurup referansı değiştirir."""
+
+    def __init__(self, index: dict, idf: np.ndarray, department, priority):
+        self.index = index
+        self.idf = idf
+        self.department = department
+        self.priority = priority
+
+    def features(self, title: str, description: str):
+        terms = tokenize(title, description)
+        known = [(self.index[t], c) for t, c in terms.items() if t in self.index]
+        if not known:
+            return None
+        columns = np.fromiter((c for c, _ in known), dtype=np.intp, count=len(known))
+        tf = np.fromiter((1 + math.log(n) for _, n in known), dtype=float, count=len(known))
+        x = tf * self.idf[columns]
+        return columns, x / np.linalg.norm(x)
+
+
+class TriageClassifier:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._vocabulary = _Vocabulary()
+            self._department = _NaiveBayesHead()
+            self._priority = _NaiveBayesHead()
+            self._model: Optional[_CompiledModel] = None
+            self.last_id = 0
+            self.trained_documents = 0
+        self.predictions = 0
+        self.predict_seconds = 0.0
+
+    def adopt(self, other: "TriageClassifier"):
+        """Başka bir nesnede eğitilmiş modeli ve istatistiklerini devralır."""
+        with self._lock, other._lock:
+            self._vocabulary, self._department, self._priority = other._vocabulary, other._department, other._priority
+            self._model, self.last_id, self.trained_documents = other._model, other.last_id, other.trained_documents
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    def partial_fit(self, rows: Iterable[Tuple[int, str, str, Optional[str], Optional[str]]]) -> int:
+        """(id, başlık, açıklama, departman, öncelik) satırlarını modele ekler; eklenen satır sayısı."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self._lock:
+            documents = [tokenize(title, description) for _, title, description, _, _ in rows]
+            self._vocabulary.add_documents(documents)
+            index = self._vocabulary.index
+            encoded = []
+            for terms in documents:
+                columns = np.fromiter((index[t] for t in terms), dtype=np.intp, count=len(terms))
+                tf = np.fromiter((1 + math.log(n) for n in terms.values()), dtype=float, count=len(terms))
+                encoded.append((columns, tf))
+            size = len(index)
+            self._department.add([(c, tf, row[3]) for (c, tf), row in zip(encoded, rows) if row[3]], size)
+            self._priority.add([(c, tf, row[4]) for (c, tf), row in zip(encoded, rows) if row[4]], size)
+
+            idf = self._vocabulary.idf()
+            self._model = _CompiledModel(dict(index), idf, self._department.compile(idf), self._priority.compile(idf))
+            self.last_id = max(self.last_id, max(row[0] for row in rows))
+            self.trained_documents += len(rows)
+        return len(rows)
+
+    def predict(self, title: str, description: str, departments: Optional[Iterable[str]] = None):
+        """(departman tahmini, öncelik tahmini); model yoksa veya metin tanınmıyorsa None'lar."""
+        model = self._model
+        if model is None:
+            return None, None
+        start = time.perf_counter()
+        features = model.features(title, description)
+        department = priority = None
+        if features is not None:
+            if model.department is not None:
+                department = model.department.predict(*features, allowed=departments)
+            if model.priority is not None:
+                priority = model.priority.predict(*features)
+        self.predict_seconds += time.perf_counter() - start
+        self.predictions += 1
+        return department, priority
+
+    def stats(self) -> dict:
+        model = self._model
+        return {
+            "ready": model is not None,
+            "trained_documents": self.trained_documents,
+            "vocabulary": len(model.index) if model else 0,
+            "last_id": self.last_id,
+            "predictions": self.predictions,
+            "mean_predict_us": round(self.predict_seconds / self.predictions * 1e6, 1) if self.predictions else 0.0,
+        }
+
+
+def load_training_rows(connection, after_id: int = 0) -> list:
+    """Canlı ve arşivlenmiş ticket'lar: (id, başlık, açıklama, departman adı, öncelik), id sırasıyla."""
+    live, archived = Ticket.__table__, TicketArchive.__table__
+    departments = Department.__table__
+    parts = [
+        select(t.c.id, t.c.title, t.c.description, departments.c.name.label("department"), t.c.priority)
+        .select_from(t.outerjoin(departments, departments.c.id == t.c.assigned_department_id))
+        .where(t.c.id > after_id)
+        for t in (live, archived)
+    ]
+    combined = union_all(*parts).subquery()
+    return [tuple(row) for row in connection.execute(select(combined).order_by(combined.c.id))]
+
+
+triage_classifier = TriageClassifier()
+metrics.register("triage_classifier", triage_classifier.stats)
+
+
+def train(engine, full: bool = False) -> int:
+    """Yeni ticket'larla artımlı (veya `full` ise baştan) eğitir; eklenen ticket sayısı."""
+    if full:
+        classifier = TriageClassifier()
+        with engine.connect() as connection:
+            added = classifier.partial_fit(load_training_rows(connection))
+        # Tam eğitim ayrı bir nesnede yapılır; tahminler bu sırada eski modelle devam eder
+        triage_classifier.adopt(classifier)
+        return added
+    with engine.connect() as connection:
+        rows = load_training_rows(connection, after_id=triage_classifier.last_id)
+    return triage_classifier.partial_fit(rows)
+
+
+class TriageTrainer:
+    """Arka plan thread'i: açılışta tam eğitim, sonra periyodik artımlı ve tam eğitim."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="triage-trainer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        last_full = 0.0
+        while not self._stop.is_set():
+            full = time.monotonic() - last_full >= settings.TRIAGE_FULL_RETRAIN_SECONDS
+            try:
+                added = train(self.engine, full=full)
+                if full:
+                    last_full = time.monotonic()
+                if added:
+                    logger.info("Triage classifier trained on %s tickets (%s)", added, "full" if full else "incremental")
+            except Exception:
+                logger.exception("Triage classifier training failed")
+            self._stop.wait(settings.TRIAGE_RETRAIN_SECONDS)
+
+
+def evaluate(rows: list, test_fraction: float, threshold: float) -> dict:
+    """En eski satırlarla eğitir, en yeni `test_fraction` üzerinde ölçer (zaman sıralı bölme)."""
+    split = int(len(rows) * (1 - test_fraction))
+    train_rows, test_rows = rows[:split], rows[split:]
+    classifier = TriageClassifier()
+    classifier.partial_fit(train_rows)
+
+    report = {"train": len(train_rows), "test": len(test_rows)}
+    results = {"department": [], "priority": []}
+    latencies = []
+    for _, title, description, department, priority in test_rows:
+        start = time.perf_counter()
+        predicted = classifier.predict(title, description)
+        latencies.append(time.perf_counter() - start)
+        for head, actual, prediction in zip(("department", "priority"), (department, priority), predicted):
+            if actual:
+                results[head].append((prediction, actual))
+
+    for head, pairs in results.items():
+        correct = [p is not None and p.label == a for p, a in pairs]
+        confident = [(p.label == a) for p, a in pairs if p is not None and p.confidence >= threshold]
+        report[head] = {
+            "accuracy": round(sum(correct) / len(pairs), 4) if pairs else None,
+            "coverage_at_threshold": round(len(confident) / len(pairs), 4) if pairs else None,
+            "accuracy_at_threshold": round(sum(confident) / len(confident), 4) if confident else None,
+        }
+    if latencies:
+        latencies.sort()
+        report["latency_us"] = {
+            "mean": round(sum(latencies) / len(latencies) * 1e6, 1),
+            "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1e6, 1),
+        }
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.core.triage", description="Ticket sınıflandırıcısı")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("evaluate", help="Ayrılmış en yeni ticket'lar üzerinde doğruluk ve gecikme ölç")
+    run.add_argument("--test-fraction", type=float, default=0.2)
+    run.add_argument("--threshold", type=float, default=None,
+                     help=f"Güven eşiği (varsayılan: {settings.TRIAGE_CONFIDENCE_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    from app.database import engine
+
+    with engine.connect() as connection:
+        rows = load_training_rows(connection)
+    if len(rows) < 10:
+        print(f"Değerlendirme için yeterli ticket yok ({len(rows)}).")
+        return 1
+    threshold = settings.TRIAGE_CONFIDENCE_THRESHOLD if args.threshold is None else args.threshold
+    report = evaluate(rows, args.test_fraction, threshold)
+
+    print(f"Eğitim: {report['train']} ticket, test: {report['test']} ticket, eşik: {threshold}")
+    for head in ("department", "priority"):
+        r = report[head]
+        print(f"{head:<11} doğruluk={r['accuracy']}  eşik üstü oran={r['coverage_at_threshold']}"
+              f"  eşik üstü doğruluk={r['accuracy_at_threshold']}")
+    if "latency_us" in report:
+        print(f"Tahmin gecikmesi: ort. {report['latency_us']['mean']} µs, p95 {report['latency_us']['p95']} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
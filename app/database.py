@@ -1,14 +1,109 @@
-from sqlalchemy import create_engine 
+import asyncio
+import itertools
+import logging
+import threading
+import time
+import weakref
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base 
-from sqlalchemy.orm import sessionmaker 
+from sqlalchemy.orm import Session, sessionmaker 
+from app.core.config import settings
  
-SQLALCHEMY_DATABASE_URL = "sqlite:///./app/campusupport.db" 
- 
-engine = create_engine( 
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False} 
-) 
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+logger = logging.getLogger("app.database")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Her yeni SQLite bağlantısında performans/eşzamanlılık ayarlarını uygular."""
+    cursor = dbapi_connection.cursor()
+    # WAL: okuyucular yazıcıyı, yazıcı okuyucuları beklemez
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # WAL ile NORMAL güvenlidir; her commit'te fsync yapılmaz
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def create_db_engine(url: str = None, **engine_kwargs):
+    """
+    Ayarlardaki DATABASE_URL'e göre engine oluşturur.
+    SQLite için bağlantı PRAGMA'ları, sunucu veritabanları için havuz ayarları uygulanır.
+    `engine_kwargs` doğrudan `create_engine`'e geçer (ör. test/benchmark havuz boyutu).
+    """
+    url = url or SQLALCHEMY_DATABASE_URL
+    if make_url(url).get_backend_name() == "sqlite":
+        db_engine = create_engine(
+            url,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+            **engine_kwargs,
+        )
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+        return db_engine
+
+    pool_options = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    pool_options.update(engine_kwargs)
+    return create_engine(url, **pool_options)
+
+
+# Senkron sürücü adı -> aynı veritabanının async sürücüsü
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Senkron bir veritabanı URL'ini async sürücülü karşılığına çevirir."""
+    drivername = make_url(url).drivername
+    driver = _ASYNC_DRIVERS.get(drivername)
+    if driver is None or not url.startswith(drivername):
+        return url
+    return driver + url[len(drivername):]
+
+
+def create_async_db_engine(url: str = None, **engine_kwargs):
+    """`create_db_engine` ile aynı ayarlara sahip async engine (SQLite için aiosqlite)."""
+    url = url or settings.ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+    if make_url(url).get_backend_name() == "sqlite":
+        db_engine = create_async_engine(
+            url, connect_args={"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}, **engine_kwargs
+        )
+        event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        return db_engine
+
+    pool_options = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    pool_options.update(engine_kwargs)
+    return create_async_engine(url, **pool_options)
+
+
+engine = create_db_engine()
+async_engine = create_async_db_engine()
  
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
+# expire_on_commit=False: commit sonrası nesnelere erişmek async'te örtük sorgu (lazy load) tetiklemesin
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
  
 Base = declarative_base() 
  
@@ -17,4 +112,115 @@ def get_db():
     try: 
         yield db 
     finally: 
-        db.close() 
+        db.close()
+
+
+class ReadRouter:
+    """
+    Salt okunur istekleri replikalara dağıtır. Replika yoksa, hepsine bağlanılamıyorsa
+    veya kullanıcı son `window_seconds` içinde yazdıysa (read-your-writes) birincil
+    veritabanı kullanılır. Bağlanılamayan replika `retry_seconds` boyunca atlanır.
+    Son yazma zamanları süreç içinde tutulur.
+    """
+
+    def __init__(self, primary, replica_urls=(), window_seconds: float = 5.0, retry_seconds: float = 30.0):
+        self.primary = primary
+        self.replicas = [create_db_engine(url) for url in replica_urls]
+        self.window_seconds = window_seconds
+        self.retry_seconds = retry_seconds
+        self._sessions = {
+            engine: sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            for engine in [primary, *self.replicas]
+        }
+        self._recent_writes = {}
+        self._prune_at = 1024
+        self._down_until = {}
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def mark_write(self, key):
+        """`key` (kullanıcı) az önce yazdı: okumaları bir süre birincilden yapılsın."""
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[key] = now + self.window_seconds
+            if len(self._recent_writes) >= self._prune_at:
+                self._recent_writes = {k: t for k, t in self._recent_writes.items() if t > now}
+                self._prune_at = max(1024, 2 * len(self._recent_writes))
+
+    def wrote_recently(self, key) -> bool:
+        deadline = self._recent_writes.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    def _replica(self):
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            engine = self.replicas[next(self._next) % len(self.replicas)]
+            if self._down_until.get(engine, 0) <= now:
+                return engine
+        return None
+
+    def session(self, key=None) -> Session:
+        """`key` için okuma oturumu açar (replika veya birincil)."""
+        engine = None
+        if self.replicas and not (key is not None and self.wrote_recently(key)):
+            engine = self._replica()
+        if engine is not None:
+            db = self._sessions[engine]()
+            try:
+                # Bağlantıyı şimdi al: replika erişilemezse birincile düşülür
+                db.connection()
+                return db
+            except DBAPIError:
+                db.close()
+                logger.warning("Read replica %s unavailable, falling back to primary", engine.url, exc_info=True)
+                self._down_until[engine] = time.monotonic() + self.retry_seconds
+        return self._sessions[self.primary]()
+
+
+read_router = ReadRouter(
+    engine,
+    [url.strip() for url in settings.DATABASE_READ_URLS.split(",") if url.strip()],
+    window_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    retry_seconds=settings.READ_REPLICA_RETRY_SECONDS,
+)
+
+
+async def get_async_db():
+    """Async endpoint'ler için oturum; event loop'u bloklamadan sorgu çalıştırır."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def begin_immediate(connection):
+    """
+    SQLite'ta yazma kilidini transaction başında alır (BEGIN IMMEDIATE). Önce okuyup sonra
+    yazan toplu işler, araya giren başka bir yazıcı yüzünden yarıda hata almaz; sırasını bekler.
+    Diğer veritabanlarında bir şey yapmaz (transaction ilk ifadeyle başlar).
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+# SQLite tek yazıcıya izin verir. Async oturumlar UPDATE ile COMMIT arasında başka
+# coroutine'lere yol verdiğinden, aynı süreçteki yazıcılar kilit için SQLite'ın
+# busy handler'ında (ms'lerce uyuyarak) bekleşir. Commit'leri süreç içinde sıraya
+# koymak bu beklemeyi ortadan kaldırır. Kilit event loop başına tutulur.
+_sqlite_write_locks = weakref.WeakKeyDictionary()
+
+
+def _sqlite_write_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _sqlite_write_locks.get(loop)
+    if lock is None:
+        lock = _sqlite_write_locks[loop] = asyncio.Lock()
+    return lock
+
+
+async def commit_async(db: AsyncSession):
+    """Async oturumu commit eder; SQLite'ta aynı süreçteki yazmaları sıraya koyar."""
+    if db.bind.dialect.name == "sqlite":
+        async with _sqlite_write_lock():
+            await db.commit()
+    else:
+        await db.commit()
+
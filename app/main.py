@@ -4,14 +4,18 @@ from fastapi.templating import Jinja2Templates
 import logging
 import sys
 from sqlalchemy.orm import Session
-from app.database import Base, engine, SessionLocal
-from app.routers import auth, tickets
+from app.database import engine, SessionLocal
+from app import migrations
+from app.core.config import settings
+from app.core.auth import ReadYourWritesMiddleware
+from app.core.hashing import password_hasher
+from app.core.rules import rule_engine
+from app.core.triage import TriageTrainer
+from app.routers import auth, metrics, rules, tickets
 from app.models import user, ticket
 from app.models.user import Role, Department
 from starlette.middleware.cors import CORSMiddleware # CORS için yeni import
 
-Base.metadata.create_all(bind=engine)
-
 # Configure basic logging for the application
 logging.basicConfig(
     level=logging.INFO,
@@ -48,6 +52,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Replikadan okunan endpoint'lerde kullanıcı kendi yazdığını hemen görsün
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Yerel ticket sınıflandırıcısını geçmiş ticket'larla arka planda eğitir
+triage_trainer = TriageTrainer(engine)
 
 # Statik dosyaları (HTML, CSS, JS) sunmak için
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -56,31 +65,33 @@ templates = Jinja2Templates(directory="static")
 
 @app.on_event("startup")
 def on_startup():
+    # Tek ucuz kontrol: şema son migration'da mı? Üretimde migration'lar
+    # worker'lar başlamadan önce `python -m app.migrations upgrade` ile uygulanır.
+    if not migrations.is_at_head(engine):
+        if not settings.AUTO_MIGRATE:
+            raise RuntimeError("Veritabanı şeması güncel değil. Önce `python -m app.migrations upgrade` çalıştırın.")
+        applied = migrations.upgrade(engine)
+        logging.getLogger("app.main").info("Applied migrations on startup: %s", applied)
+
     db = SessionLocal()
-    seed_database(db)
-    # Ensure `category` column exists in tickets table (simple SQLite-safe check)
     try:
-        # Use raw connection to check columns
-        conn = engine.raw_connection()
-        cursor = conn.cursor()
-        cursor.execute("PRAGMA table_info(tickets);")
-        cols = [r[1] for r in cursor.fetchall()]
-        if 'category' not in cols:
-            try:
-                cursor.execute("ALTER TABLE tickets ADD COLUMN category TEXT;")
-                conn.commit()
-                print('Added `category` column to tickets table')
-            except Exception as e:
-                print('Failed to add category column:', e)
-        cursor.close()
-        conn.close()
-    except Exception as e:
-        print('Startup DB check error:', e)
+        seed_database(db)
+        rule_engine.sync(db)
     finally:
         db.close()
 
+    if settings.TRIAGE_ENABLED:
+        triage_trainer.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    password_hasher.shutdown()
+    triage_trainer.stop()
+
 app.include_router(auth.router, prefix="/api/v1/auth")
 app.include_router(tickets.router, prefix="/api/v1/tickets")
+app.include_router(metrics.router, prefix="/api/v1/metrics")
+app.include_router(rules.router, prefix="/api/v1/rules")
 
 # Yeni ana sayfa rotası, index.html dosyasını döndürecek
 @app.get("/")
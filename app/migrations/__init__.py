@@ -0,0 +1,124 @@
+"""
+Sürümlü şema migration'ları.
+
+Her migration `app/migrations/versions/NNNN_aciklama.py` dosyasıdır ve
+`upgrade(connection)` fonksiyonu tanımlar; dosya adındaki sayı sürüm numarasıdır.
+Uygulanan sürümler `schema_version` tablosunda tutulur. Uygulama açılışında yalnızca
+tek bir `max(version)` sorgusu ile şemanın güncel olup olmadığına bakılır; üretimde
+migration'lar worker'lar başlatılmadan önce CLI ile uygulanır:
+
+    python -m app.migrations upgrade
+"""
+import importlib
+import logging
+import pkgutil
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select
+
+from app.database import begin_immediate
+
+logger = logging.getLogger("app.migrations")
+
+VERSION_TABLE = "schema_version"
+
+_version_metadata = MetaData()
+schema_version = Table(
+    VERSION_TABLE, _version_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+class Migration:
+    def __init__(self, version: int, description: str, module):
+        self.version = version
+        self.description = description
+        self.module = module
+
+    def upgrade(self, connection):
+        self.module.upgrade(connection)
+
+
+def load_migrations() -> list:
+    """`versions` paketindeki migration'ları sürüm sırasına göre döndürür."""
+    from app.migrations import versions
+
+    migrations = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        number, _, description = info.name.partition("_")
+        if not number.isdigit():
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migrations.append(Migration(int(number), description, module))
+    migrations.sort(key=lambda m: m.version)
+
+    seen = set()
+    for migration in migrations:
+        if migration.version in seen:
+            raise RuntimeError(f"Aynı sürüm numarasına sahip birden fazla migration var: {migration.version}")
+        seen.add(migration.version)
+    return migrations
+
+
+def head_version() -> int:
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(connection) -> int:
+    """Veritabanına uygulanmış son sürüm (sürüm tablosu yoksa 0)."""
+    if not inspect(connection).has_table(VERSION_TABLE):
+        return 0
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def is_at_head(engine) -> bool:
+    """Açılışta kullanılan ucuz kontrol: şema son migration'da mı?"""
+    with engine.connect() as connection:
+        return current_version(connection) >= head_version()
+
+
+def upgrade(engine, target: int = None) -> list:
+    """
+    Bekleyen migration'ları sırayla, her biri kendi transaction'ında uygular.
+    Uygulanan sürüm numaralarını döndürür.
+    """
+    migrations = load_migrations()
+    if target is None:
+        target = migrations[-1].version if migrations else 0
+
+    with engine.begin() as connection:
+        _version_metadata.create_all(bind=connection, checkfirst=True)
+
+    applied = []
+    for migration in migrations:
+        if migration.version > target:
+            break
+        with engine.connect() as connection:
+            # Yazma kilidi baştan alınır: aynı anda başlayan worker'lar sırayla ilerler
+            # ve ikinci worker sürümü tekrar okuyup uygulanmış migration'ı atlar.
+            begin_immediate(connection)
+            if current_version(connection) >= migration.version:
+                connection.rollback()
+                continue
+            logger.info("Applying migration %04d_%s", migration.version, migration.description)
+            migration.upgrade(connection)
+            connection.execute(schema_version.insert().values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.utcnow(),
+            ))
+            connection.commit()
+            applied.append(migration.version)
+    return applied
+
+
+# Migration betiklerinin kullandığı küçük yardımcılar
+def has_column(connection, table: str, column: str) -> bool:
+    return column in {c["name"] for c in inspect(connection).get_columns(table)}
+
+
+def has_index(connection, table: str, index: str) -> bool:
+    return index in {i["name"] for i in inspect(connection).get_indexes(table)}
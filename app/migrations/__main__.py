@@ -0,0 +1,50 @@
+"""
+Migration CLI.
+
+    python -m app.migrations upgrade [--to SÜRÜM]   # bekleyen migration'ları uygula
+    python -m app.migrations current                # uygulanmış sürüm
+    python -m app.migrations check                  # güncel değilse çıkış kodu 1
+"""
+import argparse
+import logging
+import sys
+
+from app import migrations
+from app.database import engine
+# Modeller migration'larda kullanılmasa da uygulama import düzenini koruyalım
+from app.models import user, ticket  # noqa: F401
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="CampuSupport şema migration'ları")
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("upgrade", help="Bekleyen migration'ları uygula")
+    up.add_argument("--to", type=int, default=None, help="Hedef sürüm (varsayılan: en son)")
+    sub.add_parser("current", help="Veritabanının mevcut sürümünü göster")
+    sub.add_parser("check", help="Şema güncel değilse 1 ile çık")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.command == "upgrade":
+        applied = migrations.upgrade(engine, target=args.to)
+        print(f"Uygulanan migration'lar: {applied}" if applied else "Şema zaten güncel.")
+        return 0
+
+    with engine.connect() as connection:
+        current = migrations.current_version(connection)
+    head = migrations.head_version()
+
+    if args.command == "current":
+        print(f"Mevcut sürüm: {current} (son sürüm: {head})")
+        return 0
+
+    if current < head:
+        print(f"Şema güncel değil: {current} < {head}")
+        return 1
+    print(f"Şema güncel: {current}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
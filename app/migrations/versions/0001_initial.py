@@ -0,0 +1,57 @@
+"""İlk şema: roller, departmanlar, kullanıcılar, ticket'lar ve yorumlar.
+
+`checkfirst` ile oluşturulur; migration sistemi öncesinde `create_all` ile
+oluşturulmuş veritabanlarında mevcut tablolara dokunulmaz.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+Table(
+    "roles", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, index=True),
+)
+
+Table(
+    "departments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, unique=True, index=True),
+)
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, unique=True, index=True),
+    Column("password_hash", String),
+    Column("role_id", Integer, ForeignKey("roles.id")),
+    Column("department_id", Integer, ForeignKey("departments.id"), nullable=True),
+)
+
+Table(
+    "tickets", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String),
+    Column("description", String),
+    Column("status", String),
+    Column("priority", String),
+    Column("category", String, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("created_by_user_id", Integer, ForeignKey("users.id")),
+    Column("assigned_department_id", Integer, ForeignKey("departments.id")),
+    Column("assigned_support_id", Integer, ForeignKey("users.id"), nullable=True),
+)
+
+Table(
+    "comments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("ticket_id", Integer, ForeignKey("tickets.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("content", String),
+    Column("created_at", DateTime),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(bind=connection, checkfirst=True)
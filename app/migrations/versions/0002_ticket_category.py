@@ -0,0 +1,7 @@
+"""`tickets.category` sütunu (sütun eklenmeden önce oluşturulmuş veritabanları için)."""
+from app.migrations import has_column
+
+
+def upgrade(connection):
+    if not has_column(connection, "tickets", "category"):
+        connection.exec_driver_sql("ALTER TABLE tickets ADD COLUMN category VARCHAR")
@@ -0,0 +1,54 @@
+"""Sayısal `priority_rank` sütunu, mevcut satırların doldurulması ve liste sorgusu indeksleri."""
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, case
+
+from app.migrations import has_column
+
+metadata = MetaData()
+
+tickets = Table(
+    "tickets", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("status", String),
+    Column("priority", String),
+    Column("priority_rank", Integer),
+    Column("created_at", DateTime),
+    Column("created_by_user_id", Integer),
+    Column("assigned_department_id", Integer),
+    Column("assigned_support_id", Integer),
+)
+
+comments = Table(
+    "comments", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("ticket_id", Integer),
+)
+
+# priority_rank DESC: geriye taranan indeks "rank ASC, created_at DESC, id DESC" sırasını verir
+INDEXES = [
+    Index("ix_tickets_department_status_rank_created", tickets.c.assigned_department_id, tickets.c.status,
+          tickets.c.priority_rank.desc(), tickets.c.created_at),
+    Index("ix_tickets_rank_created", tickets.c.priority_rank.desc(), tickets.c.created_at),
+    Index("ix_tickets_assignee_status", tickets.c.assigned_support_id, tickets.c.status),
+    Index("ix_tickets_creator_created", tickets.c.created_by_user_id, tickets.c.created_at),
+    Index("ix_comments_ticket_id", comments.c.ticket_id),
+]
+
+
+def upgrade(connection):
+    if not has_column(connection, "tickets", "priority_rank"):
+        connection.exec_driver_sql("ALTER TABLE tickets ADD COLUMN priority_rank INTEGER")
+
+    # Bu migration anındaki sıralama; model sabitleri ileride değişse de sonuç değişmez
+    connection.execute(
+        tickets.update()
+        .where(tickets.c.priority_rank.is_(None))
+        .values(priority_rank=case(
+            (tickets.c.priority == "High", 1),
+            (tickets.c.priority == "Medium", 2),
+            (tickets.c.priority == "Low", 3),
+            else_=4,
+        ))
+    )
+
+    for index in INDEXES:
+        index.create(bind=connection, checkfirst=True)
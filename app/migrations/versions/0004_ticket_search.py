@@ -0,0 +1,75 @@
+"""Ticket ve yorumlar için FTS5 tam metin arama tablosu ve onu güncel tutan trigger'lar.
+
+Her ticket (rowid = id * 2) ve her yorum (rowid = id * 2 + 1) ayrı bir satırdır;
+böylece trigger'lar tek bir satırı rowid ile günceller/siler. unicode61 tokenizer
+büyük/küçük harf ve aksanları (ç, ş, ğ, ö, ü, İ) katlar; Türkçe noktasız 'ı' bunun
+dışında kaldığı için trigger'larda 'i'ye çevrilir. Yalnızca SQLite'ta oluşturulur.
+"""
+
+
+def _fold(expr: str) -> str:
+    return f"replace(coalesce({expr}, ''), 'ı', 'i')"
+
+
+STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE ticket_search USING fts5(
+        title, body, ticket_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    # Başlık eşleşmeleri açıklama/yorum eşleşmelerinden daha değerli
+    "INSERT INTO ticket_search(ticket_search, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    f"""
+    CREATE TRIGGER ticket_search_ticket_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO ticket_search(rowid, title, body, ticket_id)
+        VALUES (new.id * 2, {_fold('new.title')}, {_fold('new.description')}, new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER ticket_search_ticket_au AFTER UPDATE OF title, description ON tickets BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2;
+        INSERT INTO ticket_search(rowid, title, body, ticket_id)
+        VALUES (new.id * 2, {_fold('new.title')}, {_fold('new.description')}, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER ticket_search_ticket_ad AFTER DELETE ON tickets BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2;
+    END
+    """,
+    f"""
+    CREATE TRIGGER ticket_search_comment_ai AFTER INSERT ON comments BEGIN
+        INSERT INTO ticket_search(rowid, title, body, ticket_id)
+        VALUES (new.id * 2 + 1, '', {_fold('new.content')}, new.ticket_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER ticket_search_comment_au AFTER UPDATE OF content, ticket_id ON comments BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO ticket_search(rowid, title, body, ticket_id)
+        VALUES (new.id * 2 + 1, '', {_fold('new.content')}, new.ticket_id);
+    END
+    """,
+    """
+    CREATE TRIGGER ticket_search_comment_ad AFTER DELETE ON comments BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+    # Mevcut kayıtları indeksle
+    f"""
+    INSERT INTO ticket_search(rowid, title, body, ticket_id)
+    SELECT id * 2, {_fold('title')}, {_fold('description')}, id FROM tickets
+    """,
+    f"""
+    INSERT INTO ticket_search(rowid, title, body, ticket_id)
+    SELECT id * 2 + 1, '', {_fold('content')}, ticket_id FROM comments
+    """,
+]
+
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in STATEMENTS:
+        connection.exec_driver_sql(statement)
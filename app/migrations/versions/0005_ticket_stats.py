@@ -0,0 +1,34 @@
+"""Dashboard istatistikleri için (departman, durum, öncelik) başına ticket sayaçları."""
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+
+metadata = MetaData()
+
+tickets = Table(
+    "tickets", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("status", String),
+    Column("priority", String),
+    Column("assigned_department_id", Integer),
+)
+
+ticket_stats = Table(
+    "ticket_stats", metadata,
+    Column("department_id", Integer, primary_key=True, autoincrement=False),
+    Column("status", String, primary_key=True),
+    Column("priority", String, primary_key=True),
+    Column("count", Integer, nullable=False, default=0),
+)
+
+
+def upgrade(connection):
+    ticket_stats.create(bind=connection, checkfirst=True)
+    connection.execute(ticket_stats.delete())
+    connection.execute(ticket_stats.insert().from_select(
+        ["department_id", "status", "priority", "count"],
+        select(
+            func.coalesce(tickets.c.assigned_department_id, 0),
+            func.coalesce(tickets.c.status, ""),
+            func.coalesce(tickets.c.priority, ""),
+            func.count(),
+        ).group_by(tickets.c.assigned_department_id, tickets.c.status, tickets.c.priority),
+    ))
@@ -0,0 +1,108 @@
+"""Kapatılan ticket'ların arşivlenmesi: `closed_at`, arşiv tabloları ve arşiv arama indeksi.
+
+Arşiv tabloları canlı tablolarla aynı veritabanındadır; böylece bir grubun taşınması
+tek bir transaction'dır. Arşivin FTS5 indeksi (yalnızca SQLite) canlı indeksle aynı
+rowid şemasını kullanır: ticket = id * 2, yorum = id * 2 + 1.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table
+
+from app.migrations import has_column
+
+metadata = MetaData()
+
+tickets = Table(
+    "tickets", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("status", String),
+    Column("updated_at", DateTime),
+    Column("closed_at", DateTime),
+)
+
+# ForeignKey hedefleri için
+Table("users", metadata, Column("id", Integer, primary_key=True))
+Table("departments", metadata, Column("id", Integer, primary_key=True))
+
+tickets_archive = Table(
+    "tickets_archive", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("title", String),
+    Column("description", String),
+    Column("status", String),
+    Column("priority", String),
+    Column("priority_rank", Integer),
+    Column("category", String, nullable=True),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("closed_at", DateTime, nullable=True),
+    Column("created_by_user_id", Integer, ForeignKey("users.id")),
+    Column("assigned_department_id", Integer, ForeignKey("departments.id")),
+    Column("assigned_support_id", Integer, ForeignKey("users.id"), nullable=True),
+    Column("archived_at", DateTime),
+    Index("ix_tickets_archive_creator", "created_by_user_id"),
+    Index("ix_tickets_archive_department", "assigned_department_id"),
+    Index("ix_tickets_archive_assignee", "assigned_support_id"),
+)
+
+comments_archive = Table(
+    "comments_archive", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("ticket_id", Integer, ForeignKey("tickets_archive.id"), index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("content", String),
+    Column("created_at", DateTime),
+)
+
+
+def _fold(expr: str) -> str:
+    return f"replace(coalesce({expr}, ''), 'ı', 'i')"
+
+
+SEARCH_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE ticket_archive_search USING fts5(
+        title, body, ticket_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    "INSERT INTO ticket_archive_search(ticket_archive_search, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+    f"""
+    CREATE TRIGGER ticket_archive_search_ticket_ai AFTER INSERT ON tickets_archive BEGIN
+        INSERT INTO ticket_archive_search(rowid, title, body, ticket_id)
+        VALUES (new.id * 2, {_fold('new.title')}, {_fold('new.description')}, new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER ticket_archive_search_ticket_ad AFTER DELETE ON tickets_archive BEGIN
+        DELETE FROM ticket_archive_search WHERE rowid = old.id * 2;
+    END
+    """,
+    f"""
+    CREATE TRIGGER ticket_archive_search_comment_ai AFTER INSERT ON comments_archive BEGIN
+        INSERT INTO ticket_archive_search(rowid, title, body, ticket_id)
+        VALUES (new.id * 2 + 1, '', {_fold('new.content')}, new.ticket_id);
+    END
+    """,
+    """
+    CREATE TRIGGER ticket_archive_search_comment_ad AFTER DELETE ON comments_archive BEGIN
+        DELETE FROM ticket_archive_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+
+def upgrade(connection):
+    if not has_column(connection, "tickets", "closed_at"):
+        connection.exec_driver_sql("ALTER TABLE tickets ADD COLUMN closed_at DATETIME")
+    # Kapanış anı bilinmeyen kapalı ticket'lar için en iyi tahmin son güncelleme zamanıdır
+    connection.execute(
+        tickets.update()
+        .where(tickets.c.status == "Closed", tickets.c.closed_at.is_(None))
+        .values(closed_at=tickets.c.updated_at)
+    )
+    Index("ix_tickets_status_closed", tickets.c.status, tickets.c.closed_at).create(bind=connection, checkfirst=True)
+
+    metadata.create_all(bind=connection, tables=[tickets_archive, comments_archive], checkfirst=True)
+
+    if connection.dialect.name == "sqlite":
+        for statement in SEARCH_STATEMENTS:
+            connection.exec_driver_sql(statement)
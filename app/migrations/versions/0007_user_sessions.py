@@ -0,0 +1,23 @@
+"""Refresh token oturumları: `user_sessions` tablosu."""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+# ForeignKey hedefi için
+Table("users", metadata, Column("id", Integer, primary_key=True))
+
+user_sessions = Table(
+    "user_sessions", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("family_id", String, nullable=False, index=True),
+    Column("token_hash", String, nullable=False, unique=True, index=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("expires_at", DateTime, nullable=False, index=True),
+    Column("revoked_at", DateTime, nullable=True),
+    Column("replaced_by_id", Integer, nullable=True),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(bind=connection, tables=[user_sessions], checkfirst=True)
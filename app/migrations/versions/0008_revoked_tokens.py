@@ -0,0 +1,18 @@
+"""İptal edilmiş access token'lar: `revoked_tokens` tablosu."""
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+revoked_tokens = Table(
+    "revoked_tokens", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("jti", String, nullable=False, unique=True, index=True),
+    Column("user_id", Integer, nullable=True),
+    Column("revoked_at", DateTime, nullable=False),
+    Column("expires_at", DateTime, nullable=False, index=True),
+    sqlite_autoincrement=True,
+)
+
+
+def upgrade(connection):
+    metadata.create_all(bind=connection, tables=[revoked_tokens], checkfirst=True)
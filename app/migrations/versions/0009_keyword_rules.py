@@ -0,0 +1,79 @@
+"""Öncelik/departman anahtar kelime kuralları: `keyword_rules` tablosu, varsayılan kurallarla."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, func, select
+
+metadata = MetaData()
+
+# Bu migration anındaki varsayılan kurallar: (kalıp, ağırlık, hedef türü, hedef). Uygulamadaki
+# `app.core.rules.DEFAULT_RULES` ileride değişse de bu migration'ın eklediği satırlar değişmez.
+SEED_RULES = [
+    ("acil", 3.0, "priority", "High"),
+    ("hızlı", 3.0, "priority", "High"),
+    ("urgent", 3.0, "priority", "High"),
+    ("çok önemli", 3.0, "priority", "High"),
+    ("kapalı", 3.0, "priority", "High"),
+    ("sistem", 3.0, "priority", "High"),
+    ("çöktü", 3.0, "priority", "High"),
+    ("yavaş", 1.0, "priority", "Medium"),
+    ("sürekli", 1.0, "priority", "Medium"),
+    ("kopuyor", 1.0, "priority", "Medium"),
+    ("erişim", 1.0, "priority", "Medium"),
+    ("bağlantı", 1.0, "priority", "Medium"),
+    ("ağ", 1.0, "priority", "Medium"),
+    ("internet", 1.0, "priority", "Medium"),
+    ("internet", 1.0, "department", "Bilgi Islem"),
+    ("wifi", 1.0, "department", "Bilgi Islem"),
+    ("eduroam", 1.0, "department", "Bilgi Islem"),
+    ("ağ", 1.0, "department", "Bilgi Islem"),
+    ("bağlantı", 1.0, "department", "Bilgi Islem"),
+    ("şifre", 1.0, "department", "Bilgi Islem"),
+    ("e-posta", 1.0, "department", "Bilgi Islem"),
+    ("sistem", 1.0, "department", "Bilgi Islem"),
+    ("bilgisayar", 1.0, "department", "Bilgi Islem"),
+    ("sunucu", 1.0, "department", "Bilgi Islem"),
+    ("kalorifer", 1.0, "department", "Yapi Isleri"),
+    ("elektrik", 1.0, "department", "Yapi Isleri"),
+    ("su kaçağı", 1.0, "department", "Yapi Isleri"),
+    ("musluk", 1.0, "department", "Yapi Isleri"),
+    ("lamba", 1.0, "department", "Yapi Isleri"),
+    ("klima", 1.0, "department", "Yapi Isleri"),
+    ("asansör", 1.0, "department", "Yapi Isleri"),
+    ("pencere", 1.0, "department", "Yapi Isleri"),
+    ("tadilat", 1.0, "department", "Yapi Isleri"),
+    ("transkript", 1.0, "department", "Ogrenci Isleri"),
+    ("öğrenci belgesi", 1.0, "department", "Ogrenci Isleri"),
+    ("harç", 1.0, "department", "Ogrenci Isleri"),
+    ("kayıt", 1.0, "department", "Ogrenci Isleri"),
+    ("diploma", 1.0, "department", "Ogrenci Isleri"),
+    ("yatay geçiş", 1.0, "department", "Ogrenci Isleri"),
+    ("danışman", 1.0, "department", "Akademik Danismanlik"),
+    ("ders seçimi", 1.0, "department", "Akademik Danismanlik"),
+    ("staj", 1.0, "department", "Akademik Danismanlik"),
+    ("tez", 1.0, "department", "Akademik Danismanlik"),
+    ("akademik", 1.0, "department", "Akademik Danismanlik"),
+]
+
+keyword_rules = Table(
+    "keyword_rules", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("pattern", String, nullable=False),
+    Column("weight", Float, nullable=False),
+    Column("target_type", String, nullable=False),
+    Column("target", String, nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime, index=True),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(bind=connection, tables=[keyword_rules], checkfirst=True)
+    # Eski `suggest_priority_fallback` kelime listesi artık tabloda, admin tarafından düzenlenebilir
+    if connection.execute(select(func.count()).select_from(keyword_rules)).scalar():
+        return
+    now = datetime.utcnow()
+    connection.execute(keyword_rules.insert(), [
+        {"pattern": pattern, "weight": weight, "target_type": target_type, "target": target,
+         "created_at": now, "updated_at": now}
+        for pattern, weight, target_type, target in SEED_RULES
+    ])
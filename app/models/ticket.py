@@ -1,7 +1,25 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, case 
-from sqlalchemy.orm import relationship 
+from collections import Counter
+from sqlalchemy import Column, Float, Integer, String, ForeignKey, DateTime, Index, case, event, func, inspect, select
+from sqlalchemy.orm import Session, column_property, relationship, validates
 from datetime import datetime 
 from app.database import Base 
+
+# Öncelik sıralaması için sayısal karşılıklar (küçük = daha acil). Bilinmeyen değerler en sona gider.
+PRIORITY_RANKS = {"High": 1, "Medium": 2, "Low": 3}
+UNKNOWN_PRIORITY_RANK = 4
+
+
+def priority_rank(priority) -> int:
+    return PRIORITY_RANKS.get(priority, UNKNOWN_PRIORITY_RANK)
+
+
+def priority_rank_case(column):
+    """`priority` sütunundan rank hesaplayan SQL ifadesi (mevcut satırları doldurmak için)."""
+    return case(
+        *[(column == name, rank) for name, rank in PRIORITY_RANKS.items()],
+        else_=UNKNOWN_PRIORITY_RANK
+    )
+
  
 class Ticket(Base): 
     __tablename__ = "tickets" 
@@ -12,10 +30,14 @@ class Ticket(Base):
  
     status = Column(String, default="Open") 
     priority = Column(String, default="Low") 
+    # `priority` değerinin indekslenebilir sayısal karşılığı; `priority` atandığında otomatik güncellenir
+    priority_rank = Column(Integer, default=PRIORITY_RANKS["Low"])
     category = Column(String, nullable=True)
  
     created_at = Column(DateTime, default=datetime.utcnow) 
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
+    # Ticket "Closed" durumuna geçtiği an; arşivleme bu alana göre yapılır
+    closed_at = Column(DateTime, nullable=True)
  
     created_by_user_id = Column(Integer, ForeignKey("users.id")) 
     assigned_department_id = Column(Integer, ForeignKey("departments.id")) 
@@ -27,18 +49,195 @@ class Ticket(Base):
  
     comments = relationship("Comment", back_populates="ticket") 
 
+    # Liste sorgularının erişim yollarına göre bileşik indeksler.
+    # priority_rank DESC tanımlanır: indeks geriye doğru tarandığında SQLite
+    # "rank ASC, created_at DESC, id DESC" sırasını ek sıralama yapmadan üretir.
+    __table_args__ = (
+        Index("ix_tickets_department_status_rank_created", assigned_department_id, status, priority_rank.desc(), created_at),
+        Index("ix_tickets_rank_created", priority_rank.desc(), created_at),
+        Index("ix_tickets_assignee_status", assigned_support_id, status),
+        Index("ix_tickets_creator_created", created_by_user_id, created_at),
+        Index("ix_tickets_status_closed", status, closed_at),
+    )
+
+    @validates("priority")
+    def _sync_priority_rank(self, key, value):
+        self.priority_rank = priority_rank(value)
+        return value
+
+    @validates("status")
+    def _track_closed_at(self, key, value):
+        if value != "Closed":
+            self.closed_at = None
+        elif self.closed_at is None:
+            self.closed_at = datetime.utcnow()
+        return value
+
     @property
     def created_by_user(self):
         return self.creator
+
+    @property
+    def last_activity_at(self):
+        """Ticket'ın son güncellenmesi veya son yorumu (hangisi yeniyse)."""
+        if self.last_comment_at is not None and self.last_comment_at > self.updated_at:
+            return self.last_comment_at
+        return self.updated_at
  
 class Comment(Base): 
     __tablename__ = "comments" 
  
     id = Column(Integer, primary_key=True, index=True) 
-    ticket_id = Column(Integer, ForeignKey("tickets.id")) 
+    ticket_id = Column(Integer, ForeignKey("tickets.id"), index=True) 
     user_id = Column(Integer, ForeignKey("users.id")) 
     content = Column(String) 
     created_at = Column(DateTime, default=datetime.utcnow) 
  
     ticket = relationship("Ticket", back_populates="comments") 
-    commentator = relationship("User") 
+    commentator = relationship("User")
+
+
+# Liste yanıtı (TicketSummary) için yorum sayısı ve son yorum zamanı. deferred: yalnızca
+# `undefer` ile istendiğinde SELECT'e alt sorgu olarak eklenir (bkz. app.core.loaders).
+# Son yorum id sırasıyla bulunur; comments.ticket_id indeksinden tek satır okunur.
+Ticket.comment_count = column_property(
+    select(func.count(Comment.id)).where(Comment.ticket_id == Ticket.id)
+    .correlate_except(Comment).scalar_subquery(),
+    deferred=True,
+)
+Ticket.last_comment_at = column_property(
+    select(Comment.created_at).where(Comment.ticket_id == Ticket.id).order_by(Comment.id.desc()).limit(1)
+    .correlate_except(Comment).scalar_subquery(),
+    deferred=True,
+)
+
+
+class TicketArchive(Base):
+    """
+    Kapatılalı uzun süre olmuş ticket'lar (bkz. `app.core.archive`). Canlı tablo küçük
+    kalsın diye ticket'lar yorumlarıyla birlikte buraya taşınır; satırlar id'lerini korur.
+    """
+    __tablename__ = "tickets_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String)
+    description = Column(String)
+    status = Column(String)
+    priority = Column(String)
+    priority_rank = Column(Integer)
+    category = Column(String, nullable=True)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    closed_at = Column(DateTime, nullable=True)
+    created_by_user_id = Column(Integer, ForeignKey("users.id"))
+    assigned_department_id = Column(Integer, ForeignKey("departments.id"))
+    assigned_support_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    comments = relationship("CommentArchive", order_by="CommentArchive.id")
+
+    __table_args__ = (
+        Index("ix_tickets_archive_creator", created_by_user_id),
+        Index("ix_tickets_archive_department", assigned_department_id),
+        Index("ix_tickets_archive_assignee", assigned_support_id),
+    )
+
+
+class CommentArchive(Base):
+    __tablename__ = "comments_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    ticket_id = Column(Integer, ForeignKey("tickets_archive.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    content = Column(String)
+    created_at = Column(DateTime)
+
+
+class KeywordRule(Base):
+    """
+    Öncelik/departman önerisi için anahtar kelime kuralı (bkz. `app.core.rules`).
+    `target_type` "priority" ise `target` High/Medium/Low, "department" ise departman adıdır.
+    """
+    __tablename__ = "keyword_rules"
+
+    id = Column(Integer, primary_key=True)
+    pattern = Column(String, nullable=False)
+    weight = Column(Float, nullable=False, default=1.0)
+    target_type = Column(String, nullable=False)
+    target = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Kural önbelleğinin sürümü max(updated_at) ile anlaşılır
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+
+class TicketStat(Base):
+    """
+    (departman, durum, öncelik) başına ticket sayısı. Dashboard istatistikleri ticket
+    tablosunu taramadan buradan okunur; sayaçlar ticket değişiklikleriyle aynı
+    transaction'da güncellenir (bkz. `_track_ticket_stats`).
+    """
+    __tablename__ = "ticket_stats"
+
+    # Departmanı olmayan ticket'lar 0, durumu/önceliği olmayanlar "" altında sayılır
+    department_id = Column(Integer, primary_key=True, autoincrement=False)
+    status = Column(String, primary_key=True)
+    priority = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+STAT_FIELDS = ("assigned_department_id", "status", "priority")
+
+
+def ticket_stat_key(department_id, status, priority) -> tuple:
+    return (department_id or 0, status or "", priority or "")
+
+
+def apply_ticket_stat_deltas(connection, deltas: Counter):
+    """Sayaç farklarını uygular; satırı olmayan anahtarlar için yeni satır ekler."""
+    table = TicketStat.__table__
+    for (department_id, status, priority), delta in deltas.items():
+        if not delta:
+            continue
+        where = (table.c.department_id == department_id) & (table.c.status == status) & (table.c.priority == priority)
+        updated = connection.execute(table.update().where(where).values(count=table.c.count + delta))
+        if updated.rowcount == 0:
+            connection.execute(table.insert().values(
+                department_id=department_id, status=status, priority=priority, count=delta
+            ))
+
+
+def _stat_values(state, current: bool) -> tuple:
+    values = []
+    for field in STAT_FIELDS:
+        history = state.attrs[field].history
+        if current or not history.deleted:
+            values.append(getattr(state.obj(), field))
+        else:
+            values.append(history.deleted[0])
+    return ticket_stat_key(*values)
+
+
+# Sayaçlar değişen alanın eski değerini bilmeli: atama sırasında (yüklenmemiş olsa bile) eski değeri oku
+for _field in STAT_FIELDS:
+    event.listen(getattr(Ticket, _field), "set", lambda target, value, oldvalue, initiator: None, active_history=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_ticket_stats(session, flush_context):
+    # after_flush'ta yeni satırların varsayılan değerleri atanmıştır ve alan geçmişi hâlâ durur
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Ticket):
+            deltas[_stat_values(inspect(obj), current=True)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Ticket):
+            deltas[_stat_values(inspect(obj), current=False)] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, Ticket) and obj not in session.deleted:
+            state = inspect(obj)
+            old, new = _stat_values(state, current=False), _stat_values(state, current=True)
+            if old != new:
+                deltas[old] -= 1
+                deltas[new] += 1
+    if deltas:
+        apply_ticket_stat_deltas(session.connection(), deltas)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey 
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey 
 from sqlalchemy.orm import relationship 
 from app.database import Base 
  
@@ -34,3 +34,35 @@ class User(Base):
     @property
     def role_name(self):
         return self.role.name if self.role else None
+
+
+class UserSession(Base):
+    """
+    Refresh token oturumu (bkz. app.core.sessions). Token'ın kendisi değil SHA-256 özeti
+    saklanır. Her kullanımda token yenisiyle değiştirilir; aynı girişten türeyen oturumlar
+    `family_id` ile bağlıdır ve yeniden kullanım tespit edilince birlikte iptal edilir.
+    """
+    __tablename__ = "user_sessions"
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    family_id = Column(String, nullable=False, index=True)
+    token_hash = Column(String, nullable=False, unique=True, index=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=True)
+    replaced_by_id = Column(Integer, nullable=True)
+
+
+class RevokedToken(Base):
+    """
+    Süresi dolmadan iptal edilmiş access token'ların `jti` değerleri (bkz. app.core.revocation).
+    Kayıt token'ın `exp` anından sonra gereksizdir ve temizlikte silinir. `id` hiç yeniden
+    kullanılmaz (AUTOINCREMENT); worker'lar yeni kayıtları `id > son görülen` ile okur.
+    """
+    __tablename__ = "revoked_tokens"
+    __table_args__ = {"sqlite_autoincrement": True}
+    id = Column(Integer, primary_key=True)
+    jti = Column(String, nullable=False, unique=True, index=True)
+    user_id = Column(Integer, nullable=True)
+    revoked_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
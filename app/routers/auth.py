@@ -1,29 +1,47 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.user import UserCreate, UserLogin, UserResponse, Token
+import asyncio
+from fastapi import APIRouter, Depends, Request, status, HTTPException
+from jose import JWTError
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, commit_async
+from app.schemas.user import UserCreate, UserLogin, UserResponse, Token, RefreshRequest
 from app.models.user import User, Role
-from app.core.security import get_password_hash, verify_password, create_access_token
-from app.core.auth import get_current_user
+from app.core.security import create_access_token, decode_access_token, needs_rehash
+from app.core.hashing import password_hasher
+from app.core.revocation import revocation_list, revoke_access_token
+from app.core.sessions import issue_refresh_token, revoke_refresh_token, revoke_user_sessions, rotate_refresh_token
+from app.core.throttle import client_ip, login_throttle
+from app.core.auth import get_current_user, get_current_reader, optional_oauth2_scheme
+from app.core.principals import Principal
 from datetime import timedelta
+from typing import Optional
 from app.core.config import settings
 from app.schemas.user import ChangePasswordRequest, AdminResetPasswordRequest
 
 router = APIRouter(tags=["Authentication"])
 
+
+def _access_token(user: User) -> str:
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return create_access_token(
+        data={"sub": user.email, "role": user.role.name, "uid": user.id}, expires_delta=access_token_expires
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Kullanıcı rolü var mı kontrol et
-    role = db.query(Role).filter(Role.name == user_data.role_name).first()
+    role = (await db.execute(select(Role).where(Role.name == user_data.role_name))).scalars().first()
     if not role:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Geçersiz kullanıcı rolü.")
 
     # E-posta zaten kullanılıyor mu kontrol et
-    if db.query(User).filter(User.email == user_data.email).first():
+    if (await db.execute(select(User.id).where(User.email == user_data.email))).first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="E-posta zaten kayıtlı.")
 
-    # Şifreyi hashle
-    hashed_password = get_password_hash(user_data.password)
+    # Şifreyi hashle (şifre süreç havuzunda; event loop ve thread havuzu bloklanmaz)
+    hashed_password = await password_hasher.hash(user_data.password)
 
     # Yeni kullanıcıyı oluştur
     new_user = User(
@@ -33,30 +51,78 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await commit_async(db)
     return new_user
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_data.username).first()
-    
-    if not user or not verify_password(user_data.password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Hatalı kullanıcı adı veya şifre.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    # Token oluştur
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.name}, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+async def login_for_access_token(request: Request, user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    # IP/hesap sınırı ve eşzamanlı doğrulama tavanı: fazla denemeler bcrypt'e ulaşmadan reddedilir.
+    # SQLite bucket deposu senkron ve kilit bekleyebilir; event loop'u bloklamasın diye thread'de
+    await asyncio.to_thread(login_throttle.check, client_ip(request), user_data.username)
+    async with login_throttle.verify_slot():
+        user = (await db.execute(
+            select(User).options(joinedload(User.role)).where(User.email == user_data.username)
+        )).scalars().first()
+
+        if not user or not await password_hasher.verify(user_data.password, user.password_hash):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Hatalı kullanıcı adı veya şifre.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        # BCRYPT_ROUNDS değiştiyse şifre elimizdeyken hash'i yeni maliyetle yenile
+        if needs_rehash(user.password_hash):
+            user.password_hash = await password_hasher.hash(user_data.password)
+
+    # Token'ları oluştur: kısa ömürlü access token + sunucuda kaydı tutulan refresh token
+    refresh_token = await issue_refresh_token(db, user.id)
+    await commit_async(db)
+    return {"access_token": _access_token(user), "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    req: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+):
+    """
+    Refresh token karşılığında yeni access token verir; refresh token her kullanımda yenilenir.
+    Gönderilen eski access token süresinden önce iptal edilir.
+    """
+    user, refresh_token = await rotate_refresh_token(db, req.refresh_token)
+    jti = None
+    if token:
+        try:
+            jti = await revoke_access_token(db, decode_access_token(token))
+        except JWTError:
+            pass
+    await commit_async(db)
+    if jti is not None:
+        revocation_list.add(jti)
+    return {"access_token": _access_token(user), "token_type": "bearer", "refresh_token": refresh_token}
+
+@router.post("/logout")
+async def logout(
+    req: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+    token: Optional[str] = Depends(optional_oauth2_scheme)
+):
+    """Refresh token'ın oturumunu kapatır; gönderilen access token da süresinden önce iptal edilir."""
+    await revoke_refresh_token(db, req.refresh_token)
+    jti = None
+    if token:
+        try:
+            jti = await revoke_access_token(db, decode_access_token(token))
+        except JWTError:
+            pass
+    await commit_async(db)
+    if jti is not None:
+        revocation_list.add(jti)
+    return {"message": "Oturum kapatıldı."}
 
 @router.get("/me", response_model=dict)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: Principal = Depends(get_current_reader)):
     """Oturum açmış kullanıcının bilgilerini döndür."""
     return {
         "id": current_user.id,
@@ -67,42 +133,58 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @router.post('/change-password')
-def change_password(
+async def change_password(
     req: ChangePasswordRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Authenticated user can change their own password by providing current password."""
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await db.get(User, current_user.id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı.")
 
     # verify current password
-    if not verify_password(req.current_password, user.password_hash):
+    if not await password_hasher.verify(req.current_password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Mevcut şifre yanlış.")
 
-    user.password_hash = get_password_hash(req.new_password)
-    db.add(user)
-    db.commit()
+    user.password_hash = await password_hasher.hash(req.new_password)
+    # Diğer cihazlardaki oturumlar da kapanır
+    await revoke_user_sessions(db, user.id)
+    await commit_async(db)
     return {"message": "Şifre başarıyla güncellendi."}
 
 
 @router.put('/users/{user_id}/password')
-def admin_reset_password(
+async def admin_reset_password(
     user_id: int,
     req: AdminResetPasswordRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Admin can reset another user's password without knowing the old one."""
     if current_user.role.name != 'admin':
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu işlem için admin yetkisi gerekir.")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı.")
 
-    user.password_hash = get_password_hash(req.new_password)
-    db.add(user)
-    db.commit()
-    return {"message": "Kullanıcının şifresi admin tarafından başarıyla sıfırlandı."}
\ No newline at end of file
+    user.password_hash = await password_hasher.hash(req.new_password)
+    await revoke_user_sessions(db, user.id)
+    await commit_async(db)
+    return {"message": "Kullanıcının şifresi admin tarafından başarıyla sıfırlandı."}
+
+
+@router.delete('/users/{user_id}/sessions')
+async def admin_revoke_sessions(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Admin bir kullanıcının tüm oturumlarını kapatır (refresh token'lar geçersiz olur)."""
+    if current_user.role.name != 'admin':
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu işlem için admin yetkisi gerekir.")
+
+    revoked = await revoke_user_sessions(db, user_id)
+    await commit_async(db)
+    return {"message": "Kullanıcının oturumları kapatıldı.", "revoked": revoked}
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.core import metrics
+from app.core.auth import get_current_user
+from app.core.principals import Principal
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/", response_model=dict)
+def read_metrics(current_user: Principal = Depends(get_current_user)):
+    """Admin - süreç içi önbellek/havuz metrikleri (bu worker'a ait)."""
+    if current_user.role.name != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu işleme yalnızca Admin yetkilidir.")
+    return metrics.collect_all()
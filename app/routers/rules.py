@@ -0,0 +1,93 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, commit_async
+from app.models.ticket import KeywordRule
+from app.models.user import Department
+from app.schemas.ticket import KeywordRuleCreate, KeywordRuleResponse, SuggestRequest
+from app.core.auth import get_admin
+from app.core.principals import Principal
+from app.core.rules import DEPARTMENT, PRIORITIES, PRIORITY, normalize, rule_engine
+
+router = APIRouter(tags=["Rules"])
+
+
+async def _validate(db: AsyncSession, rule: KeywordRuleCreate):
+    if not normalize(rule.pattern):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Kural kalıbı boş olamaz.")
+    if rule.target_type == PRIORITY and rule.target not in PRIORITIES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Öncelik High, Medium veya Low olmalı.")
+    if rule.target_type == DEPARTMENT:
+        found = (await db.execute(select(Department.id).where(Department.name == rule.target))).first()
+        if not found:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Departman bulunamadı.")
+
+
+@router.get("/", response_model=List[KeywordRuleResponse])
+async def list_rules(db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_admin)):
+    """Admin - tüm anahtar kelime kuralları."""
+    return (await db.execute(select(KeywordRule).order_by(KeywordRule.id))).scalars().all()
+
+
+@router.post("/", response_model=KeywordRuleResponse, status_code=status.HTTP_201_CREATED)
+async def create_rule(
+    req: KeywordRuleCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_admin)
+):
+    """Admin - yeni kural ekler; bu worker'da hemen, diğerlerinde en geç RULES_REFRESH_SECONDS içinde geçerli olur."""
+    await _validate(db, req)
+    rule = KeywordRule(**req.model_dump())
+    db.add(rule)
+    await commit_async(db)
+    rule_engine.invalidate()
+    return rule
+
+
+@router.put("/{rule_id}", response_model=KeywordRuleResponse)
+async def update_rule(
+    rule_id: int,
+    req: KeywordRuleCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_admin)
+):
+    """Admin - kuralı günceller."""
+    rule = await db.get(KeywordRule, rule_id)
+    if not rule:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kural bulunamadı.")
+    await _validate(db, req)
+    for field, value in req.model_dump().items():
+        setattr(rule, field, value)
+    await commit_async(db)
+    rule_engine.invalidate()
+    return rule
+
+
+@router.delete("/{rule_id}")
+async def delete_rule(
+    rule_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_admin)
+):
+    """Admin - kuralı siler."""
+    rule = await db.get(KeywordRule, rule_id)
+    if not rule:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kural bulunamadı.")
+    await db.delete(rule)
+    await commit_async(db)
+    rule_engine.invalidate()
+    return {"message": "Kural silindi."}
+
+
+@router.post("/explain", response_model=dict)
+async def explain_rules(
+    req: SuggestRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_admin)
+):
+    """Admin - bir metin için kuralların öncelik/departman puanları ve katkı veren kurallar."""
+    await rule_engine.sync_async(db)
+    departments = list((await db.execute(select(Department.name))).scalars())
+    scores = rule_engine.score(req.title or "", req.description, departments)
+    return {key: score.as_dict() for key, score in scores.items()}
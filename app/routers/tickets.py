@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import case 
-from app.database import get_db
-from app.models.ticket import Ticket, Comment
+from fastapi import APIRouter, Depends, status, HTTPException, Query, File, UploadFile, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, true
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db, commit_async
+from app.models.ticket import Ticket, Comment, TicketArchive
 from app.models.user import User, Department, Role
-from app.schemas.ticket import TicketCreate, TicketResponse, CommentCreate
+from app.schemas.ticket import TicketCreate, TicketResponse, TicketSummary, TicketPage, CommentCreate, CommentPage, TicketSearchResponse, TicketStatsResponse
+from app.schemas.ticket import ArchivedTicketResponse, BulkTicketRequest, BulkTicketResponse, TicketImportResponse
 from app.schemas.ticket import SuggestRequest, SuggestResponse, UpdateStatusRequest, ReassignSupportRequest
-from app.core.services import suggest_ticket, summarize_text, draft_response, send_notification
+from app.core.coalesce import Superseded, client_key, suggest_debouncer, suggest_flight
+from app.core.rules import normalize, rule_engine
+from app.core.services import suggest_ticket, summarize_text, draft_response, send_notification, send_notifications
+import io
 import threading
 from datetime import datetime
-from app.core.auth import get_current_user, get_department, get_support
+from app.core.auth import get_current_user, get_department, get_support, get_read_db
+from app.core.principals import Principal
+from app.core.pagination import SortKey, paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.loaders import loader_options
+from app.core.search import search_tickets
+from app.core.stats import load_ticket_stats
+from app.core.export import export_tickets
+from app.core.importer import import_tickets, read_records
 from typing import List, Optional
 import logging
 
@@ -17,14 +30,53 @@ logger = logging.getLogger("app.routers.tickets")
 
 router = APIRouter(tags=["Tickets"])
 
+
+def _ticket_sort_keys(sort_by_priority: bool = False):
+    """Liste endpoint'leri için keyset sırası: (öncelik,) en yeni önce, eşitlikte id."""
+    keys = []
+    if sort_by_priority:
+        keys.append(SortKey(Ticket.priority_rank, lambda t: t.priority_rank))
+    keys.append(SortKey(Ticket.created_at, lambda t: t.created_at, descending=True))
+    keys.append(SortKey(Ticket.id, lambda t: t.id, descending=True))
+    return keys
+
+
+async def _get_ticket_async(db: AsyncSession, ticket_id: int):
+    """Ticket'ı oluşturanıyla birlikte yükler (bildirimler creator e-postasını kullanır)."""
+    result = await db.execute(
+        select(Ticket).options(joinedload(Ticket.creator)).where(Ticket.id == ticket_id)
+    )
+    return result.scalars().first()
+
+
+def _visible_tickets(user: Principal, model=Ticket):
+    """
+    Kullanıcının rolüne göre görebileceği ticket'ları sınırlayan koşul (admin: hepsi).
+    `model` aynı sütunlara sahip arşiv tablosu (TicketArchive) da olabilir.
+    """
+    role = user.role.name
+    if role == "admin":
+        return None
+    if role == "department":
+        return model.assigned_department_id == user.department_id
+    if role == "support":
+        return model.assigned_support_id == user.id
+    return model.created_by_user_id == user.id
+
+
+def _page(query, sort_by_priority: bool, limit: int, after: Optional[str]):
+    query = query.options(*loader_options(TicketSummary))
+    items, next_cursor = paginate(query, _ticket_sort_keys(sort_by_priority), limit, after)
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 async def create_new_ticket(
     ticket_data: TicketCreate, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     # Aktif departmanlari cek
-    department_names = [d.name for d in db.query(Department).all()]
+    department_names = list((await db.execute(select(Department.name))).scalars())
 
     # If user provided department explicitly and it's valid, use it; otherwise ask the AI for suggestions
     assigned_department_name = None
@@ -38,6 +90,7 @@ async def create_new_ticket(
     # If department/priority/title/category missing, call suggest_ticket to obtain defaults
     if not assigned_department_name or not chosen_priority or not chosen_title or not chosen_category:
         try:
+            await rule_engine.sync_async(db)
             suggestion = await suggest_ticket(ticket_data.title or "", ticket_data.description or "", department_names)
             # pick first department option if not provided
             if not assigned_department_name:
@@ -66,7 +119,7 @@ async def create_new_ticket(
     if not assigned_department_name:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Hiçbir departman bulunamadı.")
 
-    department = db.query(Department).filter(Department.name == assigned_department_name).first()
+    department = (await db.execute(select(Department).where(Department.name == assigned_department_name))).scalars().first()
     if not department:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Departman bulunamadı.")
 
@@ -85,18 +138,24 @@ async def create_new_ticket(
     )
 
     db.add(new_ticket)
-    db.commit()
-    db.refresh(new_ticket)
+    await commit_async(db)
     logger.info("Ticket created: id=%s title=%s created_by=%s department=%s", new_ticket.id, new_ticket.title, current_user.email, department.name)
 
-    return new_ticket
+    # Yanıt şeması ilişkileri de içerir; async oturumda lazy load olmadığı için birlikte yükle
+    result = await db.execute(
+        select(Ticket).options(*loader_options(TicketResponse)).where(Ticket.id == new_ticket.id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
 
-@router.get("/department", response_model=List[TicketResponse])
+@router.get("/department", response_model=TicketPage)
 def list_department_tickets(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_department),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_department),
     status_filter: Optional[str] = None,
-    sort_by_priority: Optional[bool] = False
+    sort_by_priority: Optional[bool] = False,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
 ):
     """Departman yöneticisi - departmanına ait tüm ticket'ları görebilir."""
     query = db.query(Ticket).filter(
@@ -106,41 +165,150 @@ def list_department_tickets(
     if status_filter:
         query = query.filter(Ticket.status == status_filter)
 
-    if sort_by_priority:
-        priority_order = case(
-            (Ticket.priority == 'High', 1),
-            (Ticket.priority == 'Medium', 2),
-            (Ticket.priority == 'Low', 3),
-            else_=4
-        ).label("priority_order")
-        query = query.order_by(priority_order)
+    return _page(query, sort_by_priority, limit, after)
 
-    return query.all()
-
-@router.get("/support", response_model=List[TicketResponse])
+@router.get("/support", response_model=TicketPage)
 def list_support_tickets(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_support)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_support),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
 ):
     """Support personeli - kendine atanmış ticket'ları görebilir."""
-    return db.query(Ticket).filter(
+    query = db.query(Ticket).filter(
         Ticket.assigned_support_id == current_user.id
-    ).all()
+    )
+    return _page(query, False, limit, after)
 
-@router.get("/my", response_model=List[TicketResponse])
+@router.get("/my", response_model=TicketPage)
 def get_my_tickets(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    query = db.query(Ticket).filter(Ticket.created_by_user_id == current_user.id)
+    return _page(query, False, limit, after)
+
+@router.get("/search", response_model=TicketSearchResponse)
+def search_tickets_endpoint(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Ticket başlık, açıklama ve yorumlarında tam metin arama (rolün görebildiği ticket'larda).
+    `include_archived=true` ile arşivlenmiş ticket'lar da aranır.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Tam metin arama bu veritabanında desteklenmiyor.")
+
+    items = search_tickets(db, q, scope=_visible_tickets(current_user), limit=limit)
+    if include_archived:
+        items += search_tickets(db, q, scope=_visible_tickets(current_user, TicketArchive), limit=limit, archived=True)
+        items = sorted(items, key=lambda item: item["score"])[:limit]
+    return {"query": q, "items": items}
+
+_EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+@router.get("/export")
+def export_tickets_endpoint(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    department_filter: Optional[str] = None,
+    status_filter: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_department)
+):
+    """
+    Ticket'ları CSV veya NDJSON olarak akış hâlinde dışa aktarır (departman yöneticisi
+    yalnızca kendi departmanını). Satırlar okundukça gönderilir; bellek kullanımı sabittir.
+    """
+    conditions = []
+    scope = _visible_tickets(current_user)
+    if scope is not None:
+        conditions.append(scope)
+    if department_filter:
+        department = db.query(Department).filter(Department.name == department_filter).first()
+        if not department:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Departman bulunamadi.")
+        conditions.append(Ticket.assigned_department_id == department.id)
+    if status_filter:
+        conditions.append(Ticket.status == status_filter)
+    if created_from:
+        conditions.append(Ticket.created_at >= created_from)
+    if created_to:
+        conditions.append(Ticket.created_at < created_to)
+
+    filename = f"tickets-{datetime.utcnow():%Y%m%d}.{format}"
+    return StreamingResponse(
+        export_tickets(db.get_bind(), conditions, format),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post("/import", response_model=TicketImportResponse)
+def import_tickets_endpoint(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    enrich: bool = False,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Admin - geçmiş ticket'ları NDJSON/CSV dosyasından toplu içe aktarır (dışa aktarımla aynı
+    alanlar). `enrich=true` ise eksik departman/öncelik/başlık AI ile doldurulur.
+    Hatalı satırlar atlanır ve yanıtta satır numarasıyla listelenir.
+    """
+    if current_user.role.name != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu işleme yalnızca Admin yetkilidir.")
+
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = import_tickets(db.get_bind(), read_records(stream, fmt), enrich=enrich)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dosya UTF-8 kodlamalı olmalıdır.")
+    finally:
+        stream.detach()
+    logger.info("Ticket import by %s: %s imported, %s errors", current_user.email, report.imported, report.error_count)
+    return report.as_dict()
+
+@router.get("/archive/{ticket_id}", response_model=ArchivedTicketResponse)
+def get_archived_ticket(
+    ticket_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Arşivlenmiş bir ticket'ı yorumlarıyla birlikte döndürür."""
+    ticket = db.query(TicketArchive).options(selectinload(TicketArchive.comments)).filter(TicketArchive.id == ticket_id).first()
+    if not ticket:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Arşivde ticket bulunamadi.")
+
+    scope = _visible_tickets(current_user, TicketArchive)
+    if scope is not None and not db.query(TicketArchive.id).filter(TicketArchive.id == ticket_id, scope).first():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu ticket'a yetkiniz yok.")
+    return ticket
+
+@router.get("/stats", response_model=TicketStatsResponse)
+def get_ticket_stats(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_department)
 ):
-    tickets = db.query(Ticket).filter(Ticket.created_by_user_id == current_user.id).all()
-    return tickets
+    """Dashboard sayıları: admin tüm ticket'lar, departman yöneticisi kendi departmanı."""
+    department_id = None if current_user.role.name == "admin" else current_user.department_id
+    return load_ticket_stats(db, department_id=department_id)
 
 @router.put("/{ticket_id}/assign")
 def assign_support_to_ticket(
     ticket_id: int, 
     support_email: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_department) 
+    current_user: Principal = Depends(get_department) 
 ):
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
     if not ticket:
@@ -162,7 +330,7 @@ def reassign_support(
     ticket_id: int,
     req: ReassignSupportRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Admin / Departman yöneticisi - Support görevlisini değiştirir (reassign)."""
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
@@ -196,7 +364,7 @@ def assign_ticket_to_department(
     ticket_id: int, 
     department_name: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Admin - ticket'ı departmana atama."""
     if current_user.role.name != "admin":
@@ -216,12 +384,98 @@ def assign_ticket_to_department(
 
     return {"message": f"Ticket {ticket_id} basariyla {department_name} departmanına atandi."}
 
+# Toplu işlem -> yapabilecek roller (tekil endpoint'lerle aynı)
+_BULK_ROLES = {
+    "status": ("admin", "support", "department"),
+    "assign": ("admin", "department"),
+    "assign-department": ("admin",),
+}
+
+
+@router.post("/bulk", response_model=BulkTicketResponse)
+def bulk_update_tickets(
+    req: BulkTicketRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Birden çok ticket'a aynı işlemi (status / assign / assign-department) uygular.
+    Yetki ticket bazında tek sorguda kontrol edilir, değişiklikler tek commit'le yazılır,
+    sonuç her ticket için ayrı döner ve bildirimler tek bir arka plan thread'inde gönderilir.
+    """
+    if current_user.role.name not in _BULK_ROLES[req.operation]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu işleme yetkiniz yok.")
+
+    support_user = department = None
+    if req.operation == "status" and not req.new_status:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="new_status gerekli.")
+    if req.operation == "assign":
+        support_user = db.query(User).options(joinedload(User.role)).filter(User.id == req.support_id).first()
+        if not support_user or support_user.role.name != "support":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Destek Personeli bulunamadi.")
+    if req.operation == "assign-department":
+        department = db.query(Department).filter(Department.name == req.department_name).first()
+        if not department:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Departman bulunamadi.")
+
+    ticket_ids = list(dict.fromkeys(req.ticket_ids))
+    scope = _visible_tickets(current_user)
+    allowed = true() if scope is None else scope
+    rows = (
+        db.query(Ticket, allowed.label("allowed"))
+        .options(joinedload(Ticket.creator))
+        .filter(Ticket.id.in_(ticket_ids))
+        .all()
+    )
+    found = {ticket.id: (ticket, bool(is_allowed)) for ticket, is_allowed in rows}
+
+    results, notifications = [], []
+    for ticket_id in ticket_ids:
+        if ticket_id not in found:
+            results.append({"ticket_id": ticket_id, "ok": False, "detail": "Ticket bulunamadi."})
+            continue
+        ticket, is_allowed = found[ticket_id]
+        if not is_allowed:
+            results.append({"ticket_id": ticket_id, "ok": False, "detail": "Bu ticket'a yetkiniz yok."})
+            continue
+
+        if req.operation == "status":
+            old_status = ticket.status
+            ticket.status = req.new_status
+            if req.new_status in ["Resolved", "Closed"]:
+                note = req.resolution_note or f"Durum {req.new_status} olarak güncellendi."
+                db.add(Comment(ticket_id=ticket.id, user_id=current_user.id,
+                               content=f"[Çözüm Kaydı] {current_user.email}: {note}"))
+            if old_status != req.new_status:
+                creator_email = ticket.creator.email if ticket.creator else None
+                notifications.append((ticket.id, old_status, req.new_status, ticket.title, ticket.description,
+                                      current_user.email, creator_email))
+        elif req.operation == "assign":
+            ticket.assigned_support_id = support_user.id
+            ticket.status = "In Progress"
+        else:
+            ticket.assigned_department_id = department.id
+            ticket.status = "Open"
+        results.append({"ticket_id": ticket_id, "ok": True})
+
+    db.commit()
+    updated = sum(1 for r in results if r["ok"])
+    logger.info("Bulk %s by %s: %s/%s tickets updated", req.operation, current_user.email, updated, len(ticket_ids))
+
+    if notifications:
+        try:
+            threading.Thread(target=send_notifications, args=(notifications,), daemon=True).start()
+        except Exception as e:
+            print(f"Toplu bildirim başlatılamadı: {e}")
+
+    return {"updated": updated, "results": results}
+
 @router.put("/{ticket_id}/status")
 async def update_ticket_status(
     ticket_id: int, 
     req: UpdateStatusRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Ticket durumunu güncelle (admin hepsi, support kendisine atanan, manager kendi bölümdeki)."""
     valid_statuses = ["Open", "In Progress", "Resolved", "Closed"]
@@ -230,7 +484,7 @@ async def update_ticket_status(
     if new_status not in valid_statuses:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Gecersiz durum.")
 
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await _get_ticket_async(db, ticket_id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket bulunamadi.")
     
@@ -264,8 +518,7 @@ async def update_ticket_status(
         )
         db.add(comment)
 
-    db.commit()
-    db.refresh(ticket)
+    await commit_async(db)
 
     # Asenkron: harici bildirim gönder (thread ile arka plan)
     try:
@@ -293,11 +546,11 @@ async def update_ticket_status(
 @router.post("/{ticket_id}/summarize")
 async def summarize_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_support)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_support)
 ):
     """Destek personeli için ticket özeti üretir."""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await _get_ticket_async(db, ticket_id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket bulunamadi.")
 
@@ -317,11 +570,11 @@ async def summarize_ticket(
 @router.post("/{ticket_id}/draft-response")
 async def draft_response_for_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_support)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_support)
 ):
     """Destek personeli için cevap taslağı üretir."""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await _get_ticket_async(db, ticket_id)
     if not ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket bulunamadi.")
 
@@ -358,7 +611,7 @@ def add_comment_to_ticket(
     ticket_id: int, 
     comment_data: CommentCreate, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
     if not ticket:
@@ -382,13 +635,38 @@ def add_comment_to_ticket(
     
     return {"message": "Yorum basariyla eklendi.", "comment_id": new_comment.id}
     
-@router.get("/", response_model=List[TicketResponse])
+@router.get("/{ticket_id}/comments", response_model=CommentPage)
+def list_ticket_comments(
+    ticket_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    """Ticket'ın yorumları, eskiden yeniye cursor ile sayfalanmış (rolün görebildiği ticket'lar)."""
+    scope = _visible_tickets(current_user)
+    ticket = db.query(Ticket.id, (scope if scope is not None else true()).label("allowed")).filter(Ticket.id == ticket_id).first()
+    if not ticket:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket bulunamadi.")
+    if not ticket.allowed:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu ticket'a yetkiniz yok.")
+
+    # id sırası eklenme sırasıdır; comments.ticket_id indeksi satırları bu sırayla verir
+    items, next_cursor = paginate(
+        db.query(Comment).filter(Comment.ticket_id == ticket_id),
+        [SortKey(Comment.id, lambda c: c.id)], limit, after,
+    )
+    return {"items": items, "next_cursor": next_cursor}
+    
+@router.get("/", response_model=TicketPage)
 def list_all_tickets(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user), 
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user), 
     department_filter: Optional[str] = None, 
     status_filter: Optional[str] = None,     
-    sort_by_priority: Optional[bool] = False 
+    sort_by_priority: Optional[bool] = False,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
 ):
     if current_user.role.name not in ["admin", "department"]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Bu işleme yalnızca Admin yetkilidir.")
@@ -405,22 +683,13 @@ def list_all_tickets(
         if status_filter != "":
             query = query.filter(Ticket.status == status_filter)
 
-    if sort_by_priority:
-        priority_order = case(
-            (Ticket.priority == 'High', 1),
-            (Ticket.priority == 'Medium', 2),
-            (Ticket.priority == 'Low', 3),
-            else_=4
-        ).label("priority_order")
-        query = query.order_by(priority_order)
-        
-    return query.all()
+    return _page(query, sort_by_priority, limit, after)
 
 
 @router.get("/support-list")
 def get_support_list(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Mevcut destek görevlilerinin listesini döndürür."""
     support_role = db.query(Role).filter(Role.name == "support").first()
@@ -434,12 +703,25 @@ def get_support_list(
 @router.post("/suggest", response_model=SuggestResponse)
 async def suggest_ticket_endpoint(
     suggest_req: SuggestRequest,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """AI destekli kategori ve öncelik önerisi üretir."""
     # departmanları çek
-    department_names = [d.name for d in db.query(Department).all()]
-    result = await suggest_ticket(suggest_req.title or "", suggest_req.description, department_names)
+    department_names = list((await db.execute(select(Department.name))).scalars())
+    # Admin'in kural değişiklikleri yeniden başlatmadan devreye girer
+    await rule_engine.sync_async(db)
+    title, description = suggest_req.title or "", suggest_req.description
+    # Aynı (normalize edilmiş) metin için eşzamanlı istekler tek hesaplamayı paylaşır
+    key = (normalize(title), normalize(description), tuple(department_names))
+    # Yazarken art arda gelen isteklerden yalnızca sonuncusu modele gider
+    try:
+        result = await suggest_debouncer.run(
+            client_key(request),
+            lambda: suggest_flight.do(key, lambda: suggest_ticket(title, description, department_names)),
+        )
+    except Superseded:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Daha yeni bir öneri isteği geldi.")
     return SuggestResponse(
         suggested_title=result.get("suggested_title"),
         department_options=result.get("department_options", []),
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field 
-from typing import Optional, List 
+from typing import Dict, Optional, List 
 from datetime import datetime 
 
 
@@ -45,12 +45,95 @@ class TicketResponse(BaseModel):
     assigned_support_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
+    closed_at: Optional[datetime] = None
     comments: List[CommentResponse] = [] 
  
     class Config: 
         from_attributes = True 
 
 
+class ArchivedTicketResponse(TicketResponse):
+    """Arşivden okunan ticket; canlı ticket'larla aynı alanlar ve arşivlenme zamanı."""
+    archived_at: datetime
+
+
+class TicketSummary(BaseModel):
+    """Liste endpoint'lerinde ticket; yorumlar yerine sayıları (yorumlar: GET /{id}/comments)."""
+    id: int
+    title: str
+    description: str
+    status: str
+    priority: str
+    category: Optional[str] = None
+    assigned_department_id: int
+    created_by_user_id: int
+    created_by_user: Optional[UserSimpleResponse] = None
+    assigned_support_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+    closed_at: Optional[datetime] = None
+    comment_count: int = 0
+    last_activity_at: datetime = Field(..., description="Son güncelleme veya son yorum zamanı")
+
+    class Config:
+        from_attributes = True
+
+
+class TicketPage(BaseModel):
+    """Cursor tabanlı sayfalanmış ticket listesi. `next_cursor` None ise son sayfadır."""
+    items: List[TicketSummary] = []
+    next_cursor: Optional[str] = None
+
+
+class CommentPage(BaseModel):
+    """Bir ticket'ın yorumları, eskiden yeniye. `next_cursor` None ise son sayfadır."""
+    items: List[CommentResponse] = []
+    next_cursor: Optional[str] = None
+
+
+class TicketSearchHit(BaseModel):
+    ticket_id: int
+    title: str
+    status: str
+    priority: str
+    assigned_department_id: int
+    matched_in: str = Field(..., description="title, description veya comment")
+    snippet: str = Field(..., description="Eşleşen kelimeler <mark> ile işaretlenmiş metin parçası")
+    score: float = Field(..., description="BM25 skoru (düşük = daha alakalı)")
+    archived: bool = False
+
+
+class TicketSearchResponse(BaseModel):
+    query: str
+    items: List[TicketSearchHit] = []
+
+
+class DepartmentStats(BaseModel):
+    department_id: int
+    department_name: Optional[str] = None
+    total: int
+    by_status: Dict[str, int] = {}
+
+
+class TicketStatsResponse(BaseModel):
+    total: int
+    by_status: Dict[str, int] = {}
+    by_priority: Dict[str, int] = {}
+    by_department: List[DepartmentStats] = []
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class TicketImportResponse(BaseModel):
+    imported: int
+    comments: int
+    error_count: int
+    errors: List[ImportRowError] = Field([], description="İlk 1000 hatalı satır")
+
+
 class SuggestRequest(BaseModel):
     title: str = Field(None, max_length=100)
     description: str = Field(..., min_length=1, max_length=5000)
@@ -65,6 +148,25 @@ class SuggestResponse(BaseModel):
     explanation: Optional[str] = None
 
 
+class KeywordRuleCreate(BaseModel):
+    pattern: str = Field(..., min_length=1, max_length=100, description="Kelime veya ifade (büyük/küçük harf ve Türkçe karakter duyarsız)")
+    weight: float = Field(1.0, ge=-100, le=100)
+    target_type: str = Field(..., pattern="^(priority|department)$")
+    target: str = Field(..., min_length=1, description="Öncelik (High/Medium/Low) veya departman adı")
+
+
+class KeywordRuleResponse(BaseModel):
+    id: int
+    pattern: str
+    weight: float
+    target_type: str
+    target: str
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class UpdateStatusRequest(BaseModel):
     new_status: str = Field(..., pattern="^(Open|In Progress|Resolved|Closed)$")
     resolution_note: Optional[str] = Field(None, max_length=2000, description="(Opsiyonel) Support tarafından eklenen çözüm notu veya açıklama")
@@ -72,3 +174,23 @@ class UpdateStatusRequest(BaseModel):
 
 class ReassignSupportRequest(BaseModel):
     new_support_id: int
+
+
+class BulkTicketRequest(BaseModel):
+    ticket_ids: List[int] = Field(..., min_length=1, max_length=500)
+    operation: str = Field(..., pattern="^(status|assign|assign-department)$")
+    new_status: Optional[str] = Field(None, pattern="^(Open|In Progress|Resolved|Closed)$", description="operation=status için")
+    resolution_note: Optional[str] = Field(None, max_length=2000, description="operation=status için (Resolved/Closed)")
+    support_id: Optional[int] = Field(None, description="operation=assign için")
+    department_name: Optional[str] = Field(None, description="operation=assign-department için")
+
+
+class BulkTicketResult(BaseModel):
+    ticket_id: int
+    ok: bool
+    detail: Optional[str] = None
+
+
+class BulkTicketResponse(BaseModel):
+    updated: int
+    results: List[BulkTicketResult] = []
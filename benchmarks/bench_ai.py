@@ -0,0 +1,116 @@
+"""
+Benchmark: `suggest_ticket` gecikmesi, yerel OpenAI stub'ına karşı (model gecikmesi sabit).
+
+    sync-sequential    eski yol: senkron istemci, async fonksiyon içinde art arda 3 çağrı
+                       (her çağrı event loop'u bloklar; eşzamanlı istekler sıraya girer)
+    async-sequential   async istemci, 3 çağrı art arda await
+    async-concurrent   async istemci, departman ve öncelik çağrıları eşzamanlı (gather)
+    structured         async istemci, tek JSON-modu çağrısı (varsayılan yol)
+    structured-cached  aynı metin tekrar geldiğinde: cevap LLM önbelleğinden (model çağrısı yok)
+
+Her yol için `--requests` kadar istek aynı anda başlatılır. Hepsinin başladığı andan
+itibaren istek başına ortalama gecikme ve hepsinin bitme süresi raporlanır.
+
+Örnek çıktı (100 ms model gecikmesi, 20 eşzamanlı istek):
+    yol                 ort. ms   toplam ms   çağrı
+    sync-sequential     4544.0      8648.1      60
+    async-sequential     439.8       443.7      60
+    async-concurrent     142.7       171.8      40
+    structured           121.5       164.0      20
+    structured-cached      0.3         0.4       0
+
+Kullanım:
+    python -m benchmarks.bench_ai --latency-ms 100 --requests 20
+"""
+import argparse
+import asyncio
+import time
+
+import openai
+
+from app.core import services
+from app.core.config import settings
+from app.core.llm_cache import LLMCache
+from tests.openai_stub import OpenAIStub
+
+DEPARTMENTS = ["Bilgi Islem", "Yapi Isleri", "Ogrenci Isleri", "Akademik Danismanlik"]
+TITLE = "İnternet bağlantısı yok"
+DESCRIPTION = "Yurtta wifi sabahtan beri çalışmıyor, derslere bağlanamıyorum."
+
+
+def _sync_call(client, prompt: str, max_tokens: int, **kwargs) -> str:
+    response = client.chat.completions.create(
+        model=settings.OPENAI_MODEL, messages=[{"role": "user", "content": prompt}], max_tokens=max_tokens, **kwargs
+    )
+    return response.choices[0].message.content.strip()
+
+
+async def sync_sequential(client):
+    # Eski `suggest_ticket`: kategori, öncelik ve JSON önerisi art arda, senkron istemciyle
+    _sync_call(client, f"Ticket'in ait olabilecegi departmanlar: {', '.join(DEPARTMENTS)}.\n{TITLE}\n{DESCRIPTION}", 20)
+    _sync_call(client, f"Sadece bir kelime ile önceliği ver.\n{TITLE}\n{DESCRIPTION}", 5)
+    _sync_call(client, f"JSON öneriler.\n{TITLE}\n{DESCRIPTION}", 200)
+
+
+async def async_sequential():
+    await services.categorize_ticket(TITLE, DESCRIPTION, DEPARTMENTS)
+    await services.suggest_priority(TITLE, DESCRIPTION)
+    await services._chat(f"JSON öneriler.\n{TITLE}\n{DESCRIPTION}", max_tokens=200, temperature=0.1)
+
+
+async def run(path, requests: int):
+    latencies = []
+    start = time.perf_counter()
+
+    # Gecikme hepsinin birlikte başladığı andan itibaren ölçülür (istemcinin beklediği süre)
+    async def one():
+        await path()
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    total = time.perf_counter() - start
+    return sum(latencies) / len(latencies) * 1000, total * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with OpenAIStub(delay=args.latency_ms / 1000) as stub:
+        sync_client = openai.OpenAI(api_key="bench", base_url=stub.base_url)
+
+        async def concurrent():
+            settings.OPENAI_STRUCTURED_SUGGEST = False
+            await services.suggest_ticket(TITLE, DESCRIPTION, DEPARTMENTS)
+
+        async def structured():
+            settings.OPENAI_STRUCTURED_SUGGEST = True
+            await services.suggest_ticket(TITLE, DESCRIPTION, DEPARTMENTS)
+
+        # Önbelleksiz yollar için TTL 0 (kapalı); son yol yalnızca bellek katmanını kullanır
+        uncached, cached = LLMCache(1, 0), LLMCache(settings.LLM_CACHE_SIZE, 3600)
+
+        async def _main():
+            # Bağlantı havuzu her event loop'a ait; istemci bu loop içinde kurulur
+            services.openai_client = services.create_openai_client("bench", stub.base_url)
+            print(f"{'yol':<18}{'ort. ms':>9}{'toplam ms':>12}{'çağrı':>8}")
+            for name, path, cache in (
+                ("sync-sequential", lambda: sync_sequential(sync_client), uncached),
+                ("async-sequential", async_sequential, uncached),
+                ("async-concurrent", concurrent, uncached),
+                ("structured", structured, uncached),
+                ("structured-cached", structured, cached),
+            ):
+                services.llm_cache = cache
+                await path()  # ısınma (bağlantı kurulumu)
+                before = len(stub.requests)
+                mean_ms, total_ms = await run(path, args.requests)
+                print(f"{name:<18}{mean_ms:>9.1f}{total_ms:>12.1f}{len(stub.requests) - before:>8}")
+
+        asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
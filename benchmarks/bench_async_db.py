@@ -0,0 +1,196 @@
+"""
+Benchmark: async endpoint içinde senkron Session ("önce") ile AsyncSession ("sonra").
+
+"write" iş yükü `update_ticket_status` ile aynı işi yapar (ticket oku, durumu değiştir,
+yorum ekle, commit); "read" iş yükü ticket'ı yorum sayısıyla birlikte okur. Aynı anda
+event loop gecikmesi ölçülür (5 ms'lik bir uykunun ne kadar geç uyandığı): senkron
+oturum loop'u blokladıkça bu gecikme diğer tüm isteklerin bekleme süresine eklenir.
+
+`--latency-ms` her SQL ifadesine yapay bir gidiş-dönüş süresi ekler (sunucu veritabanı
+veya yavaş disk). Yerel SQLite'ta sorgular mikro saniyeler sürdüğünden 0 ms'de async
+yolun thread geçiş maliyeti baskındır; gecikme arttıkça senkron yol tüm istekleri
+sıraya dizer, async yol ise bekleyen sorguları üst üste bindirir. SQLite yazmaları
+veritabanı kilidinde zaten sıralandığından yazma kazancı esas olarak loop gecikmesindedir.
+
+Örnek çıktı (400 istek, eşzamanlılık 50):
+    yük    gecikme   mod     istek/sn   loop lag p50 (ms)
+    read   2.0       sync       189.4               54.29
+    read   2.0       async      831.1                1.17
+    write  2.0       sync        75.2              136.64
+    write  2.0       async       93.6                0.55
+
+Kullanım:
+    python -m benchmarks.bench_async_db --requests 400 --concurrency 50 --latency-ms 0 2
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base, commit_async, create_async_db_engine, create_db_engine, to_async_url
+from app.models.ticket import Comment, Ticket
+from app.models.user import Department, Role, User
+
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+
+
+def build_app(database_url: str, latency_ms: float, pool_size: int):
+    # Havuz eşzamanlılık kadar büyük olmalı: senkron oturum bağlantısını dependency
+    # teardown'ına kadar tutar; havuz tükenince bloklanan event loop teardown'ı hiç
+    # çalıştıramaz ve süreç kilitlenir (eski yolun üretimdeki asıl riski).
+    engine = create_db_engine(database_url, pool_size=pool_size, max_overflow=0)
+    async_engine = create_async_db_engine(to_async_url(database_url), pool_size=pool_size, max_overflow=0)
+
+    if latency_ms:
+        # SQLite trace callback'i ifadeyi çalıştıran thread'de çağrılır: senkron yolda
+        # event loop'ta, aiosqlite'ta ise sürücünün kendi thread'inde uyur.
+        def _simulate_round_trip(statement):
+            time.sleep(latency_ms / 1000)
+
+        @event.listens_for(engine, "connect")
+        def _sync_connect(dbapi_connection, connection_record):
+            dbapi_connection.set_trace_callback(_simulate_round_trip)
+
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _async_connect(dbapi_connection, connection_record):
+            dbapi_connection.run_async(lambda conn: conn.set_trace_callback(_simulate_round_trip))
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync/{ticket_id}")
+    async def read_sync(ticket_id: int, db: Session = Depends(get_db)):
+        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        comments = db.query(Comment).filter(Comment.ticket_id == ticket_id).count()
+        return {"status": ticket.status, "comments": comments}
+
+    @app.get("/async/{ticket_id}")
+    async def read_async(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
+        ticket = (await db.execute(select(Ticket).where(Ticket.id == ticket_id))).scalars().first()
+        comments = len((await db.execute(select(Comment.id).where(Comment.ticket_id == ticket_id))).all())
+        return {"status": ticket.status, "comments": comments}
+
+    @app.put("/sync/{ticket_id}")
+    async def update_sync(ticket_id: int, db: Session = Depends(get_db)):
+        ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+        new_status = STATUSES[(STATUSES.index(ticket.status) + 1) % len(STATUSES)]
+        ticket.status = new_status
+        db.add(Comment(ticket_id=ticket.id, user_id=ticket.created_by_user_id, content="bench"))
+        # commit sonrası nesneye dokunmuyoruz: expire edilmiş nesne yeni bağlantı alır ve
+        # oturum kapanana kadar tutar; havuz dolduğunda bloklanan event loop kilitlenir
+        db.commit()
+        return {"status": new_status}
+
+    @app.put("/async/{ticket_id}")
+    async def update_async(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
+        ticket = (await db.execute(select(Ticket).where(Ticket.id == ticket_id))).scalars().first()
+        new_status = STATUSES[(STATUSES.index(ticket.status) + 1) % len(STATUSES)]
+        ticket.status = new_status
+        db.add(Comment(ticket_id=ticket.id, user_id=ticket.created_by_user_id, content="bench"))
+        await commit_async(db)
+        return {"status": new_status}
+
+    return app, engine, async_engine
+
+
+def seed(engine, tickets: int):
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        role = Role(name="student")
+        dept = Department(name="Bilgi Islem")
+        db.add_all([role, dept])
+        db.flush()
+        user = User(email="bench@example.com", password_hash="x", role_id=role.id)
+        db.add(user)
+        db.flush()
+        db.add_all([
+            Ticket(title=f"T{i}", description="bench", created_by_user_id=user.id, assigned_department_id=dept.id)
+            for i in range(tickets)
+        ])
+        db.commit()
+
+
+async def run_mode(app, mode: str, workload: str, requests: int, concurrency: int, tickets: int):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop_lags = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i):
+            async with semaphore:
+                method = client.get if workload == "read" else client.put
+                response = await method(f"/{mode}/{i % tickets + 1}")
+                response.raise_for_status()
+
+        async def lag_monitor():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                loop_lags.append((time.perf_counter() - start - 0.005) * 1000)
+
+        lag_task = asyncio.create_task(lag_monitor())
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await lag_task
+
+    return {
+        "mode": mode,
+        "rps": requests / elapsed,
+        "elapsed": elapsed,
+        "lag_p50": statistics.median(loop_lags) if loop_lags else 0.0,
+        "lag_max": max(loop_lags) if loop_lags else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0.0, 2.0])
+    args = parser.parse_args()
+
+    print(f"{args.requests} istek, eşzamanlılık {args.concurrency}")
+    print(f"{'yük':<7}{'gecikme':<10}{'mod':<8}{'istek/sn':>12}{'süre (sn)':>12}{'loop lag p50 (ms)':>19}{'loop lag max (ms)':>19}")
+    for latency_ms in args.latency_ms:
+        with tempfile.TemporaryDirectory() as tmp:
+            database_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+            app, engine, async_engine = build_app(database_url, latency_ms, args.concurrency + 5)
+            seed(engine, args.tickets)
+
+            for workload in ("read", "write"):
+                for mode in ("sync", "async"):
+                    result = asyncio.run(run_mode(app, mode, workload, args.requests, args.concurrency, args.tickets))
+                    print(f"{workload:<7}{latency_ms:<10.1f}{result['mode']:<8}{result['rps']:>12.1f}{result['elapsed']:>12.2f}"
+                          f"{result['lag_p50']:>19.2f}{result['lag_max']:>19.2f}")
+
+            engine.dispose()
+            asyncio.run(async_engine.dispose())
+
+
+if __name__ == "__main__":
+    main()
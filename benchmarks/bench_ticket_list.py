@@ -0,0 +1,102 @@
+"""
+Benchmark: liste sayfasının yorumlarla (`TicketResponse`) ve özet olarak (`TicketSummary`)
+yüklenip JSON'a serileştirilmesi.
+
+Her iki mod da liste endpoint'lerinin yaptığı işi yapar: `loader_options` ile sayfayı
+yükler ve Pydantic modeliyle JSON üretir. "full" modu her ticket'ın tüm yorumlarını
+yükler; "summary" modu yalnızca yorum sayısını ve son yorum zamanını alt sorguyla okur.
+
+Örnek çıktı (500 ticket, ticket başına 20 yorum):
+    mod        sorgu (ms)  json (ms)   boyut (KB)
+    full           107.36      27.11       1392.3
+    summary          4.54       3.88        262.5
+
+Kalan boyutun çoğu ticket açıklamasıdır; yorum ne kadar çoksa fark o kadar büyür.
+
+Kullanım:
+    python -m benchmarks.bench_ticket_list --tickets 500 --comments 20
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app import migrations
+from app.core.loaders import loader_options
+from app.database import create_db_engine
+from app.models.ticket import Comment, Ticket
+from app.models.user import Department, Role, User
+from app.schemas.ticket import TicketResponse, TicketSummary
+
+
+class _FullPage(BaseModel):
+    items: List[TicketResponse]
+
+
+class _SummaryPage(BaseModel):
+    items: List[TicketSummary]
+
+
+def seed(engine, tickets: int, comments: int):
+    with Session(engine) as db:
+        role = Role(name="student")
+        department = Department(name="Bilgi Islem")
+        db.add_all([role, department])
+        db.flush()
+        user = User(email="user@example.com", password_hash="x", role_id=role.id)
+        db.add(user)
+        db.flush()
+        start = datetime(2024, 1, 1)
+        for i in range(tickets):
+            ticket = Ticket(title=f"Ticket {i}", description="Projeksiyon cihazı görüntü vermiyor. " * 3,
+                            status="Open", priority="Medium", created_by_user_id=user.id,
+                            assigned_department_id=department.id, created_at=start + timedelta(minutes=i))
+            db.add(ticket)
+            db.flush()
+            db.add_all([Comment(ticket_id=ticket.id, user_id=user.id, content=f"Kontrol edildi, kablo değiştirildi ({j}).")
+                        for j in range(comments)])
+        db.commit()
+
+
+def measure(engine, schema, page_model, tickets: int, repeat: int):
+    query_ms, json_ms, size = [], [], 0
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            rows = db.query(Ticket).options(*loader_options(schema)).order_by(Ticket.id.desc()).limit(tickets).all()
+            loaded = time.perf_counter()
+            body = page_model(items=[schema.model_validate(row) for row in rows]).model_dump_json()
+            done = time.perf_counter()
+        query_ms.append((loaded - start) * 1000)
+        json_ms.append((done - loaded) * 1000)
+        size = len(body)
+    return statistics.median(query_ms), statistics.median(json_ms), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        migrations.upgrade(engine)
+        seed(engine, args.tickets, args.comments)
+
+        print(f"{'mod':<9}{'sorgu (ms)':>12}{'json (ms)':>11}{'boyut (KB)':>13}")
+        for mode, schema, page_model in (("full", TicketResponse, _FullPage), ("summary", TicketSummary, _SummaryPage)):
+            query_ms, json_ms, size = measure(engine, schema, page_model, args.tickets, args.repeat)
+            print(f"{mode:<9}{query_ms:>12.2f}{json_ms:>11.2f}{size / 1024:>13.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
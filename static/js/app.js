@@ -47,24 +47,26 @@ document.addEventListener("DOMContentLoaded", () => {
 });
 
 // Admin - Filtreleme ile Ticket'ları Yükle
-async function loadAdminTickets(deptFilter = "", statusFilter = "") {
+async function loadAdminTickets(deptFilter = "", statusFilter = "", after = null) {
     try {
         let url = `${API_BASE_URL}/tickets/?`;
         if (deptFilter) url += `department_filter=${deptFilter}&`;
         if (statusFilter) url += `status_filter=${statusFilter}&`;
+        if (after) url += `after=${encodeURIComponent(after)}&`;
         
         const response = await fetch(url, {
             headers: { "Authorization": `Bearer ${authToken}` }
         });
         
         if (response.ok) {
-            const tickets = await response.json();
+            const page = await response.json();
+            const tickets = page.items;
             const container = document.getElementById("admin-tickets-container");
             if (!container) return;
             
-            container.innerHTML = "";
+            if (!after) container.innerHTML = "";
             
-            if (tickets.length === 0) {
+            if (!after && tickets.length === 0) {
                 container.innerHTML = "<p>Filtreleme kriterlerine uygun ticket bulunmamaktadır.</p>";
                 return;
             }
@@ -89,6 +91,8 @@ async function loadAdminTickets(deptFilter = "", statusFilter = "") {
                     document.getElementById("assign-modal").style.display = "block";
                 });
             });
+
+            renderLoadMore(container, page.next_cursor, (cursor) => loadAdminTickets(deptFilter, statusFilter, cursor));
         }
     } catch (error) {
         showMessage("Ticketler yüklenemedi!", "error");
@@ -119,9 +123,41 @@ async function assignTicketToDepartment(ticketId, departmentName) {
 
 const API_BASE_URL = "http://localhost:8000/api/v1";
 let authToken = localStorage.getItem("token");
+let refreshToken = localStorage.getItem("refreshToken");
 let currentUser = localStorage.getItem("currentUser");
 let currentUserRole = localStorage.getItem("userRole");
 
+// Access token kısa ömürlüdür; süresi dolmadan refresh token ile yenilenir
+async function refreshAuthToken() {
+    if (!refreshToken) return;
+    const payload = authToken ? decodeJwt(authToken) : null;
+    if (payload?.exp && payload.exp * 1000 - Date.now() > 5 * 60 * 1000) return;
+    try {
+        const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                // eski access token sunucuda iptal edilir
+                ...(authToken ? { "Authorization": `Bearer ${authToken}` } : {})
+            },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+        if (response.ok) {
+            const data = await response.json();
+            authToken = data.access_token;
+            refreshToken = data.refresh_token;
+            localStorage.setItem("token", authToken);
+            localStorage.setItem("refreshToken", refreshToken);
+        } else if (response.status === 401) {
+            refreshToken = null;
+            localStorage.removeItem("refreshToken");
+        }
+    } catch (e) {
+        console.error("Token yenilenemedi:", e);
+    }
+}
+setInterval(refreshAuthToken, 60 * 1000);
+
 // UI Elements
 const authSection = document.getElementById("auth-section");
 const ticketSection = document.getElementById("ticket-section");
@@ -238,6 +274,8 @@ loginForm.addEventListener("submit", async (e) => {
         if (response.ok) {
             const data = await response.json();
             authToken = data.access_token;
+            refreshToken = data.refresh_token;
+            localStorage.setItem("refreshToken", refreshToken);
             currentUser = username;
             
             // Rol bilgisini al (önce API, olmazsa token payload'ından al)
@@ -317,6 +355,12 @@ const suggestionsDiv = document.getElementById("suggestions");
 const suggestedDepartmentSpan = document.getElementById("suggested-department");
 const suggestedPrioritySpan = document.getElementById("suggested-priority");
 const acceptSuggestionBtn = document.getElementById("accept-suggestion");
+// Sekme kimliği: sunucu öneri isteklerini bununla istemci başına debounce eder
+let suggestClientId = sessionStorage.getItem("suggestClientId");
+if (!suggestClientId) {
+    suggestClientId = window.crypto?.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    sessionStorage.setItem("suggestClientId", suggestClientId);
+}
 
 if (suggestBtn) {
     suggestBtn.addEventListener("click", async () => {
@@ -332,6 +376,7 @@ if (suggestBtn) {
                 method: "POST",
                 headers: {
                     "Content-Type": "application/json",
+                    "X-Client-Id": suggestClientId,
                     // suggestions don't require auth but it's fine to include token
                     ...(authToken ? { "Authorization": `Bearer ${authToken}` } : {})
                 },
@@ -413,6 +458,9 @@ if (suggestBtn) {
                 }
 
                 suggestionsDiv.style.display = "block";
+            } else if (resp.status === 409) {
+                // Daha yeni bir öneri isteği bunun yerine cevaplanacak
+                return;
             } else {
                 const err = await resp.json();
                 showMessage(`Öneri alınamadı: ${err.detail || resp.statusText}`, "error");
@@ -490,10 +538,28 @@ async function loadSupportStaffList() {
     }
 }
 
+// Sayfalı listeler için "Daha Fazla Yükle" butonu (next_cursor varsa)
+function renderLoadMore(container, nextCursor, loadPage) {
+    const existing = container.querySelector(".load-more-btn");
+    if (existing) existing.remove();
+    if (!nextCursor) return;
+
+    const btn = document.createElement("button");
+    btn.type = "button";
+    btn.className = "load-more-btn";
+    btn.textContent = "Daha Fazla Yükle";
+    btn.style.cssText = "margin-top: 10px; padding: 8px 16px; background-color: #6c757d; color: white; border: none; border-radius: 5px; cursor: pointer;";
+    btn.addEventListener("click", () => {
+        btn.disabled = true;
+        loadPage(nextCursor);
+    });
+    container.appendChild(btn);
+}
+
 // Load My Tickets
-async function loadMyTickets() {
+async function loadMyTickets(after = null) {
     // Destek görevlileri yükle
-    await loadSupportStaffList();
+    if (!after) await loadSupportStaffList();
     
     try {
         let endpoint = `${API_BASE_URL}/tickets/my`;
@@ -511,6 +577,8 @@ async function loadMyTickets() {
             containerId = "admin-tickets-container";
         }
 
+        if (after) endpoint += `?after=${encodeURIComponent(after)}`;
+
         const response = await fetch(endpoint, {
             headers: {
                 "Authorization": `Bearer ${authToken}`
@@ -518,13 +586,14 @@ async function loadMyTickets() {
         });
 
         if (response.ok) {
-            const tickets = await response.json();
+            const page = await response.json();
+            const tickets = page.items;
             const container = document.getElementById(containerId);
             if (!container) return;
             
-            container.innerHTML = "";
+            if (!after) container.innerHTML = "";
 
-            if (tickets.length === 0) {
+            if (!after && tickets.length === 0) {
                 container.innerHTML = "<p>Ticket bulunmamaktadır.</p>";
                 return;
             }
@@ -739,6 +808,8 @@ async function loadMyTickets() {
                 const commentForm = ticketDiv.querySelector(".comment-form");
                 commentForm.addEventListener("submit", (e) => addComment(e, ticket.id));
             });
+
+            renderLoadMore(container, page.next_cursor, (cursor) => loadMyTickets(cursor));
         } else {
             showMessage("Ticketler yüklenemedi!", "error");
         }
@@ -841,6 +912,19 @@ async function updateTicketStatus(ticketId, newStatus, resolutionNote = null) {
 
 // Logout
 logoutButton.addEventListener("click", () => {
+    if (refreshToken) {
+        fetch(`${API_BASE_URL}/auth/logout`, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                // eski access token sunucuda iptal edilir
+                ...(authToken ? { "Authorization": `Bearer ${authToken}` } : {})
+            },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        }).catch((e) => console.error(e));
+    }
+    refreshToken = null;
+    localStorage.removeItem("refreshToken");
     localStorage.removeItem("token");
     localStorage.removeItem("currentUser");
     localStorage.removeItem("userRole");
@@ -3,38 +3,69 @@ Test configuration and fixtures
 """
 import pytest
 import os
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker, Session
-from app.database import Base, get_db
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app import migrations
+from app.database import get_db, get_async_db, create_db_engine, to_async_url
 from app.main import app
+from app.core.auth import get_read_db
 from fastapi.testclient import TestClient
 from app.models.user import User, Role, Department
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, create_access_token
+from app.core.principals import principal_cache
+from app.core.throttle import login_throttle
+from app.core.security import token_cache
+from app.core.revocation import revocation_list
+from app.core.triage import triage_classifier
+from app.core.rules import rule_engine
 
-# Use in-memory SQLite database for tests
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+@pytest.fixture(scope="function")
+def database_url(tmp_path):
+    """Per-test SQLite file, so the sync and the async (aiosqlite) sessions see the same data"""
+    return f"sqlite:///{tmp_path / 'test.db'}"
 
 
 @pytest.fixture(scope="function")
-def db():
+def db(database_url):
     """Create a fresh database for each test"""
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-    )
+    engine = create_db_engine(database_url)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
+    # Migration'lar modellerle aynı şemayı ve ek olarak FTS tablosu/trigger'larını kurar
+    migrations.upgrade(engine)
     
+    # Her testin veritabanı id'leri 1'den başlar; önceki testin kullanıcıları önbellekte kalmasın
+    principal_cache.clear()
+    login_throttle.store.clear()
+    token_cache.clear()
+    revocation_list.clear()
+    triage_classifier.reset()
+    rule_engine.reset()
     db = TestingSessionLocal()
     yield db
     db.close()
+    engine.dispose()
 
 @pytest.fixture(scope="function")
-def client(db: Session):
-    """Create a test client with dependency override"""
+def client(db: Session, database_url):
+    """Create a test client with dependency overrides for the sync and async sessions"""
+    # NullPool: TestClient may run each request on a different event loop
+    async_engine = create_async_engine(to_async_url(database_url), poolclass=NullPool)
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
     def override_get_db():
         yield db
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
     yield TestClient(app)
     app.dependency_overrides.clear()
 
@@ -130,3 +161,31 @@ def support_auth_headers(client: TestClient, test_support_user: User):
         token = response.json().get("access_token")
         return {"Authorization": f"Bearer {token}"}
     return {}
+
+
+@pytest.fixture(scope="function")
+def make_auth_headers():
+    """Build authorization headers for a user directly from a signed token"""
+    def _make(user: User):
+        token = create_access_token(data={"sub": user.email, "role": user.role.name, "uid": user.id})
+        return {"Authorization": f"Bearer {token}"}
+    return _make
+
+
+@pytest.fixture(scope="function")
+def count_queries(db: Session):
+    """Context manager that counts SQL statements executed on the test engine"""
+    @contextmanager
+    def _count():
+        statements = []
+
+        def _before_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _before_execute)
+    return _count
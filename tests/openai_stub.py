@@ -0,0 +1,96 @@
+"""
+Local stand-in for the OpenAI chat completions API, used by tests and benchmarks.
+
+Serves POST /v1/chat/completions on 127.0.0.1 from a background thread. Replies come from
+`responder(request_json) -> str` and every request is recorded, so callers can assert on
+prompts and call counts. `delay` simulates model latency (each request sleeps in its own
+thread, so concurrent calls overlap like they would against the real API).
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_responder(request: dict) -> str:
+    """Answers each prompt the way the real model is asked to."""
+    prompt = request["messages"][-1]["content"]
+    if request.get("response_format", {}).get("type") == "json_object":
+        return json.dumps({
+            "department_options": ["Bilgi Islem"],
+            "priority_options": ["High", "Medium"],
+            "suggested_title": "İnternet bağlantısı yok",
+            "explanation": "Ağ erişimi sorunu.",
+        })
+    if "departmanlar" in prompt:
+        return "Bilgi Islem"
+    if "önceliği" in prompt:
+        return "High"
+    return "Stub cevabı."
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 128  # bursts of concurrent clients must not hit connection resets
+
+
+class OpenAIStub:
+    def __init__(self, responder=default_responder, delay: float = 0.0):
+        self.responder = responder
+        self.delay = delay
+        self.requests = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests.append(body)
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    content = stub.responder(body)
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+                payload = json.dumps({
+                    "id": f"chatcmpl-stub-{len(stub.requests)}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
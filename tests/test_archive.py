@@ -0,0 +1,79 @@
+"""
+Tests for archiving long-closed tickets out of the live tables
+"""
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.archive import archive_closed_tickets
+from app.core.stats import load_ticket_stats
+from app.models.ticket import Ticket, Comment, TicketArchive, CommentArchive
+from app.models.user import User, Department
+
+
+class TestTicketArchive:
+    """Closed tickets move to the archive in batches and stay readable and searchable"""
+
+    def _seed(self, db: Session, creator: User):
+        dept = db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        now = datetime.utcnow()
+        tickets = []
+        for i, (status, closed_days_ago) in enumerate([("Closed", 200), ("Closed", 120), ("Closed", 100),
+                                                       ("Closed", 10), ("Resolved", None), ("Open", None)]):
+            ticket = Ticket(title=f"Yazıcı arızası {i}", description="Toner bitti", status=status, priority="Low",
+                            created_by_user_id=creator.id, assigned_department_id=dept.id)
+            db.add(ticket)
+            db.flush()
+            if closed_days_ago:
+                ticket.closed_at = now - timedelta(days=closed_days_ago)
+            db.add(Comment(ticket_id=ticket.id, user_id=creator.id, content=f"Kâğıt sıkıştı {i}"))
+            tickets.append(ticket)
+        db.commit()
+        return [t.id for t in tickets]
+
+    def test_status_change_sets_closed_at(self, setup_test_db: Session, test_user: User):
+        ticket = Ticket(title="a", description="b", status="Open", created_by_user_id=test_user.id)
+        assert ticket.closed_at is None
+        ticket.status = "Closed"
+        assert ticket.closed_at is not None
+        ticket.status = "Open"
+        assert ticket.closed_at is None
+
+    def test_archives_only_expired_closed_tickets_in_batches(self, setup_test_db: Session, test_user: User):
+        ids = self._seed(setup_test_db, test_user)
+        engine = setup_test_db.get_bind()
+
+        moved = archive_closed_tickets(engine, older_than_days=90, batch_size=2)
+
+        assert moved == 3
+        setup_test_db.expire_all()
+        archived_ids = set(ids[:3])
+        assert {t.id for t in setup_test_db.query(TicketArchive)} == archived_ids
+        assert {c.ticket_id for c in setup_test_db.query(CommentArchive)} == archived_ids
+        assert {t.id for t in setup_test_db.query(Ticket)} == set(ids[3:])
+        assert setup_test_db.query(Comment).filter(Comment.ticket_id.in_(archived_ids)).count() == 0
+        # Sayaçlar ve canlı arama indeksi yalnızca canlı tabloyu yansıtır
+        assert load_ticket_stats(setup_test_db)["total"] == 3
+        assert setup_test_db.execute(text("SELECT count(*) FROM ticket_search")).scalar() == 6
+        assert setup_test_db.execute(text("SELECT count(*) FROM ticket_archive_search")).scalar() == 6
+        # ikinci çalıştırma taşıyacak bir şey bulmaz
+        assert archive_closed_tickets(engine, older_than_days=90) == 0
+
+    def test_archived_ticket_lookup_and_search(self, client: TestClient, setup_test_db: Session, test_user: User, test_support_user: User, make_auth_headers):
+        ids = self._seed(setup_test_db, test_user)
+        archive_closed_tickets(setup_test_db.get_bind(), older_than_days=90)
+        headers = make_auth_headers(test_user)
+
+        response = client.get(f"/api/v1/tickets/archive/{ids[0]}", headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "Closed"
+        assert [c["content"] for c in body["comments"]] == ["Kâğıt sıkıştı 0"]
+        assert client.get(f"/api/v1/tickets/archive/{ids[0]}", headers=make_auth_headers(test_support_user)).status_code == 403
+        assert client.get(f"/api/v1/tickets/archive/{ids[4]}", headers=headers).status_code == 404
+
+        live = client.get("/api/v1/tickets/search", params={"q": "kagit"}, headers=headers).json()["items"]
+        assert {i["ticket_id"] for i in live} == set(ids[3:])
+        both = client.get("/api/v1/tickets/search", params={"q": "kagit", "include_archived": True}, headers=headers).json()["items"]
+        assert {i["ticket_id"] for i in both} == set(ids)
+        assert {i["ticket_id"] for i in both if i["archived"]} == set(ids[:3])
@@ -0,0 +1,172 @@
+"""
+Tests for /suggest request coalescing and per-client debounce
+"""
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core import services
+from app.core.coalesce import Debouncer, SingleFlight, Superseded, suggest_debouncer
+from app.core.llm_cache import LLMCache
+from app.main import app
+from tests.openai_stub import OpenAIStub
+
+
+class TestSingleFlight:
+    """Concurrent calls with the same key share one computation"""
+
+    def test_same_key_runs_once(self):
+        flight, calls = SingleFlight(), []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "sonuç"
+
+        async def _run():
+            return await asyncio.gather(*(flight.do("a", work) for _ in range(5)), flight.do("b", work))
+
+        assert asyncio.run(_run()) == ["sonuç"] * 6
+        assert len(calls) == 2
+        assert flight.stats()["shared"] == 4 and flight.stats()["in_flight"] == 0
+
+    def test_cancelling_every_waiter_cancels_work(self):
+        flight, finished = SingleFlight(), []
+
+        async def work():
+            await asyncio.sleep(0.2)
+            finished.append(1)
+
+        async def _run():
+            waiters = [asyncio.ensure_future(flight.do("a", work)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            waiters[0].cancel()
+            await asyncio.sleep(0.01)
+            # bir bekleyen kaldıkça iş sürer
+            assert flight.stats()["cancelled"] == 0
+            waiters[1].cancel()
+            await asyncio.sleep(0.3)
+
+        asyncio.run(_run())
+        assert finished == [] and flight.stats()["cancelled"] == 1
+
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("model hatası")
+
+        async def _run():
+            return await asyncio.gather(flight.do("a", work), flight.do("a", work), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in asyncio.run(_run()))
+
+
+class TestDebouncer:
+    """Only the last request inside the window goes through; lone requests are not delayed"""
+
+    def test_superseded_requests_rejected(self):
+        debouncer = Debouncer(window_seconds=0.05)
+
+        async def work():
+            await asyncio.sleep(0.03)
+            return "sonuç"
+
+        async def _run():
+            async def delayed(key, delay):
+                await asyncio.sleep(delay)
+                return await debouncer.run(key, work)
+            return await asyncio.gather(delayed("a", 0), delayed("a", 0.01), delayed("a", 0.02), delayed("b", 0),
+                                        return_exceptions=True)
+
+        results = asyncio.run(_run())
+
+        # ilki çalışırken, ikincisi beklerken kesildi
+        assert [type(r) for r in results[:2]] == [Superseded, Superseded]
+        assert results[2:] == ["sonuç", "sonuç"]
+        assert debouncer.stats()["pending_clients"] == 0
+        assert debouncer.stats()["immediate"] == 2 and debouncer.stats()["passed"] == 1
+
+    def test_lone_request_runs_immediately(self):
+        debouncer = Debouncer(window_seconds=1.0)
+
+        async def work():
+            return "sonuç"
+
+        async def _run():
+            start = time.perf_counter()
+            result = await debouncer.run("a", work)
+            return result, time.perf_counter() - start
+
+        result, elapsed = asyncio.run(_run())
+
+        assert result == "sonuç" and elapsed < 0.1
+
+    def test_disabled_or_unknown_client(self):
+        async def work():
+            return "sonuç"
+
+        assert asyncio.run(Debouncer(window_seconds=0).run("a", work)) == "sonuç"
+        assert asyncio.run(Debouncer(window_seconds=1.0).run(None, work)) == "sonuç"
+
+
+class TestSuggestEndpoint:
+    """Bursts against /suggest reach the model once"""
+
+    @pytest.fixture
+    def stub(self, monkeypatch):
+        with OpenAIStub(delay=0.2) as server:
+            monkeypatch.setattr(services, "openai_client", services.create_openai_client("test-key", server.base_url))
+            monkeypatch.setattr(services, "llm_cache", LLMCache(maxsize=100, ttl=0))
+            yield server
+
+    def _burst(self, requests):
+        async def _run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                async def send(body, headers, delay):
+                    await asyncio.sleep(delay)
+                    return await http.post("/api/v1/tickets/suggest", json=body, headers=headers)
+                return await asyncio.gather(*(send(*r) for r in requests))
+        return asyncio.run(_run())
+
+    def test_identical_requests_coalesced(self, client: TestClient, setup_test_db: Session, stub):
+        # farklı istemciler, boşluk ve büyük/küçük harf farkıyla aynı metin
+        bodies = [{"title": "İnternet", "description": "Wifi  çöktü"}, {"title": "internet", "description": "wifi çöktü"}]
+        responses = self._burst([(bodies[i % 2], {"X-Client-Id": f"sekme-{i}"}, 0) for i in range(8)])
+
+        assert [r.status_code for r in responses] == [200] * 8
+        assert len({r.json()["explanation"] for r in responses}) == 1
+        assert len(stub.requests) == 1
+
+    def test_typing_burst_debounced(self, client: TestClient, setup_test_db: Session, stub, monkeypatch):
+        monkeypatch.setattr(suggest_debouncer, "window_seconds", 0.1)
+        typed = ["Wi", "Wifi ç", "Wifi çöktü"]
+
+        responses = self._burst([({"title": "", "description": text}, {"X-Client-Id": "sekme"}, i * 0.02)
+                                 for i, text in enumerate(typed)])
+
+        assert [r.status_code for r in responses] == [409, 409, 200]
+        # ilk istek beklemeden modele gitti, sonra kesildi; ortadaki modele hiç ulaşmadı
+        prompts = [r["messages"][-1]["content"] for r in stub.requests]
+        assert len(prompts) == 2
+        assert "Wi" in prompts[0] and "Wifi çöktü" in prompts[1]
+
+    def test_clients_sharing_ip_and_agent_not_debounced(self, client: TestClient, setup_test_db: Session, stub,
+                                                        monkeypatch):
+        monkeypatch.setattr(suggest_debouncer, "window_seconds", 0.1)
+        # aynı NAT ve tarayıcı arkasındaki iki öğrenci; biri sekme kimliği göndermiyor
+        agent = {"User-Agent": "tarayici"}
+        requests = [
+            ({"title": "", "description": "Wifi çöktü"}, {**agent, "X-Client-Id": "sekme-1"}, 0),
+            ({"title": "", "description": "Kalorifer yanmıyor"}, {**agent, "X-Client-Id": "sekme-2"}, 0.02),
+            ({"title": "", "description": "Transkript lazım"}, agent, 0.04),
+        ]
+
+        responses = self._burst(requests)
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert len(stub.requests) == 3
@@ -0,0 +1,109 @@
+"""
+Tests for the database engine factory
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core import auth
+from app.core.auth import get_read_db
+from app.database import ReadRouter, create_db_engine
+from app.core.config import settings
+from app.models.ticket import Ticket
+from app.models.user import User, Department
+
+
+class TestEngineFactory:
+    """SQLite connections get the tuned pragmas on every new connection"""
+
+    def test_sqlite_pragmas_applied(self, tmp_path):
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+            # NORMAL == 1
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -settings.SQLITE_CACHE_SIZE_KB
+        engine.dispose()
+
+    def test_concurrent_reader_does_not_block_writer(self, tmp_path):
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)"))
+            conn.execute(text("INSERT INTO t (v) VALUES ('a')"))
+
+        reader = engine.raw_connection()
+        cursor = reader.cursor()
+        cursor.execute("BEGIN")
+        assert cursor.execute("SELECT count(*) FROM t").fetchone()[0] == 1
+
+        # With WAL the writer commits while the reader still holds its snapshot
+        with engine.begin() as writer:
+            writer.execute(text("INSERT INTO t (v) VALUES ('b')"))
+        assert cursor.execute("SELECT count(*) FROM t").fetchone()[0] == 1
+
+        cursor.execute("ROLLBACK")
+        cursor.close()
+        reader.close()
+        engine.dispose()
+
+
+class TestReadRouting:
+    """Read-only endpoints use the replica, except right after the user's own write"""
+
+    def _router(self, db: Session, tmp_path, monkeypatch, window_seconds=60.0):
+        dept = db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        users = db.query(User).all()
+        for user in users:
+            db.add(Ticket(title="Eski", description="replikada var", created_by_user_id=user.id,
+                          assigned_department_id=dept.id))
+        db.commit()
+        # Replika: bu andaki kopya; sonraki yazmalar yalnızca birincile gider
+        replica = tmp_path / "replica.db"
+        db.execute(text(f"VACUUM INTO '{replica}'"))
+        for user in users:
+            db.add(Ticket(title="Yeni", description="yalnızca birincilde", created_by_user_id=user.id,
+                          assigned_department_id=dept.id))
+        db.commit()
+
+        router = ReadRouter(db.get_bind(), [f"sqlite:///{replica}"], window_seconds=window_seconds)
+        monkeypatch.setattr(auth, "read_router", router)
+        return router
+
+    def test_reads_replica_until_own_write(self, client: TestClient, setup_test_db: Session, test_user: User, test_support_user: User, make_auth_headers, tmp_path, monkeypatch):
+        router = self._router(setup_test_db, tmp_path, monkeypatch)
+        client.app.dependency_overrides.pop(get_read_db)
+        headers = make_auth_headers(test_user)
+
+        assert [t["title"] for t in client.get("/api/v1/tickets/my", headers=headers).json()["items"]] == ["Eski"]
+
+        ticket_id = setup_test_db.query(Ticket.id).filter(Ticket.created_by_user_id == test_user.id).first()[0]
+        response = client.post(f"/api/v1/tickets/{ticket_id}/comment", json={"content": "merhaba"}, headers=headers)
+        assert response.status_code == 201
+        assert router.wrote_recently(test_user.email)
+        titles = [t["title"] for t in client.get("/api/v1/tickets/my", headers=headers).json()["items"]]
+        assert sorted(titles) == ["Eski", "Yeni"]
+
+        # Yazmayan kullanıcı replikadan okumaya devam eder
+        assert not router.wrote_recently(test_support_user.email)
+        assert client.get("/api/v1/auth/me", headers=make_auth_headers(test_support_user)).status_code == 200
+        router.replicas[0].dispose()
+
+    def test_window_expires(self, setup_test_db: Session, tmp_path, monkeypatch):
+        router = self._router(setup_test_db, tmp_path, monkeypatch, window_seconds=0)
+        router.mark_write("a@example.com")
+        assert not router.wrote_recently("a@example.com")
+        db = router.session("a@example.com")
+        assert db.get_bind() is router.replicas[0]
+        db.close()
+        router.replicas[0].dispose()
+
+    def test_unreachable_replica_falls_back_to_primary(self, setup_test_db: Session, tmp_path):
+        primary = setup_test_db.get_bind()
+        router = ReadRouter(primary, [f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+
+        db = router.session()
+        assert db.get_bind() is primary
+        assert db.query(Department).count() == 4
+        db.close()
+        # Devre dışı bırakılan replika yeniden denenmez
+        assert router._replica() is None
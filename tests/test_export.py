@@ -0,0 +1,91 @@
+"""
+Tests for the streaming ticket export
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core import export
+from app.models.ticket import Ticket, Comment
+from app.models.user import User, Role, Department
+
+
+class TestTicketExport:
+    """CSV/NDJSON export streams every matching ticket with its comments"""
+
+    def _seed(self, db: Session, creator: User):
+        own = db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        other = db.query(Department).filter(Department.name == "Yapi Isleri").first()
+        tickets = [
+            Ticket(title="Ağ, kablo", description='Satır 1\n"tırnak"', status="Open", priority="High",
+                   created_by_user_id=creator.id, assigned_department_id=own.id, created_at=datetime(2024, 1, 10)),
+            Ticket(title="Klima", description="Sıcak", status="Closed", priority="Low",
+                   created_by_user_id=creator.id, assigned_department_id=other.id, created_at=datetime(2024, 2, 10)),
+            Ticket(title="Projektör", description="Görüntü yok", status="Open", priority="Medium",
+                   created_by_user_id=creator.id, assigned_department_id=own.id, created_at=datetime(2024, 3, 10)),
+        ]
+        db.add_all(tickets)
+        db.flush()
+        db.add_all([
+            Comment(ticket_id=tickets[0].id, user_id=creator.id, content="ilk"),
+            Comment(ticket_id=tickets[2].id, user_id=creator.id, content="üçüncü-1"),
+            Comment(ticket_id=tickets[0].id, user_id=creator.id, content="ikinci"),
+            Comment(ticket_id=tickets[2].id, user_id=creator.id, content="üçüncü-2"),
+        ])
+        db.commit()
+        return [t.id for t in tickets]
+
+    def _admin_headers(self, db: Session, make_auth_headers):
+        admin = User(email="admin@example.com", password_hash="x",
+                     role_id=db.query(Role).filter(Role.name == "admin").first().id)
+        db.add(admin)
+        db.commit()
+        return make_auth_headers(admin)
+
+    def test_ndjson_nests_comments_in_order(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        ids = self._seed(setup_test_db, test_user)
+
+        response = client.get("/api/v1/tickets/export", params={"format": "ndjson"},
+                              headers=self._admin_headers(setup_test_db, make_auth_headers))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["id"] for r in records] == ids
+        assert [c["content"] for c in records[0]["comments"]] == ["ilk", "ikinci"]
+        assert records[1]["comments"] == []
+        assert [c["content"] for c in records[2]["comments"]] == ["üçüncü-1", "üçüncü-2"]
+        assert records[0]["department"] == "Bilgi Islem"
+        assert records[0]["created_by"] == test_user.email
+
+    def test_csv_filters_and_department_scope(self, client: TestClient, setup_test_db: Session, test_user: User, test_department_user: User, make_auth_headers):
+        ids = self._seed(setup_test_db, test_user)
+
+        response = client.get("/api/v1/tickets/export", params={
+            "format": "csv", "created_from": "2024-01-01T00:00:00", "created_to": "2024-03-01T00:00:00",
+        }, headers=make_auth_headers(test_department_user))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        # departman yöneticisi yalnızca kendi departmanını, tarih aralığında
+        assert [int(r["id"]) for r in rows] == [ids[0]]
+        assert rows[0]["description"] == 'Satır 1\n"tırnak"'
+        assert rows[0]["comment_count"] == "2"
+
+        response = client.get("/api/v1/tickets/export", params={"format": "csv", "status_filter": "Closed"},
+                              headers=make_auth_headers(test_department_user))
+        assert list(csv.DictReader(io.StringIO(response.text))) == []
+        assert client.get("/api/v1/tickets/export", headers=make_auth_headers(test_user)).status_code == 403
+
+    def test_export_is_lazy_and_chunked(self, setup_test_db: Session, test_user: User, monkeypatch):
+        self._seed(setup_test_db, test_user)
+        monkeypatch.setattr(export, "CHUNK_SIZE", 1)
+        monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 1)
+
+        stream = export.export_tickets(setup_test_db.get_bind(), [], "csv")
+        assert next(stream).startswith("id,title,")
+        chunks = list(stream)
+        assert len(chunks) == 3
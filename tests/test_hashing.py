@@ -0,0 +1,112 @@
+"""
+Tests for the bcrypt process pool
+"""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.hashing import PasswordHasher
+from app.core.security import get_password_hash, password_hash_rounds, verify_password
+from app.models.user import User, Role
+
+
+class TestPasswordHasher:
+    """Hashing runs on a bounded process pool and rejects work when the queue is full"""
+
+    def test_hash_and_verify_in_pool(self, monkeypatch):
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+        hasher = PasswordHasher(workers=1, max_queue=4)
+
+        async def _run():
+            hashed = await hasher.hash("gizli123")
+            return hashed, await hasher.verify("gizli123", hashed), await hasher.verify("yanlis", hashed)
+
+        try:
+            hashed, ok, wrong = asyncio.run(_run())
+        finally:
+            hasher.shutdown()
+        assert password_hash_rounds(hashed) == 4
+        assert ok and not wrong
+        stats = hasher.stats()
+        assert stats["completed"] == 3 and stats["in_flight"] == 0 and stats["latency_ms_p50"] > 0
+
+    def test_full_queue_fails_fast(self):
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        hashed = get_password_hash("gizli123", rounds=10)
+
+        async def _run():
+            return await asyncio.gather(*(hasher.verify("gizli123", hashed) for _ in range(3)), return_exceptions=True)
+
+        try:
+            results = asyncio.run(_run())
+        finally:
+            hasher.shutdown()
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert len(rejected) == 1 and rejected[0].status_code == 503
+        assert results.count(True) == 2
+        assert hasher.stats()["rejected"] == 1
+
+    def test_cancelled_caller_keeps_slot_until_job_finishes(self):
+        hasher = PasswordHasher(workers=1, max_queue=0)
+        hashed = get_password_hash("gizli123", rounds=12)
+
+        async def _run():
+            # havuz süreci önceden başlasın; ölçülen iş hemen çalışsın
+            await hasher.verify("gizli123", get_password_hash("x", rounds=4))
+            caller = asyncio.ensure_future(hasher.verify("gizli123", hashed))
+            await asyncio.sleep(0.05)
+            caller.cancel()
+            await asyncio.sleep(0)
+            # havuzdaki iş sürüyor: yeni istek hâlâ sınıra takılır
+            with pytest.raises(HTTPException):
+                await hasher.verify("gizli123", hashed)
+            while hasher.stats()["in_flight"]:
+                await asyncio.sleep(0.01)
+            return await hasher.verify("gizli123", hashed)
+
+        try:
+            assert asyncio.run(_run()) is True
+        finally:
+            hasher.shutdown()
+        stats = hasher.stats()
+        assert stats["rejected"] == 1 and stats["in_flight"] == 0 and stats["completed"] == 3
+
+    def test_failures_not_counted_as_completed(self):
+        hasher = PasswordHasher(workers=1, max_queue=1)
+
+        async def _run():
+            return await hasher.hash(None)
+
+        try:
+            with pytest.raises(AttributeError):
+                asyncio.run(_run())
+        finally:
+            hasher.shutdown()
+        stats = hasher.stats()
+        assert stats["failed"] == 1 and stats["completed"] == 0 and stats["latency_ms_p50"] is None
+
+    def test_login_rehashes_on_cost_change(self, client: TestClient, setup_test_db: Session, monkeypatch):
+        user = User(email="eski@example.com", password_hash=get_password_hash("gizli123", rounds=4),
+                    role_id=setup_test_db.query(Role).filter(Role.name == "student").first().id)
+        setup_test_db.add(user)
+        setup_test_db.commit()
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+
+        response = client.post("/api/v1/auth/login", json={"username": "eski@example.com", "password": "gizli123"})
+
+        assert response.status_code == 200
+        setup_test_db.expire_all()
+        assert password_hash_rounds(user.password_hash) == 5
+        assert verify_password("gizli123", user.password_hash)
+
+    @pytest.mark.parametrize("password,status_code", [("gizli123", 200), ("yanlis", 401)])
+    def test_login(self, client: TestClient, setup_test_db: Session, password, status_code):
+        setup_test_db.add(User(email="giris@example.com", password_hash=get_password_hash("gizli123", rounds=4),
+                               role_id=setup_test_db.query(Role).filter(Role.name == "student").first().id))
+        setup_test_db.commit()
+
+        response = client.post("/api/v1/auth/login", json={"username": "giris@example.com", "password": password})
+
+        assert response.status_code == status_code
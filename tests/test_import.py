@@ -0,0 +1,92 @@
+"""
+Tests for the bulk ticket import (API and core)
+"""
+import io
+import json
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.importer import import_tickets, read_records
+from app.core.stats import load_ticket_stats
+from app.models.ticket import Ticket, Comment
+from app.models.user import User, Role, Department
+
+
+class TestTicketImport:
+    """Rows are inserted in chunks with bulk reference resolution and per-row errors"""
+
+    def _admin(self, db: Session):
+        admin = User(email="admin@example.com", password_hash="x",
+                     role_id=db.query(Role).filter(Role.name == "admin").first().id)
+        db.add(admin)
+        db.commit()
+        return admin
+
+    def test_ndjson_upload_reports_row_errors(self, client: TestClient, setup_test_db: Session, test_user: User, test_support_user: User, make_auth_headers):
+        lines = [
+            {"title": "Eski yazıcı", "description": "Toner", "department": "Bilgi Islem", "priority": "High",
+             "status": "Closed", "created_by": test_user.email, "assigned_support": test_support_user.email,
+             "created_at": "2021-03-01T10:00:00Z", "updated_at": "2021-03-02T10:00:00+03:00",
+             "comments": [{"user": test_support_user.email, "content": "Değiştirildi", "created_at": "2021-03-02T09:00:00"},
+                          {"content": "Teşekkürler"}]},
+            {"description": "Başlıksız", "department": "Yapi Isleri", "created_by": test_user.email},
+            {"description": "x", "department": "Yok Boyle", "created_by": test_user.email},
+            {"description": "x", "department": "Bilgi Islem", "created_by": "kimse@example.com"},
+            {"description": "x", "department": "Bilgi Islem", "created_by": test_user.email, "priority": "Urgent"},
+        ]
+        body = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines) + "\n{bozuk\n"
+
+        response = client.post("/api/v1/tickets/import",
+                               files={"file": ("eski.ndjson", body.encode("utf-8"), "application/x-ndjson")},
+                               headers=make_auth_headers(self._admin(setup_test_db)))
+
+        assert response.status_code == 200
+        report = response.json()
+        assert (report["imported"], report["comments"], report["error_count"]) == (2, 2, 4)
+        assert [e["row"] for e in report["errors"]] == [3, 4, 5, 6]
+        assert "Yok Boyle" in report["errors"][0]["error"]
+
+        first = setup_test_db.query(Ticket).filter(Ticket.title == "Eski yazıcı").one()
+        assert (first.priority_rank, first.assigned_support_id) == (1, test_support_user.id)
+        assert first.updated_at.isoformat() == "2021-03-02T07:00:00"
+        assert first.closed_at == first.updated_at
+        comments = setup_test_db.query(Comment).filter(Comment.ticket_id == first.id).order_by(Comment.id).all()
+        assert [(c.user_id, c.content) for c in comments] == [(test_support_user.id, "Değiştirildi"), (test_user.id, "Teşekkürler")]
+        assert setup_test_db.query(Ticket).filter(Ticket.title == "Başlıksız").count() == 1
+        # sayaçlar ve arama indeksi de güncel
+        assert load_ticket_stats(setup_test_db)["by_status"] == {"Closed": 1, "Open": 1}
+        admin_headers = make_auth_headers(setup_test_db.query(User).filter(User.email == "admin@example.com").one())
+        hits = client.get("/api/v1/tickets/search", params={"q": "değiştirildi"}, headers=admin_headers).json()["items"]
+        assert [h["ticket_id"] for h in hits] == [first.id]
+
+    def test_csv_import_in_chunks(self, setup_test_db: Session, test_user: User):
+        rows = ["title,description,department,priority,status,created_by"]
+        rows += [f"T{i},Açıklama {i},Bilgi Islem,Medium,Open,{test_user.email}" for i in range(7)]
+        rows.append(f'"Çok, satırlı","ilk\nikinci",Bilgi Islem,Low,Geçersiz,{test_user.email}')
+        stream = io.StringIO("\n".join(rows) + "\n", newline="")
+
+        report = import_tickets(setup_test_db.get_bind(), read_records(stream, "csv"), chunk_size=3)
+
+        assert (report.imported, report.error_count) == (7, 1)
+        assert report.errors[0]["error"] == "Geçersiz durum: Geçersiz"
+        assert setup_test_db.query(Ticket).count() == 7
+
+    def test_enrichment_only_when_requested(self, setup_test_db: Session, test_user: User):
+        record = json.dumps({"description": "İnternet yok", "created_by": test_user.email})
+        suggestion = {"department_options": ["Bilgi Islem"], "priority_options": ["High"], "suggested_title": "Ağ sorunu"}
+
+        with patch("app.core.services.suggest_ticket", new=AsyncMock(return_value=suggestion)) as mock_suggest:
+            plain = import_tickets(setup_test_db.get_bind(), read_records(io.StringIO(record), "ndjson"))
+            enriched = import_tickets(setup_test_db.get_bind(), read_records(io.StringIO(record), "ndjson"), enrich=True)
+
+        assert (plain.imported, plain.error_count) == (0, 1)
+        assert (enriched.imported, enriched.error_count) == (1, 0)
+        assert mock_suggest.await_count == 1
+        ticket = setup_test_db.query(Ticket).one()
+        dept = setup_test_db.query(Department).filter(Department.name == "Bilgi Islem").one()
+        assert (ticket.title, ticket.priority, ticket.assigned_department_id) == ("Ağ sorunu", "High", dept.id)
+
+    def test_import_requires_admin(self, client: TestClient, setup_test_db: Session, test_department_user: User, make_auth_headers):
+        response = client.post("/api/v1/tickets/import", files={"file": ("a.ndjson", b"{}", "application/x-ndjson")},
+                               headers=make_auth_headers(test_department_user))
+        assert response.status_code == 403
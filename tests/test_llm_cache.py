@@ -0,0 +1,106 @@
+"""
+Tests for the content-addressed LLM response cache
+"""
+import asyncio
+import threading
+import time
+import pytest
+from app.core import services
+from app.core.llm_cache import LLMCache, SqliteLLMStore, cache_key
+from tests.openai_stub import OpenAIStub
+
+PARAMS = {"model": "gpt-3.5-turbo", "max_tokens": 80, "temperature": 0.2}
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    with OpenAIStub() as server:
+        monkeypatch.setattr(services, "openai_client", services.create_openai_client("test-key", server.base_url))
+        monkeypatch.setattr(services, "llm_cache", LLMCache(100, 60, SqliteLLMStore(str(tmp_path / "llm.db"), 100)))
+        yield server
+
+
+class TestLLMCache:
+    """Responses are keyed on normalized prompt + model parameters"""
+
+    def test_key_ignores_whitespace_but_not_params(self):
+        assert cache_key("Başlık:  A\n\nAçıklama: b ", PARAMS) == cache_key("Başlık: A Açıklama: b", PARAMS)
+        assert cache_key("A", PARAMS) != cache_key("a", PARAMS)
+        assert cache_key("A", PARAMS) != cache_key("A", {**PARAMS, "temperature": 0.3})
+        assert cache_key("A", PARAMS) != cache_key("A", {**PARAMS, "model": "gpt-4o-mini"})
+
+    def test_lru_bound_and_ttl(self, monkeypatch):
+        cache = LLMCache(maxsize=2, ttl=10)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("b") is None and cache.get("a") == "1"
+        assert cache.evictions == 1
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 11)
+        assert cache.get("a") is None
+
+    def test_persists_across_restarts(self, tmp_path):
+        path = str(tmp_path / "llm.db")
+        LLMCache(10, 60, SqliteLLMStore(path, 100)).put("k", "cevap")
+
+        restarted = LLMCache(10, 60, SqliteLLMStore(path, 100))
+
+        assert restarted.get("k") == "cevap"
+        assert restarted.get("k") == "cevap"
+        assert restarted.stats()["store_hits"] == 1 and restarted.stats()["memory_hits"] == 1
+
+    def test_async_store_access_runs_off_the_event_loop(self, tmp_path):
+        store = SqliteLLMStore(str(tmp_path / "llm.db"), 100)
+        threads = []
+        for name in ("get", "put"):
+            original = getattr(store, name)
+
+            def recorded(*args, _original=original):
+                threads.append(threading.current_thread())
+                return _original(*args)
+
+            setattr(store, name, recorded)
+
+        async def _run():
+            await LLMCache(10, 60, store).put_async("k", "cevap")
+            return await LLMCache(10, 60, store).get_async("k")
+
+        assert asyncio.run(_run()) == "cevap"
+        assert len(threads) == 2 and threading.main_thread() not in threads
+
+    def test_store_prunes_expired_and_excess_rows(self, tmp_path):
+        store = SqliteLLMStore(str(tmp_path / "llm.db"), max_rows=2)
+        for i, expires_at in enumerate((5, 50, 60, 70)):
+            store.put(f"k{i}", "v", expires_at)
+
+        assert store.prune(now=10) == 2
+        assert store.get("k0", 0) is None and store.get("k1", 0) is None
+        assert store.get("k3", 0) is not None
+
+    def test_services_reuse_model_answers(self, stub):
+        async def _run():
+            first = await services.summarize_text("Wifi", "Yurtta   internet yok")
+            second = await services.summarize_text("Wifi", "Yurtta internet yok")
+            await services.draft_response("Wifi", "Yurtta internet yok")
+            return first, second
+
+        first, second = asyncio.run(_run())
+
+        assert first == second == "Stub cevabı."
+        assert len(stub.requests) == 2
+        assert services.llm_cache.stats()["memory_hits"] == 1
+
+    def test_failures_are_not_cached(self, stub):
+        def failing(request):
+            raise RuntimeError("model hatası")
+
+        stub.responder = failing
+        services.openai_client = services.openai_client.copy(max_retries=0)
+        snippet = asyncio.run(services.summarize_text("Wifi", "Yurtta internet yok"))
+
+        assert snippet.startswith("Wifi")
+        assert services.llm_cache.stats()["size"] == 0
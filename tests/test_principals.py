@@ -0,0 +1,90 @@
+"""
+Tests for the authenticated principal cache
+"""
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.principals import Principal, PrincipalCache, PrincipalRole, principal_cache
+from app.core.security import create_access_token
+from app.models.user import User, Role
+
+
+def _principal(user_id: int) -> Principal:
+    return Principal(id=user_id, email=f"u{user_id}@example.com", role=PrincipalRole(1, "student"), department_id=None)
+
+
+class TestPrincipalCache:
+    """Authenticated users come from the cache until they change or expire"""
+
+    def _admin(self, db: Session) -> User:
+        admin = User(email="admin@example.com", password_hash="x",
+                     role_id=db.query(Role).filter(Role.name == "admin").first().id)
+        db.add(admin)
+        db.commit()
+        return admin
+
+    def test_second_request_skips_user_query(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers, count_queries):
+        headers = make_auth_headers(test_user)
+        assert client.get("/api/v1/tickets/my", headers=headers).status_code == 200
+
+        with count_queries() as statements:
+            assert client.get("/api/v1/tickets/my", headers=headers).status_code == 200
+
+        assert not any("FROM users" in s and "tickets" not in s for s in statements)
+        assert principal_cache.stats()["hits"] >= 1
+
+    def test_role_change_invalidates(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        headers = make_auth_headers(test_user)
+        assert client.get("/api/v1/tickets/", headers=headers).status_code == 403
+
+        test_user.role_id = setup_test_db.query(Role).filter(Role.name == "admin").first().id
+        setup_test_db.commit()
+
+        assert client.get("/api/v1/tickets/", headers=headers).status_code == 200
+
+    def test_admin_password_reset_invalidates(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        client.get("/api/v1/tickets/my", headers=make_auth_headers(test_user))
+        assert principal_cache.stats()["size"] == 1
+
+        response = client.put(f"/api/v1/auth/users/{test_user.id}/password", json={"new_password": "yenisifre123"},
+                              headers=make_auth_headers(self._admin(setup_test_db)))
+
+        assert response.status_code == 200
+        assert test_user.id not in principal_cache._items
+
+    def test_token_without_user_id_is_not_cached(self, client: TestClient, setup_test_db: Session, test_user: User):
+        token = create_access_token(data={"sub": test_user.email, "role": "student"})
+        response = client.get("/api/v1/tickets/my", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert principal_cache.stats()["size"] == 0
+
+    def test_metrics_endpoint(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        assert client.get("/api/v1/metrics/", headers=make_auth_headers(test_user)).status_code == 403
+
+        body = client.get("/api/v1/metrics/", headers=make_auth_headers(self._admin(setup_test_db))).json()
+
+        assert {"hits", "misses", "size", "evictions"} <= set(body["principal_cache"])
+
+    def test_lru_bound_and_ttl(self):
+        cache = PrincipalCache(maxsize=2, ttl_seconds=60)
+        for user_id in (1, 2):
+            cache.put(_principal(user_id), cache.generation())
+        cache.get(1)
+        cache.put(_principal(3), cache.generation())
+
+        assert cache.get(2) is None
+        assert cache.get(1) is not None and cache.get(3) is not None
+        assert cache.evictions == 1
+
+        cache.ttl_seconds = 0
+        cache.put(_principal(4), cache.generation())
+        time.sleep(0.001)
+        assert cache.get(4) is None
+
+    def test_stale_load_not_stored_after_invalidation(self):
+        cache = PrincipalCache(maxsize=10, ttl_seconds=60)
+        generation = cache.generation()
+        cache.invalidate(1)
+        cache.put(_principal(1), generation)
+        assert cache.get(1) is None
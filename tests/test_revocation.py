@@ -0,0 +1,92 @@
+"""
+Tests for access token revocation and its Bloom filter
+"""
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.revocation import BloomFilter, prune_revoked_tokens, revocation_list
+from app.core.security import create_access_token, decode_access_token
+from app.models.user import RevokedToken, User
+
+
+def _me(client: TestClient, token: str):
+    return client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def _revoke(db: Session, jti: str, expires_in: timedelta = timedelta(minutes=30)):
+    now = datetime.utcnow()
+    db.add(RevokedToken(jti=jti, revoked_at=now, expires_at=now + expires_in))
+    db.commit()
+
+
+class TestBloomFilter:
+    """No false negatives; false positives stay near the configured rate"""
+
+    def test_membership(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+
+        assert all(f"jti-{i}" in bloom for i in range(1000))
+        false_positives = sum(f"baska-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestTokenRevocation:
+    """Revoked tokens are rejected; other requests are answered from memory"""
+
+    def test_tokens_carry_unique_jti(self):
+        first = decode_access_token(create_access_token(data={"sub": "a@example.com"}))
+        second = decode_access_token(create_access_token(data={"sub": "a@example.com"}))
+        assert first["jti"] != second["jti"]
+
+    def test_logout_revokes_access_token(self, client: TestClient, test_user: User):
+        tokens = client.post("/api/v1/auth/login", json={"username": test_user.email, "password": "test123"}).json()
+        other = create_access_token(data={"sub": test_user.email, "role": "student", "uid": test_user.id})
+        assert _me(client, tokens["access_token"]).status_code == 200
+
+        response = client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]},
+                               headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+        assert response.status_code == 200
+        assert _me(client, tokens["access_token"]).status_code == 401
+        # başka token'lar etkilenmez
+        assert _me(client, other).status_code == 200
+
+    def test_valid_tokens_skip_database(self, client: TestClient, test_user: User):
+        token = create_access_token(data={"sub": test_user.email, "role": "student", "uid": test_user.id})
+        for _ in range(5):
+            assert _me(client, token).status_code == 200
+
+        stats = revocation_list.stats()
+        assert stats["db_checks"] == 0 and stats["filter_negatives"] == 5
+
+    def test_other_worker_revocation_seen_after_refresh(self, client: TestClient, db: Session, test_user: User, monkeypatch):
+        token = create_access_token(data={"sub": test_user.email, "role": "student", "uid": test_user.id})
+        assert _me(client, token).status_code == 200
+
+        # başka bir worker iptal etti: tabloda var, bu sürecin filtresinde henüz yok
+        _revoke(db, decode_access_token(token)["jti"])
+        assert _me(client, token).status_code == 200
+
+        monkeypatch.setattr(revocation_list, "refresh_seconds", 0)
+        assert _me(client, token).status_code == 401
+
+    def test_prune_triggers_rebuild(self, db: Session):
+        _revoke(db, "eski")
+        _revoke(db, "yeni")
+        revocation_list.sync(db)
+        assert "eski" in revocation_list._filter and "yeni" in revocation_list._filter
+        rebuilds = revocation_list.rebuilds
+
+        db.query(RevokedToken).filter(RevokedToken.jti == "eski").update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+
+        assert prune_revoked_tokens(db.connection()) == 1
+        db.commit()
+        revocation_list.refresh_seconds = 0
+        try:
+            revocation_list.sync(db)
+        finally:
+            revocation_list.refresh_seconds = revocation_list.rebuild_seconds
+        assert revocation_list.rebuilds == rebuilds + 1
+        assert "eski" not in revocation_list._filter and "yeni" in revocation_list._filter
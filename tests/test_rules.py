@@ -0,0 +1,145 @@
+"""
+Tests for the compiled keyword rule engine and its admin endpoints
+"""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core import services
+from app.core.rules import AhoCorasick, DEPARTMENT, PRIORITY, Rule, RuleEngine, _CompiledRules, rule_engine
+from app.models.ticket import KeywordRule
+from app.models.user import Role, User
+
+DEPARTMENTS = ["Bilgi Islem", "Yapi Isleri", "Ogrenci Isleri", "Akademik Danismanlik"]
+
+
+class TestMatcher:
+    """One Aho-Corasick pass finds every pattern, including overlapping ones"""
+
+    def test_overlapping_patterns(self):
+        matcher = AhoCorasick(["he", "she", "his", "hers"])
+
+        found = sorted((end, index) for end, index in matcher.finditer("ushers"))
+
+        assert found == [(3, 0), (3, 1), (5, 3)]
+
+    def test_word_start_and_turkish_suffixes(self):
+        compiled = _CompiledRules([Rule(1, "ağ", 1.0, PRIORITY, "Medium"), Rule(2, "çöktü", 1.0, PRIORITY, "High")])
+
+        # "dağ" içindeki "ağ" kelime başında değil; "çöktüğü" ekli hali eşleşir
+        assert [r.id for r in compiled.matched("dag evi")] == []
+        assert [r.id for r in compiled.matched("ag coktugu icin")] == [1, 2]
+
+    def test_rule_counted_once(self):
+        compiled = _CompiledRules([Rule(1, "acil", 2.0, PRIORITY, "High")])
+
+        assert len(compiled.matched("acil acil acil")) == 1
+
+
+class TestRuleEngine:
+    """Scoring with the default rules keeps the old fallback behaviour"""
+
+    @pytest.mark.parametrize("title, description, expected", [
+        ("ACİL", "Sistem çöktü", "High"),
+        ("Acıl durum", "", "High"),
+        ("İnternet yavaş", "sürekli kopuyor", "Medium"),
+        ("Merhaba", "Bir sorum var", "Low"),
+        # tek bir High kelimesi, toplamı daha büyük Medium kelimelerine rağmen High yapar
+        ("acil: wifi bağlantı ağ erişim internet yavaş", "", "High"),
+        ("Sistem yavaş", "sürekli kopuyor, internet erişimi yok", "High"),
+    ])
+    def test_priority_fallback(self, title, description, expected):
+        assert services.suggest_priority_fallback(title, description) == expected
+
+    def test_department_fallback(self):
+        assert services.suggest_department_fallback("Kalorifer yanmıyor", "", DEPARTMENTS) == "Yapi Isleri"
+        assert services.suggest_department_fallback("Transkript", "", DEPARTMENTS) == "Ogrenci Isleri"
+        assert services.suggest_department_fallback("Merhaba", "", DEPARTMENTS) is None
+        # yalnızca verilen departmanlar arasından seçer
+        assert services.suggest_department_fallback("Kalorifer", "", ["Bilgi Islem"]) is None
+
+    def test_scores_explain_matches(self):
+        scores = rule_engine.score("Acil", "wifi yavaş", DEPARTMENTS)
+
+        priority = scores[PRIORITY].as_dict()
+        assert priority["label"] == "High"
+        assert priority["scores"] == {"High": 3.0, "Medium": 1.0}
+        assert {m["pattern"] for m in priority["matches"]} == {"acil", "yavaş"}
+        assert scores[DEPARTMENT].label == "Bilgi Islem"
+
+    def test_suggest_without_client_uses_rules(self, monkeypatch):
+        monkeypatch.setattr(services, "openai_client", None)
+
+        result = asyncio.run(services.suggest_ticket("Asansör", "Asansör bozuk", DEPARTMENTS))
+
+        assert result["department_options"][0] == "Yapi Isleri"
+        assert "asansör → Yapi Isleri (+1)" in result["explanation"]
+
+    def test_sync_loads_table_and_sees_other_workers(self, db: Session):
+        engine = RuleEngine(refresh_seconds=0)
+        engine.sync(db)
+        assert engine.stats()["loaded_from_db"] and engine.stats()["rules"] == db.query(KeywordRule).count()
+
+        # başka bir worker'ın değişikliği: yalnızca tablo
+        db.query(KeywordRule).delete()
+        db.add(KeywordRule(pattern="Kütüphane", weight=1.0, target_type="department", target="Ogrenci Isleri"))
+        db.commit()
+        engine.sync(db)
+
+        assert engine.stats()["rules"] == 1
+        assert engine.score("kutuphane kapali", "")[DEPARTMENT].label == "Ogrenci Isleri"
+        assert engine.score("kutuphane kapali", "")[PRIORITY].label is None
+
+
+class TestRulesAPI:
+    """Admins edit rules; changes take effect without a restart"""
+
+    @pytest.fixture
+    def admin_headers(self, setup_test_db: Session, make_auth_headers):
+        admin = User(email="admin@example.com", password_hash="x",
+                     role_id=setup_test_db.query(Role).filter(Role.name == "admin").first().id)
+        setup_test_db.add(admin)
+        setup_test_db.commit()
+        return make_auth_headers(admin)
+
+    @pytest.fixture
+    def no_llm(self, monkeypatch):
+        monkeypatch.setattr(services, "openai_client", None)
+        monkeypatch.setattr(services.settings, "TRIAGE_ENABLED", False)
+
+    def test_create_rule_hot_reloads(self, client: TestClient, admin_headers, no_llm):
+        suggest = {"title": "Projeksiyon", "description": "Projeksiyon cihazı görüntü vermiyor"}
+        assert client.post("/api/v1/tickets/suggest", json=suggest).json()["priority_options"][0] == "Low"
+
+        response = client.post("/api/v1/rules/", headers=admin_headers,
+                               json={"pattern": "PROJEKSİYON", "weight": 2, "target_type": "priority", "target": "High"})
+        assert response.status_code == 201
+
+        assert client.post("/api/v1/tickets/suggest", json=suggest).json()["priority_options"][0] == "High"
+
+        client.delete(f"/api/v1/rules/{response.json()['id']}", headers=admin_headers)
+        assert client.post("/api/v1/tickets/suggest", json=suggest).json()["priority_options"][0] == "Low"
+
+    def test_update_and_explain(self, client: TestClient, admin_headers):
+        rules = client.get("/api/v1/rules/", headers=admin_headers).json()
+        wifi = next(r for r in rules if r["pattern"] == "wifi")
+
+        response = client.put(f"/api/v1/rules/{wifi['id']}", headers=admin_headers,
+                              json={"pattern": "wifi", "weight": 5, "target_type": "department", "target": "Yapi Isleri"})
+        assert response.status_code == 200
+
+        explained = client.post("/api/v1/rules/explain", headers=admin_headers,
+                                json={"title": "Wifi", "description": "internet yok"}).json()
+        assert explained["department"]["label"] == "Yapi Isleri"
+        assert explained["department"]["scores"] == {"Yapi Isleri": 5.0, "Bilgi Islem": 1.0}
+
+    def test_invalid_target(self, client: TestClient, admin_headers):
+        response = client.post("/api/v1/rules/", headers=admin_headers,
+                               json={"pattern": "x", "target_type": "department", "target": "Yok"})
+
+        assert response.status_code == 400
+
+    def test_requires_admin(self, client: TestClient, test_user, make_auth_headers):
+        response = client.get("/api/v1/rules/", headers=make_auth_headers(test_user))
+
+        assert response.status_code == 403
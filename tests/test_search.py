@@ -0,0 +1,85 @@
+"""
+Tests for full-text ticket search
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.search import build_match_query, fold_text, highlight
+from app.models.ticket import Ticket, Comment
+from app.models.user import User, Department
+
+
+class TestSearchHelpers:
+    """Query sanitizing, Turkish folding and snippet highlighting"""
+
+    def test_fold_text_keeps_length(self):
+        assert fold_text("YAZICI Çalışmıyor İnternet") == "yazici calismiyor internet"
+        assert len(fold_text("İıŞğ")) == 4
+
+    def test_match_query_quotes_tokens(self):
+        assert build_match_query('yazıcı" OR NEAR(') == '"yazici" "or" "near"*'
+        assert build_match_query("  ?!  ") is None
+
+    def test_highlight_marks_original_text(self):
+        assert highlight("Yazıcı çalışmıyor", "yazici") == "<mark>Yazıcı</mark> çalışmıyor"
+
+
+class TestTicketSearch:
+    """FTS5 index is kept in sync by triggers and results are scoped by role"""
+
+    def _ticket(self, db: Session, creator: User, title: str, description: str, dept_name: str = "Bilgi Islem"):
+        dept = db.query(Department).filter(Department.name == dept_name).first()
+        ticket = Ticket(title=title, description=description, priority="Low", status="Open",
+                        created_by_user_id=creator.id, assigned_department_id=dept.id)
+        db.add(ticket)
+        db.commit()
+        return ticket
+
+    def _search(self, client: TestClient, headers, q: str):
+        response = client.get("/api/v1/tickets/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200
+        return response.json()["items"]
+
+    def test_title_match_ranks_above_description_and_comment(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        in_description = self._ticket(setup_test_db, test_user, "Ağ sorunu", "Ofisteki yazıcı da bozuk")
+        in_title = self._ticket(setup_test_db, test_user, "Yazıcı çalışmıyor", "Kağıt sıkışıyor")
+        in_comment = self._ticket(setup_test_db, test_user, "Projeksiyon", "Görüntü yok")
+        self._ticket(setup_test_db, test_user, "Şifre", "Parolamı unuttum")
+        setup_test_db.add(Comment(ticket_id=in_comment.id, user_id=test_user.id, content="Yazicinin kablosu da takılı değil"))
+        setup_test_db.commit()
+
+        items = self._search(client, make_auth_headers(test_user), "yazıcı")
+
+        assert [i["ticket_id"] for i in items][0] == in_title.id
+        assert {i["ticket_id"] for i in items} == {in_title.id, in_description.id, in_comment.id}
+        by_id = {i["ticket_id"]: i for i in items}
+        assert by_id[in_title.id]["snippet"].startswith("<mark>Yazıcı</mark>")
+        assert by_id[in_description.id]["matched_in"] == "description"
+        assert by_id[in_comment.id]["matched_in"] == "comment"
+        assert "<mark>Yazicinin</mark>" in by_id[in_comment.id]["snippet"]
+
+    def test_index_follows_updates_and_deletes(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        ticket = self._ticket(setup_test_db, test_user, "Eski başlık", "Açıklama")
+        headers = make_auth_headers(test_user)
+
+        ticket.title = "Projektör arızası"
+        setup_test_db.commit()
+        assert [i["ticket_id"] for i in self._search(client, headers, "projektör")] == [ticket.id]
+        assert self._search(client, headers, "eski") == []
+
+        setup_test_db.delete(ticket)
+        setup_test_db.commit()
+        assert self._search(client, headers, "projektör") == []
+        assert setup_test_db.execute(text("SELECT count(*) FROM ticket_search")).scalar() == 0
+
+    def test_results_are_scoped_by_role(self, client: TestClient, setup_test_db: Session, test_user: User, test_department_user: User, test_support_user: User, make_auth_headers):
+        own = self._ticket(setup_test_db, test_user, "Klima arızası", "Sınıf çok sıcak")
+        other_dept = self._ticket(setup_test_db, test_support_user, "Klima gürültüsü", "Yapı işleri", dept_name="Yapi Isleri")
+
+        student = {i["ticket_id"] for i in self._search(client, make_auth_headers(test_user), "klima")}
+        department = {i["ticket_id"] for i in self._search(client, make_auth_headers(test_department_user), "klima")}
+        support = {i["ticket_id"] for i in self._search(client, make_auth_headers(test_support_user), "klima")}
+
+        assert student == {own.id}
+        assert department == {own.id}
+        assert other_dept.id not in support and support == set()
@@ -0,0 +1,54 @@
+"""
+Tests for the verified-token cache
+"""
+import time
+from datetime import timedelta
+import pytest
+from jose import JWTError
+from app.core.security import VerifiedTokenCache, create_access_token, decode_access_token, token_cache
+
+
+class TestVerifiedTokenCache:
+    """Signature checks run once per token; entries expire with the token"""
+
+    def test_second_decode_is_a_hit(self):
+        token_cache.clear()
+        token = create_access_token(data={"sub": "a@example.com", "uid": 1})
+
+        first = decode_access_token(token)
+        hits = token_cache.hits
+        second = decode_access_token(token)
+
+        assert first["sub"] == second["sub"] == "a@example.com"
+        assert token_cache.hits == hits + 1
+        with pytest.raises(TypeError):
+            second["sub"] = "b@example.com"
+
+    def test_invalid_tokens_are_not_cached(self):
+        token_cache.clear()
+        token = create_access_token(data={"sub": "a@example.com"})
+        tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+
+        for _ in range(2):
+            with pytest.raises(JWTError):
+                decode_access_token(tampered)
+        assert token_cache.stats()["size"] == 0
+
+        expired = create_access_token(data={"sub": "a@example.com"}, expires_delta=timedelta(seconds=-1))
+        with pytest.raises(JWTError):
+            decode_access_token(expired)
+
+    def test_entries_expire_and_are_bounded(self):
+        cache = VerifiedTokenCache(maxsize=2)
+        now = time.time()
+        cache.put(b"a", now + 60, {"sub": "a"})
+        cache.put(b"b", now + 60, {"sub": "b"})
+        cache.get(b"a")
+        cache.put(b"c", now + 60, {"sub": "c"})
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == {"sub": "a"}
+        assert cache.evictions == 1
+
+        cache.put(b"old", now - 1, {"sub": "old"})
+        assert cache.get(b"old") is None
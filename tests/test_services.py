@@ -0,0 +1,91 @@
+"""
+Tests for the async AI layer against a local OpenAI stub
+"""
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core import services
+from app.core.config import settings
+from app.core.llm_cache import LLMCache
+from tests.openai_stub import OpenAIStub, default_responder
+
+DEPARTMENTS = ["Bilgi Islem", "Yapi Isleri", "Ogrenci Isleri"]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with OpenAIStub(delay=0.1) as server:
+        monkeypatch.setattr(services, "openai_client", services.create_openai_client("test-key", server.base_url))
+        monkeypatch.setattr(services, "llm_cache", LLMCache(maxsize=100, ttl=0))
+        yield server
+
+
+class TestSuggestTicket:
+    """Suggestions use one structured call, or concurrent single-purpose calls"""
+
+    def test_structured_single_call(self, stub):
+        result = asyncio.run(services.suggest_ticket("İnternet", "Wifi çöktü", DEPARTMENTS))
+
+        assert len(stub.requests) == 1
+        assert stub.requests[0]["response_format"] == {"type": "json_object"}
+        assert result["department_options"][0] == "Bilgi Islem"
+        assert result["priority_options"] == ["High", "Medium", "Low"]
+        assert result["suggested_title"] == "İnternet bağlantısı yok"
+
+    def test_calls_run_concurrently(self, stub, monkeypatch):
+        monkeypatch.setattr(settings, "OPENAI_STRUCTURED_SUGGEST", False)
+
+        start = time.perf_counter()
+        result = asyncio.run(services.suggest_ticket("İnternet", "Wifi çöktü", DEPARTMENTS))
+        elapsed = time.perf_counter() - start
+
+        assert len(stub.requests) == 2 and stub.max_in_flight == 2
+        assert elapsed < 2 * stub.delay
+        assert result["department_options"][0] == "Bilgi Islem" and result["priority_options"][0] == "High"
+
+    def test_invalid_structured_reply_falls_back(self, stub):
+        stub.responder = lambda request: "json değil" if "response_format" in request else default_responder(request)
+
+        result = asyncio.run(services.suggest_ticket("İnternet", "Wifi çöktü", DEPARTMENTS))
+
+        assert len(stub.requests) == 3
+        assert result["department_options"][0] == "Bilgi Islem" and result["priority_options"][0] == "High"
+
+    def test_event_loop_not_blocked(self, stub):
+        async def _run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                for _ in range(5):
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            await asyncio.gather(services.suggest_ticket("İnternet", "Wifi çöktü", DEPARTMENTS), ticker())
+            return ticks
+
+        assert asyncio.run(_run()) == 5
+
+    def test_each_event_loop_gets_own_client(self, stub):
+        # içe aktarım gibi işler her grup için ayrı asyncio.run açar
+        for _ in range(2):
+            result = asyncio.run(services.suggest_ticket("İnternet", "Wifi çöktü", DEPARTMENTS))
+            assert result["explanation"] == "Ağ erişimi sorunu."
+        assert len(stub.requests) == 2
+
+    def test_fallback_without_client(self, monkeypatch):
+        monkeypatch.setattr(services, "openai_client", None)
+
+        result = asyncio.run(services.suggest_ticket("Acil", "Sistem çöktü", DEPARTMENTS))
+
+        assert result["department_options"][0] == "Bilgi Islem"
+        assert result["priority_options"][0] == "High"
+
+    def test_suggest_endpoint_uses_model(self, client: TestClient, setup_test_db: Session, stub):
+        response = client.post("/api/v1/tickets/suggest", json={"title": "İnternet", "description": "Wifi çöktü"})
+
+        assert response.status_code == 200
+        assert response.json()["explanation"] == "Ağ erişimi sorunu."
+        assert len(stub.requests) == 1
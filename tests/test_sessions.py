@@ -0,0 +1,102 @@
+"""
+Tests for refresh tokens and the server-side session store
+"""
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.security import decode_access_token, get_password_hash
+from app.core.sessions import cleanup_sessions
+from app.models.user import Role, User, UserSession
+
+
+def _login(client: TestClient, setup_test_db: Session, email: str = "oturum@example.com") -> dict:
+    if not setup_test_db.query(User).filter(User.email == email).first():
+        setup_test_db.add(User(email=email, password_hash=get_password_hash("gizli123", rounds=4),
+                               role_id=setup_test_db.query(Role).filter(Role.name == "student").first().id))
+        setup_test_db.commit()
+    response = client.post("/api/v1/auth/login", json={"username": email, "password": "gizli123"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _refresh(client: TestClient, token: str):
+    return client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+class TestRefreshTokens:
+    """Refresh tokens rotate on use, detect reuse and can be revoked"""
+
+    def test_login_issues_refresh_token_and_stores_only_hash(self, client: TestClient, setup_test_db: Session):
+        tokens = _login(client, setup_test_db)
+
+        assert tokens["refresh_token"]
+        stored = setup_test_db.query(UserSession).one()
+        assert stored.token_hash != tokens["refresh_token"] and len(stored.token_hash) == 64
+        assert stored.expires_at > datetime.utcnow() + timedelta(days=13)
+
+    def test_refresh_rotates_token(self, client: TestClient, setup_test_db: Session):
+        tokens = _login(client, setup_test_db)
+
+        response = _refresh(client, tokens["refresh_token"])
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["refresh_token"] != tokens["refresh_token"]
+        assert decode_access_token(body["access_token"])["sub"] == "oturum@example.com"
+        assert client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {body['access_token']}"}).status_code == 200
+        # yeni token çalışır, eskisi tekrar kullanılamaz
+        assert _refresh(client, body["refresh_token"]).status_code == 200
+
+    def test_refresh_revokes_sent_access_token(self, client: TestClient, setup_test_db: Session):
+        tokens = _login(client, setup_test_db)
+        old = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}, headers=old)
+
+        assert response.status_code == 200
+        assert client.get("/api/v1/auth/me", headers=old).status_code == 401
+        new = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        assert client.get("/api/v1/auth/me", headers=new).status_code == 200
+
+    def test_reuse_revokes_whole_family(self, client: TestClient, setup_test_db: Session):
+        first = _login(client, setup_test_db)["refresh_token"]
+        other_device = _login(client, setup_test_db)["refresh_token"]
+        second = _refresh(client, first).json()["refresh_token"]
+
+        assert _refresh(client, first).status_code == 401
+        # sızmış zincirdeki güncel token da iptal edildi; diğer girişin oturumu etkilenmez
+        assert _refresh(client, second).status_code == 401
+        assert _refresh(client, other_device).status_code == 200
+
+    def test_expired_and_unknown_tokens_rejected(self, client: TestClient, setup_test_db: Session):
+        token = _login(client, setup_test_db)["refresh_token"]
+        setup_test_db.query(UserSession).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        setup_test_db.commit()
+
+        assert _refresh(client, token).status_code == 401
+        assert _refresh(client, "bilinmeyen").status_code == 401
+
+    def test_logout_and_password_change_revoke(self, client: TestClient, setup_test_db: Session):
+        logged_out = _login(client, setup_test_db)
+        assert client.post("/api/v1/auth/logout", json={"refresh_token": logged_out["refresh_token"]}).status_code == 200
+        assert _refresh(client, logged_out["refresh_token"]).status_code == 401
+
+        tokens = _login(client, setup_test_db)
+        response = client.post(
+            "/api/v1/auth/change-password",
+            json={"current_password": "gizli123", "new_password": "yenisifre"},
+            headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        )
+        assert response.status_code == 200
+        assert _refresh(client, tokens["refresh_token"]).status_code == 401
+
+    def test_cleanup_removes_expired_sessions(self, setup_test_db: Session, test_user: User):
+        user_id = test_user.id
+        now = datetime.utcnow()
+        for i, days in enumerate((-2, -1, 5)):
+            setup_test_db.add(UserSession(user_id=user_id, family_id="f", token_hash=f"h{i}",
+                                          created_at=now, expires_at=now + timedelta(days=days)))
+        setup_test_db.commit()
+
+        assert cleanup_sessions(setup_test_db.get_bind(), batch_size=1, now=now) == 2
+        assert [s.token_hash for s in setup_test_db.query(UserSession)] == ["h2"]
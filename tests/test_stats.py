@@ -0,0 +1,80 @@
+"""
+Tests for the incrementally maintained ticket statistics
+"""
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.security import get_password_hash
+from app.core.stats import load_ticket_stats, rebuild_ticket_stats
+from app.models.ticket import Ticket, TicketStat
+from app.models.user import User, Role, Department
+
+
+def _counters(db: Session):
+    return {(s.department_id, s.status, s.priority): s.count
+            for s in db.execute(select(TicketStat)).scalars() if s.count}
+
+
+class TestTicketStats:
+    """Counters follow every ticket change and match a full rebuild"""
+
+    def _admin(self, db: Session):
+        admin = User(email="admin@example.com", password_hash=get_password_hash("admin123"),
+                     role_id=db.query(Role).filter(Role.name == "admin").first().id)
+        db.add(admin)
+        db.commit()
+        return admin
+
+    def test_counters_follow_ticket_lifecycle(self, client: TestClient, setup_test_db: Session, test_user: User, test_department_user: User, test_support_user: User, make_auth_headers):
+        admin = self._admin(setup_test_db)
+        for priority in ["High", "Low", "Low"]:
+            response = client.post("/api/v1/tickets/", json={
+                "title": "Ağ", "description": "İnternet yok", "department_name": "Bilgi Islem",
+                "category": "Ağ", "priority": priority,
+            }, headers=make_auth_headers(test_user))
+            assert response.status_code == 201
+        ticket_ids = [t.id for t in setup_test_db.query(Ticket).order_by(Ticket.id)]
+
+        manager = make_auth_headers(test_department_user)
+        assert client.put(f"/api/v1/tickets/{ticket_ids[0]}/status", json={"new_status": "Resolved"}, headers=manager).status_code == 200
+        assert client.put(f"/api/v1/tickets/{ticket_ids[1]}/assign", params={"support_email": test_support_user.email}, headers=manager).status_code == 200
+        assert client.put(f"/api/v1/tickets/{ticket_ids[2]}/assign-department", params={"department_name": "Yapi Isleri"},
+                          headers=make_auth_headers(admin)).status_code == 200
+
+        stats = client.get("/api/v1/tickets/stats", headers=make_auth_headers(admin)).json()
+        assert stats["total"] == 3
+        assert stats["by_status"] == {"Resolved": 1, "In Progress": 1, "Open": 1}
+        assert stats["by_priority"] == {"High": 1, "Low": 2}
+        assert [(d["department_name"], d["total"]) for d in stats["by_department"]] == [("Bilgi Islem", 2), ("Yapi Isleri", 1)]
+
+        # Departman yöneticisi yalnızca kendi departmanını görür
+        own = client.get("/api/v1/tickets/stats", headers=manager).json()
+        assert own["total"] == 2
+        assert [d["department_name"] for d in own["by_department"]] == ["Bilgi Islem"]
+
+        setup_test_db.expire_all()
+        counters = _counters(setup_test_db)
+        rebuild_ticket_stats(setup_test_db.connection())
+        assert _counters(setup_test_db) == counters
+
+    def test_unloaded_old_values_and_deletes_are_counted(self, setup_test_db: Session, test_user: User):
+        dept = setup_test_db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        ticket = Ticket(title="a", description="b", created_by_user_id=test_user.id, assigned_department_id=dept.id)
+        setup_test_db.add(ticket)
+        setup_test_db.commit()
+        assert _counters(setup_test_db) == {(dept.id, "Open", "Low"): 1}
+
+        # commit sonrası alanlar expire edilmiştir; eski değer okunmadan atanır
+        ticket.status = "Closed"
+        ticket.priority = "High"
+        setup_test_db.commit()
+        assert _counters(setup_test_db) == {(dept.id, "Closed", "High"): 1}
+
+        setup_test_db.delete(ticket)
+        setup_test_db.commit()
+        assert _counters(setup_test_db) == {}
+        assert load_ticket_stats(setup_test_db)["total"] == 0
+
+    def test_stats_forbidden_for_students(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        response = client.get("/api/v1/tickets/stats", headers=make_auth_headers(test_user))
+        assert response.status_code == 403
@@ -0,0 +1,111 @@
+"""
+Tests for login throttling and admission control
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from app.core.config import settings
+from app.core.throttle import LoginThrottle, MemoryBucketStore, SqliteBucketStore, client_ip, login_throttle
+from app.models.user import User
+
+
+def _login(client: TestClient, username: str):
+    return client.post("/api/v1/auth/login", json={"username": username, "password": "yanlis"})
+
+
+class TestLoginThrottle:
+    """Excess login attempts are rejected before any password verification runs"""
+
+    def test_account_bucket_rejects_before_bcrypt(self, client: TestClient, setup_test_db: Session, test_user: User, monkeypatch):
+        monkeypatch.setattr(login_throttle, "account_limit", (3, 1 / 60))
+        with patch("app.routers.auth.password_hasher.verify", new=AsyncMock(return_value=False)) as verify:
+            codes = [_login(client, test_user.email).status_code for _ in range(4)]
+            response = _login(client, test_user.email.upper())
+
+        assert codes == [401, 401, 401, 429]
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+        assert verify.await_count == 3
+        # başka bir hesap etkilenmez
+        assert _login(client, "baska@example.com").status_code == 401
+
+    def test_ip_bucket_spans_accounts(self, client: TestClient, setup_test_db: Session, monkeypatch):
+        monkeypatch.setattr(login_throttle, "ip_limit", (2, 1 / 60))
+
+        codes = [_login(client, f"user{i}@example.com").status_code for i in range(3)]
+
+        assert codes == [401, 401, 429]
+        assert login_throttle.stats()["rejected_ip"] >= 1
+
+    def test_check_runs_off_the_event_loop(self, client: TestClient, setup_test_db: Session, monkeypatch):
+        loops = []
+        original = login_throttle.check
+
+        def check(ip, account):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return original(ip, account)
+
+        monkeypatch.setattr(login_throttle, "check", check)
+        _login(client, "user@example.com")
+
+        assert loops == [None]
+
+    def test_spoofed_forwarded_for_shares_ip_bucket(self, client: TestClient, setup_test_db: Session, monkeypatch):
+        monkeypatch.setattr(settings, "LOGIN_THROTTLE_TRUST_FORWARDED", True)
+        monkeypatch.setattr(login_throttle, "ip_limit", (2, 1 / 60))
+
+        # proxy gerçek adresi sona ekler; istemci soldaki adresi her denemede değiştirir
+        codes = [
+            client.post("/api/v1/auth/login", json={"username": f"user{i}@example.com", "password": "yanlis"},
+                        headers={"X-Forwarded-For": f"10.0.0.{i}, 203.0.113.7"}).status_code
+            for i in range(3)
+        ]
+
+        assert codes == [401, 401, 429]
+
+    def test_trusted_hops(self, monkeypatch):
+        monkeypatch.setattr(settings, "LOGIN_THROTTLE_TRUST_FORWARDED", True)
+        monkeypatch.setattr(settings, "LOGIN_THROTTLE_TRUSTED_HOPS", 2)
+        request = Request({"type": "http", "client": ("127.0.0.1", 1), "headers": [
+            (b"x-forwarded-for", b"1.2.3.4, 203.0.113.7, 10.0.0.2"),
+        ]})
+
+        assert client_ip(request) == "203.0.113.7"
+
+    def test_verify_ceiling_fails_fast(self):
+        throttle = LoginThrottle(MemoryBucketStore(), 10, 10, 10, 10, max_concurrent_verify=1)
+
+        async def _run():
+            async with throttle.verify_slot():
+                with pytest.raises(HTTPException) as exc:
+                    async with throttle.verify_slot():
+                        pass
+                return exc.value.status_code
+
+        assert asyncio.run(_run()) == 503
+        assert throttle.stats()["verifying"] == 0
+
+    @pytest.mark.parametrize("store_factory", [lambda path: MemoryBucketStore(), lambda path: SqliteBucketStore(str(path))])
+    def test_bucket_refills(self, tmp_path, store_factory):
+        store = store_factory(tmp_path / "buckets.db")
+
+        assert [store.take("k", 2, 1.0, 100.0)[0] for _ in range(3)] == [True, True, False]
+        assert store.take("k", 2, 1.0, 100.5) == (False, 0.5)
+        assert store.take("k", 2, 1.0, 101.0)[0] is True
+        # tam dolumdan fazlası birikmez
+        assert store.take("k", 2, 1.0, 1000.0) == (True, 1.0)
+
+    def test_sqlite_store_shared_between_workers(self, tmp_path):
+        path = str(tmp_path / "buckets.db")
+        first, second = SqliteBucketStore(path), SqliteBucketStore(path)
+
+        assert first.take("ip:1.2.3.4", 2, 0.0, 10.0)[0]
+        assert second.take("ip:1.2.3.4", 2, 0.0, 10.0)[0]
+        assert not first.take("ip:1.2.3.4", 2, 0.0, 10.0)[0]
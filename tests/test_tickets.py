@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from app.models.ticket import Ticket
+from app.models.ticket import Ticket, Comment
 from app.models.user import User, Role, Department
 from datetime import datetime
 
@@ -466,3 +466,274 @@ class TestTicketRetrieval:
             data = response.json()
             assert data["id"] == ticket_id
             assert data["title"] == "Get Ticket Test"
+
+
+class TestTicketPagination:
+    """Tests for cursor (keyset) pagination on the list endpoints"""
+
+    def _seed_tickets(self, db: Session, creator: User, count: int):
+        dept = db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        priorities = ["Low", "High", "Medium"]
+        base = datetime(2024, 1, 1)
+        for i in range(count):
+            db.add(Ticket(
+                title=f"Ticket {i}",
+                description=f"Description {i}",
+                priority=priorities[i % 3],
+                status="Open",
+                created_by_user_id=creator.id,
+                assigned_department_id=dept.id,
+                # two tickets share each timestamp so the id tie-breaker is exercised
+                created_at=base.replace(hour=i // 2),
+            ))
+        db.commit()
+
+    def _collect(self, client: TestClient, url: str, headers, limit: int, **filters):
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": limit, **filters}
+            if cursor:
+                params["after"] = cursor
+            response = client.get(url, params=params, headers=headers)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= limit
+            ids.extend(t["id"] for t in page["items"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if not cursor:
+                return ids, pages
+
+    def test_my_tickets_pages_cover_all_rows_once(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        self._seed_tickets(setup_test_db, test_user, 11)
+
+        ids, pages = self._collect(client, "/api/v1/tickets/my", make_auth_headers(test_user), limit=4)
+
+        assert pages == 3
+        assert len(ids) == 11
+        assert len(set(ids)) == 11
+        rows = setup_test_db.query(Ticket).all()
+        expected = [t.id for t in sorted(rows, key=lambda t: (t.created_at, t.id), reverse=True)]
+        assert ids == expected
+
+    def test_department_priority_sort_is_stable_across_pages(self, client: TestClient, setup_test_db: Session, test_user: User, test_department_user: User, make_auth_headers):
+        self._seed_tickets(setup_test_db, test_user, 10)
+
+        ids, _ = self._collect(client, "/api/v1/tickets/department", make_auth_headers(test_department_user), limit=3, sort_by_priority=True)
+
+        rank = {"High": 1, "Medium": 2, "Low": 3}
+        rows = setup_test_db.query(Ticket).all()
+        expected = [t.id for t in sorted(rows, key=lambda t: (rank[t.priority], -t.created_at.timestamp(), -t.id))]
+        assert ids == expected
+
+    def test_invalid_cursor_rejected(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        response = client.get("/api/v1/tickets/my", params={"after": "not-a-cursor"}, headers=make_auth_headers(test_user))
+        assert response.status_code == 400
+
+
+class TestTicketListQueryCount:
+    """Regression tests: list endpoints must not issue per-row lazy loads"""
+
+    def _seed(self, db: Session, creator: User, count: int):
+        from app.models.ticket import Comment
+        dept = db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        for i in range(count):
+            ticket = Ticket(
+                title=f"Ticket {i}",
+                description=f"Description {i}",
+                priority="High",
+                status="Open",
+                created_by_user_id=creator.id,
+                assigned_department_id=dept.id,
+                assigned_support_id=creator.id,
+            )
+            db.add(ticket)
+            db.flush()
+            db.add(Comment(ticket_id=ticket.id, user_id=creator.id, content=f"Comment {i}"))
+        db.commit()
+        # start from a cold identity map, as a real request would
+        db.expire_all()
+
+    def _query_count(self, client: TestClient, db: Session, count_queries, url: str, headers):
+        with count_queries() as statements:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert all(t["created_by_user"]["role_name"] for t in data["items"])
+        assert all(t["comment_count"] == 1 and "comments" not in t for t in data["items"])
+        db.expire_all()
+        return len(statements)
+
+    @pytest.mark.parametrize("url,user_fixture", [
+        ("/api/v1/tickets/my", "test_user"),
+        ("/api/v1/tickets/department", "test_department_user"),
+        ("/api/v1/tickets/support", "test_support_user"),
+        ("/api/v1/tickets/", "test_department_user"),
+    ])
+    def test_query_count_independent_of_row_count(self, request, client: TestClient, setup_test_db: Session, count_queries, make_auth_headers, url, user_fixture):
+        user = request.getfixturevalue(user_fixture)
+        headers = make_auth_headers(user)
+        # principal önbelleğini ısıt: ölçülen istekler kullanıcıyı veritabanından okumaz
+        client.get(url, headers=headers)
+
+        self._seed(setup_test_db, user, 2)
+        small = self._query_count(client, setup_test_db, count_queries, url, headers)
+
+        self._seed(setup_test_db, user, 20)
+        large = self._query_count(client, setup_test_db, count_queries, url, headers)
+
+        assert small == large
+        # yalnızca ticket sorgusu (creator/role JOIN, yorum sayısı alt sorgu)
+        assert large == 1
+
+
+class TestTicketComments:
+    """List items carry comment counts; comments are paged from their own endpoint"""
+
+    def _seed(self, db: Session, creator: User, comments: int):
+        dept = db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        ticket = Ticket(title="Yorumlu", description="d", status="Open", priority="Low",
+                        created_by_user_id=creator.id, assigned_department_id=dept.id,
+                        updated_at=datetime(2024, 1, 1))
+        db.add(ticket)
+        db.flush()
+        for i in range(comments):
+            db.add(Comment(ticket_id=ticket.id, user_id=creator.id, content=f"yorum {i}",
+                           created_at=datetime(2024, 2, 1 + i)))
+        db.commit()
+        return ticket.id
+
+    def test_summary_has_count_and_last_activity(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        self._seed(setup_test_db, test_user, 3)
+
+        item = client.get("/api/v1/tickets/my", headers=make_auth_headers(test_user)).json()["items"][0]
+
+        assert "comments" not in item
+        assert item["comment_count"] == 3
+        assert item["last_activity_at"] == "2024-02-03T00:00:00"
+
+    def test_comments_paginated_in_order(self, client: TestClient, setup_test_db: Session, test_user: User, make_auth_headers):
+        ticket_id = self._seed(setup_test_db, test_user, 5)
+        headers = make_auth_headers(test_user)
+
+        contents, after = [], None
+        while True:
+            params = {"limit": 2, **({"after": after} if after else {})}
+            page = client.get(f"/api/v1/tickets/{ticket_id}/comments", params=params, headers=headers).json()
+            contents += [c["content"] for c in page["items"]]
+            after = page["next_cursor"]
+            if not after:
+                break
+        assert contents == [f"yorum {i}" for i in range(5)]
+
+    def test_comments_respect_visibility(self, client: TestClient, setup_test_db: Session, test_user: User, test_support_user: User, make_auth_headers):
+        ticket_id = self._seed(setup_test_db, test_user, 1)
+
+        assert client.get(f"/api/v1/tickets/{ticket_id}/comments", headers=make_auth_headers(test_support_user)).status_code == 403
+        assert client.get("/api/v1/tickets/999999/comments", headers=make_auth_headers(test_user)).status_code == 404
+
+
+class TestAsyncSessionRoutes:
+    """The async endpoints run on the AsyncSession dependency"""
+
+    def test_create_then_resolve_ticket(self, client: TestClient, setup_test_db: Session, test_user: User, test_department_user: User, make_auth_headers):
+        ticket_data = {
+            "title": "Async Ticket",
+            "description": "Created through the async session",
+            "priority": "High",
+            "category": "Bilgi Islem",
+            "department_name": "Bilgi Islem"
+        }
+        response = client.post("/api/v1/tickets/", json=ticket_data, headers=make_auth_headers(test_user))
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created_by_user"]["role_name"] == "student"
+        assert data["comments"] == []
+
+        with patch('app.routers.tickets.send_notification') as mock_notify:
+            response = client.put(
+                f"/api/v1/tickets/{data['id']}/status",
+                json={"new_status": "Resolved", "resolution_note": "Done"},
+                headers=make_auth_headers(test_department_user)
+            )
+        assert response.status_code == 200
+
+        setup_test_db.expire_all()
+        db_ticket = setup_test_db.query(Ticket).filter(Ticket.id == data["id"]).first()
+        assert db_ticket.status == "Resolved"
+        assert len(db_ticket.comments) == 1
+        assert mock_notify.call_args.args[-1] == "testuser@example.com"
+
+    def test_summarize_ticket(self, client: TestClient, setup_test_db: Session, test_user: User, test_support_user: User, make_auth_headers):
+        dept = setup_test_db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        ticket = Ticket(title="Printer", description="Printer is jammed", created_by_user_id=test_user.id,
+                        assigned_department_id=dept.id, assigned_support_id=test_support_user.id)
+        setup_test_db.add(ticket)
+        setup_test_db.commit()
+
+        response = client.post(f"/api/v1/tickets/{ticket.id}/summarize", headers=make_auth_headers(test_support_user))
+        assert response.status_code == 200
+        assert "Printer" in response.json()["summary"]
+
+
+class TestBulkTicketOperations:
+    """Bulk endpoint authorizes per ticket, commits once and batches notifications"""
+
+    def _seed(self, db: Session, creator: User):
+        own = db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        other = db.query(Department).filter(Department.name == "Yapi Isleri").first()
+        tickets = [
+            Ticket(title=f"T{i}", description="d", status="Open", priority="Low",
+                   created_by_user_id=creator.id, assigned_department_id=dept.id)
+            for i, dept in enumerate([own, own, other])
+        ]
+        db.add_all(tickets)
+        db.commit()
+        return [t.id for t in tickets]
+
+    def test_bulk_status_reports_per_ticket_results(self, client: TestClient, setup_test_db: Session, test_user: User, test_department_user: User, make_auth_headers):
+        own1, own2, other = self._seed(setup_test_db, test_user)
+
+        with patch("app.routers.tickets.send_notifications") as mock_send:
+            response = client.post("/api/v1/tickets/bulk", json={
+                "ticket_ids": [own1, other, own2, 9999, own1],
+                "operation": "status", "new_status": "Resolved", "resolution_note": "Toplu çözüldü",
+            }, headers=make_auth_headers(test_department_user))
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["updated"] == 2
+        assert [(r["ticket_id"], r["ok"]) for r in body["results"]] == [(own1, True), (other, False), (own2, True), (9999, False)]
+        assert body["results"][1]["detail"] == "Bu ticket'a yetkiniz yok."
+        assert body["results"][3]["detail"] == "Ticket bulunamadi."
+
+        setup_test_db.expire_all()
+        statuses = {t.id: t.status for t in setup_test_db.query(Ticket)}
+        assert statuses == {own1: "Resolved", own2: "Resolved", other: "Open"}
+        assert setup_test_db.query(Comment).filter(Comment.content.contains("Toplu çözüldü")).count() == 2
+        # tek bir arka plan thread'i, iki bildirim
+        mock_send.assert_called_once()
+        assert [n[0] for n in mock_send.call_args.args[0]] == [own1, own2]
+
+    def test_bulk_assign_and_role_checks(self, client: TestClient, setup_test_db: Session, test_user: User, test_department_user: User, test_support_user: User, make_auth_headers):
+        own1, own2, _ = self._seed(setup_test_db, test_user)
+        manager = make_auth_headers(test_department_user)
+
+        response = client.post("/api/v1/tickets/bulk", json={
+            "ticket_ids": [own1, own2], "operation": "assign", "support_id": test_support_user.id,
+        }, headers=manager)
+        assert response.status_code == 200
+        assert response.json()["updated"] == 2
+        setup_test_db.expire_all()
+        assert {(t.assigned_support_id, t.status) for t in setup_test_db.query(Ticket).filter(Ticket.id.in_([own1, own2]))} == {(test_support_user.id, "In Progress")}
+
+        # support olmayan kullanıcı atanamaz, departman değiştirme yalnızca admin
+        assert client.post("/api/v1/tickets/bulk", json={
+            "ticket_ids": [own1], "operation": "assign", "support_id": test_user.id,
+        }, headers=manager).status_code == 404
+        assert client.post("/api/v1/tickets/bulk", json={
+            "ticket_ids": [own1], "operation": "assign-department", "department_name": "Yapi Isleri",
+        }, headers=manager).status_code == 403
+        assert client.post("/api/v1/tickets/bulk", json={
+            "ticket_ids": [own1], "operation": "status", "new_status": "Closed",
+        }, headers=make_auth_headers(test_user)).status_code == 403
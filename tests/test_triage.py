@@ -0,0 +1,162 @@
+"""
+Tests for the local triage classifier and its place in front of the LLM
+"""
+import asyncio
+import random
+import time
+import pytest
+from sqlalchemy.orm import Session
+from app.core import services, triage
+from app.core.llm_cache import LLMCache
+from app.core.triage import TriageClassifier, evaluate, load_training_rows, triage_classifier
+from app.models.ticket import Ticket
+from app.models.user import Department
+from tests.openai_stub import OpenAIStub
+
+DEPARTMENTS = ["Bilgi Islem", "Yapi Isleri", "Ogrenci Isleri"]
+
+# (departman, öncelik) -> örnek başlık/açıklama kelimeleri
+TOPICS = {
+    ("Bilgi Islem", "High"): ["wifi çöktü", "internet yok", "sunucu erişilemiyor", "eduroam bağlanmıyor"],
+    ("Yapi Isleri", "Medium"): ["kalorifer yanmıyor", "musluk akıtıyor", "lamba patladı", "pencere kırık"],
+    ("Ogrenci Isleri", "Low"): ["transkript talebi", "öğrenci belgesi", "harç dekontu", "kayıt dondurma"],
+}
+
+
+def _rows(count: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, count + 1):
+        (department, priority), phrases = rng.choice(list(TOPICS.items()))
+        title = rng.choice(phrases)
+        description = " ".join(rng.sample(phrases, 2)) + " lütfen yardım"
+        rows.append((i, title, description, department, priority))
+    return rows
+
+
+@pytest.fixture
+def trained():
+    triage_classifier.reset()
+    triage_classifier.partial_fit(_rows(300))
+    yield triage_classifier
+    triage_classifier.reset()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with OpenAIStub() as server:
+        monkeypatch.setattr(services, "openai_client", services.create_openai_client("test-key", server.base_url))
+        monkeypatch.setattr(services, "llm_cache", LLMCache(maxsize=100, ttl=0))
+        yield server
+
+
+class TestTriageClassifier:
+    """Naive Bayes heads for department and priority"""
+
+    def test_predicts_department_and_priority(self, trained):
+        department, priority = trained.predict("Wifi çöktü", "Yurtta internet yok")
+
+        assert department.label == "Bilgi Islem" and department.confidence > 0.9
+        assert priority.label == "High"
+
+    def test_turkish_case_folding(self, trained):
+        # büyük harf ve şapkalı/Türkçe karakterler aynı terime düşer
+        department, _ = trained.predict("KALORİFER YANMIYOR", "")
+
+        assert department.label == "Yapi Isleri"
+
+    def test_unknown_text_returns_none(self, trained):
+        assert trained.predict("zzz", "qqq") == (None, None)
+
+    def test_untrained_returns_none(self):
+        assert TriageClassifier().predict("Wifi", "çöktü") == (None, None)
+
+    def test_allowed_departments_restrict_prediction(self, trained):
+        department, _ = trained.predict("Wifi çöktü", "", departments=["Yapi Isleri", "Ogrenci Isleri"])
+
+        assert department.label in ("Yapi Isleri", "Ogrenci Isleri")
+
+    def test_incremental_fit_matches_full_fit(self):
+        rows = _rows(200)
+        full, incremental = TriageClassifier(), TriageClassifier()
+        full.partial_fit(rows)
+        for start in range(0, len(rows), 30):
+            incremental.partial_fit(rows[start:start + 30])
+
+        for _, title, description, _, _ in _rows(20, seed=2):
+            a, b = full.predict(title, description), incremental.predict(title, description)
+            assert [p.label for p in a] == [p.label for p in b]
+            assert [p.confidence for p in a] == pytest.approx([p.confidence for p in b])
+        assert incremental.last_id == 200
+
+    def test_predict_under_a_millisecond(self, trained):
+        start = time.perf_counter()
+        for _ in range(200):
+            trained.predict("Wifi çöktü", "Yurtta internet yok, derslere bağlanamıyorum")
+
+        assert (time.perf_counter() - start) / 200 < 0.001
+
+    def test_evaluate_report(self):
+        report = evaluate(_rows(250), test_fraction=0.2, threshold=0.8)
+
+        assert report["train"] == 200 and report["test"] == 50
+        assert report["department"]["accuracy"] == 1.0
+        assert report["priority"]["coverage_at_threshold"] > 0.5
+        assert report["latency_us"]["mean"] > 0
+
+
+class TestTraining:
+    """Training rows come from live tickets joined to their department"""
+
+    def test_load_and_train_from_database(self, setup_test_db: Session, test_user):
+        department = setup_test_db.query(Department).filter(Department.name == "Bilgi Islem").first()
+        for _ in range(3):
+            setup_test_db.add(Ticket(title="Wifi çöktü", description="internet yok", priority="High",
+                                     created_by_user_id=test_user.id, assigned_department_id=department.id))
+        setup_test_db.commit()
+        engine = setup_test_db.get_bind()
+
+        with engine.connect() as connection:
+            rows = load_training_rows(connection)
+        assert rows[0][1:] == ("Wifi çöktü", "internet yok", "Bilgi Islem", "High")
+
+        assert triage.train(engine) == 3
+        # yeni ticket yoksa artımlı eğitim bir şey eklemez
+        assert triage.train(engine) == 0
+        assert triage.train(engine, full=True) == 3
+        assert triage_classifier.predict("wifi", "")[0].label == "Bilgi Islem"
+
+
+class TestServicesUseClassifier:
+    """Confident local predictions skip the LLM, uncertain ones still consult it"""
+
+    def test_confident_prediction_skips_llm(self, trained, stub):
+        result = asyncio.run(services.suggest_ticket("Wifi çöktü", "Yurtta internet yok", DEPARTMENTS))
+
+        assert stub.requests == []
+        assert result["department_options"][0] == "Bilgi Islem"
+        assert result["priority_options"][0] == "High"
+
+    def test_low_confidence_consults_llm(self, trained, stub, monkeypatch):
+        monkeypatch.setattr(services.settings, "TRIAGE_CONFIDENCE_THRESHOLD", 1.01)
+
+        result = asyncio.run(services.suggest_ticket("Wifi çöktü", "Yurtta internet yok", DEPARTMENTS))
+
+        assert len(stub.requests) == 1
+        assert result["explanation"] == "Ağ erişimi sorunu."
+
+    def test_classifier_guess_used_without_client(self, trained, monkeypatch):
+        monkeypatch.setattr(services, "openai_client", None)
+        monkeypatch.setattr(services.settings, "TRIAGE_CONFIDENCE_THRESHOLD", 1.01)
+
+        department = asyncio.run(services.categorize_ticket("Kalorifer yanmıyor", "", DEPARTMENTS))
+
+        # kural tabanlı yedek ilk departmanı seçerdi
+        assert department == "Yapi Isleri"
+
+    def test_disabled(self, trained, stub, monkeypatch):
+        monkeypatch.setattr(services.settings, "TRIAGE_ENABLED", False)
+
+        asyncio.run(services.suggest_ticket("Wifi çöktü", "Yurtta internet yok", DEPARTMENTS))
+
+        assert len(stub.requests) == 1